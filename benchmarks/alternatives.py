@@ -0,0 +1,94 @@
+import argparse
+import heapq
+import random
+import time
+
+import routing
+
+
+class CompiledGridNetwork(routing.CompiledNetwork):
+    def __init__(self, width, height, seed=0):
+        rnd = random.Random(seed)
+        nodes = {y * width + x: routing.Node(y * width + x, (x, y)) for y in range(height) for x in range(width)}
+        links = {}
+        for y in range(height):
+            for x in range(width):
+                node_id = y * width + x
+                if x + 1 < width:
+                    links[len(links)] = routing.Link(len(links), node_id, node_id + 1, {"cost": rnd.randint(1, 10) / 20})
+                if y + 1 < height:
+                    links[len(links)] = routing.Link(len(links), node_id, node_id + width,
+                                                     {"cost": rnd.randint(1, 10) / 20})
+        super().__init__(nodes, links)
+
+    def link_cost(self, link: routing.Link, start_node: routing.Node):
+        return link.metadata["cost"]
+
+
+def naive_k_shortest_paths(network, start, end, k):
+    # Yen's algorithm as a caller would write it today: every spur is a full run with banned arcs priced out
+    source, sink = network.node_index[start.node_id], network.node_index[end.node_id]
+    arc_costs, targets = network.arc_costs, network.targets
+    tree = network.run(start, target=end)
+    accepted = [(tree.get_cost(end), tree.get_path_indices(end))]
+    candidates, seen = [], {tuple(accepted[0][1])}
+    while len(accepted) < k:
+        nodes = accepted[-1][1]
+        for d in range(len(nodes) - 1):
+            root = nodes[:d + 1]
+            banned = set()
+            for _, other in accepted:
+                if other[:d + 1] == root and len(other) > d + 1:
+                    banned.update(arc for arc in range(network.offsets[other[d]], network.offsets[other[d] + 1])
+                                  if targets[arc] == other[d + 1])
+            for i in root[:-1]:
+                banned.update(range(network.offsets[i], network.offsets[i + 1]))
+                banned.update(network.reverse_arcs[network.reverse_offsets[i]:network.reverse_offsets[i + 1]])
+            saved = {arc: arc_costs[arc] for arc in banned}
+            for arc in banned:
+                arc_costs[arc] = routing.infinity_cost
+            spur = network.run(network.node_list[nodes[d]], target=end)
+            for arc, cost in saved.items():
+                arc_costs[arc] = cost
+            if spur.reached(sink):
+                path = root[:-1] + spur.get_path_indices(end)
+                if tuple(path) not in seen:
+                    seen.add(tuple(path))
+                    root_cost = sum(min(arc_costs[arc] for arc in range(network.offsets[a], network.offsets[a + 1])
+                                        if targets[arc] == b) for a, b in zip(root, root[1:]))
+                    heapq.heappush(candidates, (root_cost + spur.get_cost(end), path))
+        if not candidates:
+            break
+        accepted.append(heapq.heappop(candidates))
+    return [cost for cost, _ in accepted]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare k shortest paths with naive Yen reruns")
+    parser.add_argument("--side", type=int, default=60, help="grid side length")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 2, 3, 5])
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    #
+    network = CompiledGridNetwork(args.side, args.side, args.seed)
+    rnd = random.Random(args.seed)
+    pairs = [(network.node_list[rnd.randrange(len(network.node_list))],
+              network.node_list[rnd.randrange(len(network.node_list))]) for _ in range(args.queries)]
+    print("{0:>4} {1:>12} {2:>14} {3:>12} {4:>14} {5:>6}".format(
+        "k", "engine (ms)", "per extra (ms)", "naive (ms)", "per extra (ms)", "same"))
+    for k in args.k:
+        begin = time.perf_counter()
+        fast = [[route.cost for route in network.k_shortest_paths(start, end, k)] for start, end in pairs]
+        fast_time = (time.perf_counter() - begin) * 1000 / len(pairs)
+        begin = time.perf_counter()
+        naive = [naive_k_shortest_paths(network, start, end, k) for start, end in pairs]
+        naive_time = (time.perf_counter() - begin) * 1000 / len(pairs)
+        same = all(len(a) == len(b) and all(abs(x - y) < 1e-9 for x, y in zip(a, b)) for a, b in zip(fast, naive))
+        extra = max(k - 1, 1)
+        print("{0:>4} {1:>12.2f} {2:>14.2f} {3:>12.2f} {4:>14.2f} {5:>6}".format(
+            k, fast_time, fast_time / extra, naive_time, naive_time / extra, str(same)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import random
+import time
+
+import routing
+
+
+# link costs are kept small so that every route on a 1M node grid stays below infinity_cost
+class GridNetwork(routing.Network):
+    def __init__(self, width, height, seed=0):
+        super().__init__()
+        rnd = random.Random(seed)
+        self.nodes = {}
+        self.attached = {}
+        for y in range(height):
+            for x in range(width):
+                node_id = y * width + x
+                self.nodes[node_id] = routing.Node(node_id, (x, y))
+                self.attached[node_id] = []
+        for y in range(height):
+            for x in range(width):
+                node_id = y * width + x
+                if x + 1 < width:
+                    self.add_link(node_id, node_id + 1, rnd)
+                if y + 1 < height:
+                    self.add_link(node_id, node_id + width, rnd)
+
+    def add_link(self, start_node_id, end_node_id, rnd):
+        link = routing.Link((start_node_id, end_node_id), start_node_id, end_node_id, {"cost": rnd.randint(1, 10) / 20})
+        self.attached[start_node_id].append(link)
+        self.attached[end_node_id].append(link)
+
+    def get_links_attached(self, node: routing.Node):
+        return self.attached[node.node_id]
+
+    def get_other_node(self, link: routing.Link, start_node: routing.Node):
+        if link.start_node_id == start_node.node_id:
+            return self.nodes[link.end_node_id]
+        return self.nodes[link.start_node_id]
+
+    def junction_cost(self, link_prev: routing.Link, middle_node: routing.Node, link_next: routing.Link):
+        return 0
+
+    def link_cost(self, link: routing.Link, start_node: routing.Node):
+        return link.metadata["cost"]
+
+
+class LegacyGridNetwork(GridNetwork):
+    # the sort-based frontier that Network.run used before the binary heap
+    def run(self, start_location: routing.Node):
+        tree = routing.ShortestPathTree(self, start_location)
+        lowest_cost, visited = tree.lowest_cost, tree.visited
+        lowest_cost[start_location] = 0, None
+        #
+        loose_ends = [(0, start_location)]
+        #
+        while len(loose_ends) > 0:
+            loose_ends.sort(key=lambda x: x[0])
+            current_node = loose_ends[0][1]
+            del loose_ends[0]
+            if current_node in visited:
+                continue
+            #
+            current_cost, prev_link = lowest_cost[current_node]
+            visited.add(current_node)
+            #
+            for link in self.get_links_attached(current_node):
+                total_cost = current_cost + self.junction_cost(prev_link, current_node, link) + \
+                    self.link_cost(link, current_node)
+                other = self.get_other_node(link, current_node)
+                if other in lowest_cost:
+                    last_cost, _ = lowest_cost[other]
+                else:
+                    last_cost = routing.infinity_cost
+                if total_cost < last_cost:
+                    lowest_cost[other] = total_cost, link
+                    loose_ends.append((total_cost, other))
+                elif last_cost != routing.infinity_cost:
+                    loose_ends.append((last_cost, other))
+        self.tree = tree
+        return tree
+
+
+def time_run(network, start):
+    begin = time.perf_counter()
+    network.run(start)
+    return time.perf_counter() - begin
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the heap frontier with the legacy sorted list")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000],
+                        help="approximate number of grid nodes")
+    parser.add_argument("--legacy-max", type=int, default=10000,
+                        help="largest grid to run through the legacy loop")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    #
+    print("{0:>10} {1:>10} {2:>10} {3:>8}".format("nodes", "heap (s)", "legacy (s)", "same"))
+    for size in args.sizes:
+        side = int(size ** 0.5)
+        heap_network = GridNetwork(side, side, args.seed)
+        start = heap_network.nodes[(side // 2) * side + side // 2]
+        heap_time = time_run(heap_network, start)
+        legacy_time, same = "-", "-"
+        if side * side <= args.legacy_max:
+            legacy_network = LegacyGridNetwork(side, side, args.seed)
+            legacy_time = "{0:.3f}".format(time_run(legacy_network, start))
+            same = all(heap_network.get_cost(n) == legacy_network.get_cost(n) and
+                       heap_network.get_path_ids(n) == legacy_network.get_path_ids(n)
+                       for n in heap_network.nodes.values())
+        print("{0:>10} {1:>10.3f} {2:>10} {3:>8}".format(side * side, heap_time, legacy_time, str(same)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import math
+import random
+
+import routing
+
+
+# every generator returns (nodes, links, turn restrictions) built only from its seed
+def grid(count, seed=0):
+    side = max(int(math.sqrt(count)), 2)
+    rnd = random.Random(seed)
+    nodes = {y * side + x: routing.Node(y * side + x, (x, y)) for y in range(side) for x in range(side)}
+    links = {}
+    for y in range(side):
+        for x in range(side):
+            node_id = y * side + x
+            if x + 1 < side:
+                links[len(links)] = routing.Link(len(links), node_id, node_id + 1, {"speed": rnd.randint(1, 10)})
+            if y + 1 < side:
+                links[len(links)] = routing.Link(len(links), node_id, node_id + side, {"speed": rnd.randint(1, 10)})
+    return nodes, links, routing.TurnRestrictions()
+
+
+def random_geometric(count, seed=0, degree=6):
+    # nodes scattered over a square, each joined to its neighbours within a radius giving the mean degree
+    rnd = random.Random(seed)
+    side = math.sqrt(count)
+    nodes = {i: routing.Node(i, (rnd.uniform(0, side), rnd.uniform(0, side))) for i in range(count)}
+    radius = math.sqrt(degree / math.pi)
+    index = routing.SpatialIndex(nodes)
+    links = {}
+    for node in nodes.values():
+        for _, other in index.within(node.coords, radius):
+            if other.node_id > node.node_id:
+                links[len(links)] = routing.Link(len(links), node.node_id, other.node_id,
+                                                 {"speed": rnd.randint(1, 10)})
+    return nodes, links, routing.TurnRestrictions()
+
+
+def road_like(count, seed=0, light_share=0.2, ban_share=0.05, drop_share=0.15):
+    # a jittered grid with missing streets, arterial rows and columns, traffic lights and banned turns
+    side = max(int(math.sqrt(count)), 2)
+    rnd = random.Random(seed)
+    nodes = {}
+    for y in range(side):
+        for x in range(side):
+            metadata = {"traffic_lights": True} if rnd.random() < light_share else None
+            nodes[y * side + x] = routing.Node(y * side + x, (x + rnd.uniform(-0.3, 0.3), y + rnd.uniform(-0.3, 0.3)),
+                                               metadata)
+    links = {}
+    attached = {node_id: [] for node_id in nodes}
+    for y in range(side):
+        for x in range(side):
+            node_id = y * side + x
+            for other, arterial in [(node_id + 1, y % 8 == 0), (node_id + side, x % 8 == 0)]:
+                if other >= side * side or other == node_id + 1 and x + 1 == side:
+                    continue
+                if not arterial and rnd.random() < drop_share:
+                    continue
+                link = routing.Link(len(links), node_id, other, {"speed": 30 if arterial else rnd.choice([5, 10, 15])})
+                links[link.link_id] = link
+                attached[node_id].append(link.link_id)
+                attached[other].append(link.link_id)
+    bans = []
+    for node_id, link_ids in attached.items():
+        for link_id in link_ids:
+            for next_link_id in link_ids:
+                if link_id != next_link_id and rnd.random() < ban_share:
+                    bans.append((link_id, next_link_id))
+    return nodes, links, routing.TurnRestrictions(bans)
+
+
+generators = {"grid": grid, "geometric": random_geometric, "road": road_like}
+
+
+class BenchmarkNetwork(routing.Network):
+    # the hook based engine: travel time links and a delay when a route turns at traffic lights
+    light_delay = 0.5
+
+    def __init__(self, nodes: dict, links: dict):
+        super().__init__()
+        self.nodes = nodes
+        self.attached = {node_id: [] for node_id in nodes}
+        for link in links.values():
+            self.attached[link.start_node_id].append(link)
+            self.attached[link.end_node_id].append(link)
+
+    def get_links_attached(self, node: routing.Node):
+        return self.attached[node.node_id]
+
+    def get_other_node(self, link: routing.Link, start_node: routing.Node):
+        if link.start_node_id == start_node.node_id:
+            return self.nodes[link.end_node_id]
+        return self.nodes[link.start_node_id]
+
+    def junction_cost(self, link_prev: routing.Link, middle_node: routing.Node, link_next: routing.Link):
+        if link_prev is not None and middle_node.metadata and middle_node.metadata.get("traffic_lights"):
+            return self.light_delay
+        return 0
+
+    def link_cost(self, link: routing.Link, start_node: routing.Node):
+        return routing.distance(self.nodes[link.start_node_id], self.nodes[link.end_node_id]) / link.metadata["speed"]
+
+
+class BenchmarkCompiledNetwork(routing.CompiledNetwork):
+    # the same costs as BenchmarkNetwork, so both engines time the same searches
+    light_delay = BenchmarkNetwork.light_delay
+
+    def junction_cost(self, link_prev: routing.Link, middle_node: routing.Node, link_next: routing.Link):
+        if link_prev is not None and middle_node.metadata and middle_node.metadata.get("traffic_lights"):
+            return self.light_delay
+        return 0
+
+    def link_cost(self, link: routing.Link, start_node: routing.Node):
+        start = self.node_list[self.node_index[link.start_node_id]]
+        end = self.node_list[self.node_index[link.end_node_id]]
+        return routing.distance(start, end) / link.metadata["speed"]
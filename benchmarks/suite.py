@@ -0,0 +1,157 @@
+import argparse
+import importlib.util
+import json
+import math
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from .generators import BenchmarkCompiledNetwork, BenchmarkNetwork, generators
+
+
+def build_engines(nodes, links):
+    return {
+        "network": lambda: BenchmarkNetwork(nodes, links),
+        "compiled": lambda: BenchmarkCompiledNetwork(nodes, links),
+    }
+
+
+def workloads(network, restrictions, rnd, pairs, matrix_size):
+    node_list = list(network.nodes.values()) if isinstance(network, BenchmarkNetwork) else list(network.node_list)
+    start = node_list[len(node_list) // 2]
+    routes = [(rnd.choice(node_list), rnd.choice(node_list)) for _ in range(pairs)]
+    origins = [rnd.choice(node_list) for _ in range(matrix_size)]
+    destinations = [rnd.choice(node_list) for _ in range(matrix_size)]
+
+    def one_to_all():
+        network.run(start, max_cost=math.inf)
+
+    def point_to_point():
+        # banned turns need the edge-based search, plain graphs use the node-based one
+        for source, target in routes:
+            if len(restrictions):
+                network.run_edge_based(source, restrictions, target=target, max_cost=math.inf)
+            else:
+                network.run(source, target=target, max_cost=math.inf)
+
+    def matrix():
+        if isinstance(network, BenchmarkCompiledNetwork) and importlib.util.find_spec("numpy"):
+            network.cost_matrix(origins, destinations, max_cost=math.inf)
+        else:
+            for origin in origins:
+                network.run(origin, targets=destinations, max_cost=math.inf)
+
+    return {"one_to_all": one_to_all, "point_to_point": point_to_point, "matrix": matrix}
+
+
+def measure(function, repeat):
+    # timings run untraced, then one traced call gives the peak memory
+    times = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - begin)
+    tracemalloc.start()
+    result = function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak, result
+
+
+def commit_id():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def record(results, key, workload, seconds, peak):
+    results.append(dict(key, workload=workload, seconds=seconds, peak_bytes=peak))
+    print("{generator:>10} {nodes:>9} {engine:>9} {workload:>15} {seconds:>10.4f}s {peak:>12}B".format(
+        workload=workload, seconds=seconds, peak=peak, **key), file=sys.stderr)
+
+
+def run_suite(args):
+    results = []
+    for generator in args.generators:
+        for size in args.sizes:
+            nodes, links, restrictions = generators[generator](size, args.seed)
+            for engine, build in build_engines(nodes, links).items():
+                if engine not in args.engines:
+                    continue
+                key = {"generator": generator, "nodes": len(nodes), "links": len(links), "engine": engine}
+                seconds, peak, network = measure(build, 1)
+                record(results, key, "build", seconds, peak)
+                rnd = random.Random(args.seed)
+                for workload, function in workloads(network, restrictions, rnd, args.pairs, args.matrix).items():
+                    if workload not in args.workloads:
+                        continue
+                    seconds, peak, _ = measure(function, args.repeat)
+                    record(results, key, workload, seconds, peak)
+    return {
+        "meta": {"commit": commit_id(), "python": platform.python_version(), "platform": platform.platform(),
+                 "seed": args.seed, "repeat": args.repeat, "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+
+
+def result_key(result):
+    return result["generator"], result["nodes"], result["engine"], result["workload"]
+
+
+def compare(baseline, current, tolerance):
+    # value = list of (key, baseline seconds, current seconds) slower than the tolerance allows
+    before = {result_key(result): result for result in baseline["results"]}
+    regressions = []
+    print("{0:>10} {1:>9} {2:>9} {3:>15} {4:>10} {5:>10} {6:>7}".format(
+        "generator", "nodes", "engine", "workload", "before", "after", "ratio"))
+    for result in current["results"]:
+        key = result_key(result)
+        if key not in before:
+            continue
+        ratio = result["seconds"] / before[key]["seconds"] if before[key]["seconds"] else math.inf
+        flag = " slower" if ratio > 1 + tolerance else ""
+        print("{0:>10} {1:>9} {2:>9} {3:>15} {4:>10.4f} {5:>10.4f} {6:>7.2f}{7}".format(
+            *key, before[key]["seconds"], result["seconds"], ratio, flag))
+        if flag:
+            regressions.append((key, before[key]["seconds"], result["seconds"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time routing workloads on seeded synthetic networks")
+    parser.add_argument("--generators", nargs="+", default=sorted(generators), choices=sorted(generators))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="approximate number of nodes, up to 1000000")
+    parser.add_argument("--engines", nargs="+", default=["network", "compiled"], choices=["network", "compiled"])
+    parser.add_argument("--workloads", nargs="+", default=["one_to_all", "point_to_point", "matrix"],
+                        choices=["one_to_all", "point_to_point", "matrix"])
+    parser.add_argument("--pairs", type=int, default=10, help="point to point queries per measurement")
+    parser.add_argument("--matrix", type=int, default=10, help="origins and destinations in the matrix workload")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON to this file instead of stdout")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="slowdown allowed before a regression")
+    args = parser.parse_args()
+    #
+    current = run_suite(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    else:
+        json.dump(current, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, current, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
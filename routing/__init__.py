@@ -1,2 +1,11 @@
 from .network import *
-
+from .tables import *
+from .profiles import *
+from .compiled import *
+from .mapped import *
+from .ingest import *
+from .hierarchy import *
+from .cache import *
+from .landmarks import *
+from .spatial import *
+from .kernels import *
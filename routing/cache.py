@@ -0,0 +1,73 @@
+from collections import OrderedDict
+
+from .compiled import CompiledNetwork, CostUpdate
+from .network import Node, infinity_cost
+
+
+class TreeCache:
+    def __init__(self, network: CompiledNetwork, max_entries=256, max_bytes=None):
+        self.network = network
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key = (start node id, network version, max cost), value = tree, oldest first
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.version = network.version
+
+    def run(self, start_location: Node, max_cost=infinity_cost):
+        if self.version != self.network.version:
+            self.discard_stale()
+        key = (start_location.node_id, self.network.version, max_cost)
+        tree = self.entries.get(key)
+        if tree is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        else:
+            self.misses += 1
+            tree = self.network.run(start_location, max_cost=max_cost)
+            self.add(key, tree)
+        self.network.tree = tree
+        return tree
+
+    def add(self, key, tree):
+        size = tree.nbytes()
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self.entries[key] = tree
+        self.bytes += size
+        while len(self.entries) > self.max_entries or self.max_bytes is not None and self.bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        _, tree = self.entries.popitem(last=False)
+        self.bytes -= tree.nbytes()
+        self.evictions += 1
+
+    def discard_stale(self):
+        for key in [key for key in self.entries if key[1] != self.network.version]:
+            self.bytes -= self.entries.pop(key).nbytes()
+            self.evictions += 1
+        self.version = self.network.version
+
+    def repair(self, update: CostUpdate):
+        # carry the trees of the previous version across a link cost update instead of dropping them
+        for key in list(self.entries):
+            start_id, version, max_cost = key
+            if version == update.version - 1:
+                tree = self.entries.pop(key)
+                self.network.repair(tree, update)
+                self.entries[(start_id, update.version, max_cost)] = tree
+        self.discard_stale()
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self.entries), "bytes": self.bytes}
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,734 @@
+import heapq
+import itertools
+import sys
+import time
+from array import array
+
+from .network import Link, Network, Node, Route, ShortestPathTree, TurnRestrictions, distance, infinity_cost
+from .profiles import ProfileTable
+from .tables import LinkTable, NodeTable
+
+
+class CompiledShortestPathTree(ShortestPathTree):
+    def __init__(self, network, start_location: Node = None, source=-1, cost=(), previous=(), arc_previous=None,
+                 max_cost=infinity_cost, complete=False, owner=None, settled=None):
+        super().__init__(network, start_location, max_cost)
+        self.source = source
+        self.complete = complete  # True when every node within max_cost was settled
+        self.cost = array('d', cost)  # index = node index, value = cost
+        self.previous = array('q', previous)  # index = node index, value = arc index or -1
+        # index = arc index, value = previous arc index or -1, only set by edge-based runs
+        self.arc_previous = None if arc_previous is None else array('q', arc_previous)
+        # index = node index, value = index of the source node it was reached from or -1, only set by multi-source runs
+        self.owner = None if owner is None else array('q', owner)
+        # index = node index, value = 1 when settled, only kept by runs that stopped early
+        self.settled = settled
+
+    def nbytes(self):
+        size = sys.getsizeof(self.cost) + sys.getsizeof(self.previous)
+        for extra in (self.arc_previous, self.owner, self.settled):
+            if extra is not None:
+                size += sys.getsizeof(extra)
+        return size
+
+    def reached(self, i):
+        if self.settled is not None:
+            return i < len(self.settled) and self.settled[i] == 1
+        if self.owner is not None:
+            return i < len(self.owner) and self.owner[i] != -1
+        return i < len(self.previous) and (self.previous[i] != -1 or i == self.source)
+
+    def get_owner(self, node: Node):
+        i = self.network.node_index.get(node.node_id)
+        if i is None or not self.reached(i):
+            return None
+        if self.owner is None:
+            return self.start_location
+        return self.network.node_list[self.owner[i]]
+
+    def get_cost(self, node: Node):
+        i = self.network.node_index.get(node.node_id)
+        if i is None or not self.reached(i):
+            return self.unreached_cost()
+        return self.cost[i]
+
+    def get_previous_link(self, node: Node):
+        i = self.network.node_index.get(node.node_id)
+        if i is None or not self.reached(i) or self.previous[i] == -1:
+            return None
+        return self.network.link_list[self.network.arc_links[self.previous[i]]]
+
+    def get_path_indices(self, end_node: Node):
+        path = []
+        i = self.network.node_index.get(end_node.node_id)
+        if i is None or not self.reached(i):
+            return path
+        previous, arc_sources = self.previous, self.network.arc_sources
+        if self.arc_previous is not None:
+            arc = previous[i]
+            while arc != -1:
+                path.append(i)
+                i = arc_sources[arc]
+                arc = self.arc_previous[arc]
+            path.append(i)
+            return [x for x in reversed(path)]
+        while previous[i] != -1:
+            path.append(i)
+            i = arc_sources[previous[i]]
+        path.append(i)
+        return [x for x in reversed(path)]
+
+    def get_path(self, end_node: Node):
+        return [self.network.node_list[i] for i in self.get_path_indices(end_node)]
+
+    def get_path_ids(self, end_node: Node):
+        return [self.network.node_ids[i] for i in self.get_path_indices(end_node)]
+
+
+class CostUpdate:
+    def __init__(self, version, old_costs: dict):
+        self.version = version  # network version after the update
+        self.old_costs = old_costs  # key = arc index, value = arc cost before the update
+
+
+class CompiledNetwork(Network):
+    def __init__(self, nodes: dict, links: dict, directed=False):
+        super().__init__()
+        self.tree = CompiledShortestPathTree(self)
+        self.directed = directed
+        self.profiles = ProfileTable()
+        self.arc_profiles = None  # index = arc index, value = profile index or -1 for a fixed cost
+        # key = (previous arc index + 1) * arc count + arc index, value = non-zero junction cost
+        self.turn_costs = {}
+        self.compile(nodes, links)
+
+    def compile(self, nodes: dict, links: dict):
+        # columnar tables share their id columns and hand out node and link views on demand
+        if isinstance(nodes, NodeTable):
+            self.node_list = nodes.sequence()
+            self.node_ids = nodes.node_ids
+            self.node_index = nodes.node_index
+        else:
+            self.node_list = list(nodes.values())
+            self.node_ids = [node.node_id for node in self.node_list]
+            self.node_index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        if isinstance(links, LinkTable):
+            self.link_list = links.sequence()
+            self.link_index = links.link_index
+        else:
+            self.link_list = list(links.values())
+            self.link_index = {link.link_id: j for j, link in enumerate(self.link_list)}
+        #
+        outgoing = [[] for _ in self.node_list]
+        for j, link in enumerate(self.link_list):
+            if link.start_node_id not in self.node_index or link.end_node_id not in self.node_index:
+                raise ValueError("Link {0} is not connected to known nodes".format(link.link_id))
+            start = self.node_index[link.start_node_id]
+            end = self.node_index[link.end_node_id]
+            if start == end:
+                continue
+            outgoing[start].append((end, j))
+            if not self.directed:
+                outgoing[end].append((start, j))
+        #
+        self.offsets = array('q', [0])
+        self.targets = array('q')
+        self.arc_sources = array('q')
+        self.arc_links = array('q')
+        self.arc_costs = array('d')
+        for i, arcs in enumerate(outgoing):
+            node = self.node_list[i]
+            for end, j in arcs:
+                self.arc_sources.append(i)
+                self.targets.append(end)
+                self.arc_links.append(j)
+                self.arc_costs.append(self.link_cost(self.link_list[j], node))
+            self.offsets.append(len(self.targets))
+        #
+        incoming = [[] for _ in self.node_list]
+        for arc, end in enumerate(self.targets):
+            incoming[end].append(arc)
+        self.reverse_offsets = array('q', [0])
+        self.reverse_arcs = array('q')
+        for arcs in incoming:
+            self.reverse_arcs.extend(arcs)
+            self.reverse_offsets.append(len(self.reverse_arcs))
+        self.compile_turn_costs()
+
+    def compile_turn_costs(self):
+        # the junction_cost hook is only asked when a subclass overrides it, previous arc -1 is the start of a run
+        self.turn_costs = {}
+        if type(self).junction_cost is CompiledNetwork.junction_cost:
+            return
+        arc_count = len(self.targets)
+        for i, node in enumerate(self.node_list):
+            arcs = [self.reverse_arcs[r] for r in range(self.reverse_offsets[i], self.reverse_offsets[i + 1])]
+            for prev_arc in [-1] + arcs:
+                prev_link = None if prev_arc == -1 else self.link_list[self.arc_links[prev_arc]]
+                for arc in range(self.offsets[i], self.offsets[i + 1]):
+                    turn_cost = self.junction_cost(prev_link, node, self.link_list[self.arc_links[arc]])
+                    if turn_cost < 0:
+                        raise ValueError("Junction at node {0} has a negative cost".format(node.node_id))
+                    if turn_cost:
+                        self.turn_costs[(prev_arc + 1) * arc_count + arc] = turn_cost
+
+    def check_no_turn_costs(self):
+        if self.turn_costs:
+            raise ValueError("Networks with junction costs are not supported here")
+
+    @property
+    def run_cost(self):
+        return self.tree.cost
+
+    @property
+    def run_previous(self):
+        return self.tree.previous
+
+    @property
+    def run_source(self):
+        return self.tree.source
+
+    @property
+    def run_arc_previous(self):
+        return self.tree.arc_previous
+
+    def initialise_run(self):
+        self.tree = CompiledShortestPathTree(self)
+
+    def reached(self, i):
+        return self.tree.reached(i)
+
+    def run(self, start_location: Node, target: Node = None, heuristic=None,
+            targets=None, max_cost=infinity_cost, max_settled=None, departure_time=None):
+        if departure_time is not None:
+            if heuristic or targets or max_settled is not None:
+                raise ValueError("Time-dependent runs only take a target and a max cost")
+            return self.run_time_dependent(start_location, departure_time, target, max_cost)
+        if heuristic and target is None:
+            raise ValueError("Heuristic needs a target node")
+        stats = self.start_stats(start_location)
+        begin = time.perf_counter()
+        if stats is not None and heuristic:
+            heuristic = stats.timed(heuristic, "heuristic")
+        source = self.node_index[start_location.node_id]
+        goal = -1 if target is None else self.node_index[target.node_id]
+        node_list = self.node_list
+        remaining = {self.node_index[node.node_id] for node in targets} if targets else None
+        complete = goal == -1 and remaining is None and max_settled is None
+        settled_count = 0
+        offsets, targets, arc_costs = self.offsets, self.targets, self.arc_costs
+        turn_costs, arc_count = self.turn_costs, len(self.targets)
+        cost = [max_cost] * len(self.node_list)
+        previous = [-1] * len(self.node_list)
+        settled = bytearray(len(self.node_list))
+        cost[source] = 0
+        #
+        loose_ends = [(0, source)]
+        #
+        stopped = False
+        while loose_ends:
+            if stats is not None:
+                stats.heap_pops += 1
+                stats.max_frontier = max(stats.max_frontier, len(loose_ends))
+            _, current = heapq.heappop(loose_ends)
+            if settled[current]:
+                continue
+            settled[current] = 1
+            current_cost = cost[current]
+            settled_count += 1
+            if remaining is not None:
+                remaining.discard(current)
+            if current == goal or remaining is not None and not remaining or \
+                    max_settled is not None and settled_count >= max_settled:
+                stopped = True
+                break
+            if stats is not None:
+                stats.edges_relaxed += offsets[current + 1] - offsets[current]
+            for arc in range(offsets[current], offsets[current + 1]):
+                other = targets[arc]
+                total_cost = current_cost + arc_costs[arc]
+                if turn_costs:
+                    total_cost += turn_costs.get((previous[current] + 1) * arc_count + arc, 0)
+                if total_cost < cost[other]:
+                    cost[other] = total_cost
+                    previous[other] = arc
+                    if heuristic:
+                        heapq.heappush(loose_ends, (total_cost + heuristic(node_list[other], target), other))
+                    else:
+                        heapq.heappush(loose_ends, (total_cost, other))
+        # labels of unsettled frontier nodes are only tentative after an early stop
+        tree = CompiledShortestPathTree(self, start_location, source, cost, previous, max_cost=max_cost,
+                                        complete=complete, settled=settled if stopped else None)
+        if stats is not None:
+            self.finish_stats(stats, tree, settled_count, loose_ends, begin)
+        self.tree = tree
+        return tree
+
+    def run_multi_source(self, sources, offsets=None, max_cost=infinity_cost):
+        # one search from every source at once, offsets are the costs already incurred at each source
+        stats = self.start_stats(None)
+        begin = time.perf_counter()
+        cost = [max_cost] * len(self.node_list)
+        previous = [-1] * len(self.node_list)
+        owner = [-1] * len(self.node_list)
+        settled = bytearray(len(self.node_list))
+        loose_ends = []
+        for source, offset in zip(sources, offsets if offsets is not None else itertools.repeat(0)):
+            i = self.node_index[source.node_id]
+            if offset < cost[i]:
+                cost[i] = offset
+                owner[i] = i
+                heapq.heappush(loose_ends, (offset, i))
+        offsets, targets, arc_costs = self.offsets, self.targets, self.arc_costs
+        turn_costs, arc_count = self.turn_costs, len(self.targets)
+        #
+        settled_count = 0
+        while loose_ends:
+            if stats is not None:
+                stats.heap_pops += 1
+                stats.max_frontier = max(stats.max_frontier, len(loose_ends))
+            current_cost, current = heapq.heappop(loose_ends)
+            if settled[current] or current_cost > cost[current]:
+                continue
+            settled[current] = 1
+            settled_count += 1
+            if stats is not None:
+                stats.edges_relaxed += offsets[current + 1] - offsets[current]
+            for arc in range(offsets[current], offsets[current + 1]):
+                other = targets[arc]
+                total_cost = current_cost + arc_costs[arc]
+                if turn_costs:
+                    total_cost += turn_costs.get((previous[current] + 1) * arc_count + arc, 0)
+                if total_cost < cost[other]:
+                    cost[other] = total_cost
+                    previous[other] = arc
+                    owner[other] = owner[current]
+                    heapq.heappush(loose_ends, (total_cost, other))
+        tree = CompiledShortestPathTree(self, None, -1, cost, previous, max_cost=max_cost, owner=owner)
+        if stats is not None:
+            self.finish_stats(stats, tree, settled_count, loose_ends, begin)
+        self.tree = tree
+        return tree
+
+    def run_time_dependent(self, start_location: Node, departure_time, target: Node = None, max_cost=infinity_cost):
+        # costs are travel times from departure_time, each arc evaluated at the arrival time at its start
+        stats = self.start_stats(start_location)
+        begin = time.perf_counter()
+        source = self.node_index[start_location.node_id]
+        goal = -1 if target is None else self.node_index[target.node_id]
+        offsets, targets, arc_costs = self.offsets, self.targets, self.arc_costs
+        profiles, arc_profiles = self.profiles, self.arc_profiles
+        turn_costs, arc_count = self.turn_costs, len(self.targets)
+        cost = [max_cost] * len(self.node_list)
+        previous = [-1] * len(self.node_list)
+        settled = bytearray(len(self.node_list))
+        cost[source] = 0
+        #
+        loose_ends = [(0, source)]
+        stopped = False
+        settled_count = 0
+        #
+        while loose_ends:
+            if stats is not None:
+                stats.heap_pops += 1
+                stats.max_frontier = max(stats.max_frontier, len(loose_ends))
+            current_cost, current = heapq.heappop(loose_ends)
+            if settled[current]:
+                continue
+            settled[current] = 1
+            settled_count += 1
+            if current == goal:
+                stopped = True
+                break
+            if stats is not None:
+                stats.edges_relaxed += offsets[current + 1] - offsets[current]
+            arrival_time = departure_time + current_cost
+            for arc in range(offsets[current], offsets[current + 1]):
+                other = targets[arc]
+                k = -1 if arc_profiles is None else arc_profiles[arc]
+                total_cost = current_cost + (arc_costs[arc] if k == -1 else profiles.evaluate(k, arrival_time))
+                if turn_costs:
+                    total_cost += turn_costs.get((previous[current] + 1) * arc_count + arc, 0)
+                if total_cost < cost[other]:
+                    cost[other] = total_cost
+                    previous[other] = arc
+                    heapq.heappush(loose_ends, (total_cost, other))
+        tree = CompiledShortestPathTree(self, start_location, source, cost, previous, max_cost=max_cost,
+                                        settled=settled if stopped else None)
+        if stats is not None:
+            self.finish_stats(stats, tree, settled_count, loose_ends, begin)
+        self.tree = tree
+        return tree
+
+    def set_link_profiles(self, profiles: dict):
+        # key = link id, value = TravelTimeProfile for every arc of the link, or None to go back to its fixed cost
+        if self.arc_profiles is None:
+            self.arc_profiles = array('q', [-1]) * len(self.targets)
+        for link_id, profile in profiles.items():
+            j = self.link_index[link_id]
+            link = self.link_list[j]
+            k = -1 if profile is None else self.profiles.add(profile)
+            for i in {self.node_index[link.start_node_id], self.node_index[link.end_node_id]}:
+                for arc in range(self.offsets[i], self.offsets[i + 1]):
+                    if self.arc_links[arc] == j:
+                        self.arc_profiles[arc] = k
+        self.version += 1
+
+    def run_edge_based(self, start_location: Node, turn_restrictions: TurnRestrictions = None,
+                       target: Node = None, max_cost=infinity_cost):
+        stats = self.start_stats(start_location)
+        begin = time.perf_counter()
+        source = self.node_index[start_location.node_id]
+        goal = -1 if target is None else self.node_index[target.node_id]
+        offsets, targets, arc_costs, arc_links = self.offsets, self.targets, self.arc_costs, self.arc_links
+        turn_costs, arc_count = self.turn_costs, len(self.targets)
+        link_count = len(self.link_list)
+        banned = set()  # value = link index * link count + next link index
+        if turn_restrictions:
+            for link_id, next_link_id in turn_restrictions.banned:
+                if link_id in self.link_index and next_link_id in self.link_index:
+                    banned.add(self.link_index[link_id] * link_count + self.link_index[next_link_id])
+        cost = [max_cost] * len(self.node_list)
+        previous = [-1] * len(self.node_list)
+        settled = bytearray(len(self.node_list))
+        arc_cost = [max_cost] * len(targets)
+        arc_previous = [-1] * len(targets)
+        arc_settled = bytearray(len(targets))
+        #
+        loose_ends = [(0, -1, source)]
+        settled_count = 0  # (node, previous arc) states, as those are what the heap holds
+        #
+        while loose_ends:
+            if stats is not None:
+                stats.heap_pops += 1
+                stats.max_frontier = max(stats.max_frontier, len(loose_ends))
+            current_cost, prev_arc, current = heapq.heappop(loose_ends)
+            if prev_arc != -1:
+                if arc_settled[prev_arc]:
+                    continue
+                arc_settled[prev_arc] = 1
+                prev_link = arc_links[prev_arc] * link_count
+            settled_count += 1
+            if not settled[current]:
+                settled[current] = 1
+                cost[current] = current_cost
+                previous[current] = prev_arc
+                if current == goal:
+                    break
+            if stats is not None:
+                stats.edges_relaxed += offsets[current + 1] - offsets[current]
+            for arc in range(offsets[current], offsets[current + 1]):
+                if prev_arc != -1 and prev_link + arc_links[arc] in banned:
+                    continue
+                total_cost = current_cost + arc_costs[arc]
+                if turn_costs:
+                    total_cost += turn_costs.get((prev_arc + 1) * arc_count + arc, 0)
+                if total_cost < arc_cost[arc]:
+                    arc_cost[arc] = total_cost
+                    arc_previous[arc] = prev_arc
+                    heapq.heappush(loose_ends, (total_cost, arc, targets[arc]))
+        tree = CompiledShortestPathTree(self, start_location, source, cost, previous, arc_previous, max_cost)
+        if stats is not None:
+            self.finish_stats(stats, tree, settled_count, loose_ends, begin)
+        self.tree = tree
+        return tree
+
+    def run_bidirectional(self, start_location: Node, end_location: Node, max_cost=infinity_cost):
+        stats = self.start_stats(start_location)
+        begin = time.perf_counter()
+        source = self.node_index[start_location.node_id]
+        sink = self.node_index[end_location.node_id]
+        offsets, targets, arc_costs = self.offsets, self.targets, self.arc_costs
+        reverse_offsets, reverse_arcs, arc_sources = self.reverse_offsets, self.reverse_arcs, self.arc_sources
+        turn_costs, arc_count, arc_links = self.turn_costs, len(self.targets), self.arc_links
+        cost = [max_cost] * len(self.node_list)
+        previous = [-1] * len(self.node_list)
+        settled = bytearray(len(self.node_list))
+        backward_cost = [max_cost] * len(self.node_list)
+        following = [-1] * len(self.node_list)
+        backward_settled = bytearray(len(self.node_list))
+        cost[source] = 0
+        backward_cost[sink] = 0
+        #
+        forward_ends = [(0, source)]
+        backward_ends = [(0, sink)]
+        best_cost, meeting = max_cost, -1
+        if source == sink:
+            best_cost, meeting = 0, source
+        #
+        settled_count = 0
+        while forward_ends and backward_ends:
+            if forward_ends[0][0] + backward_ends[0][0] >= best_cost:
+                break
+            if stats is not None:
+                stats.heap_pops += 1
+                stats.max_frontier = max(stats.max_frontier, len(forward_ends) + len(backward_ends))
+            if forward_ends[0][0] <= backward_ends[0][0]:
+                current_cost, current = heapq.heappop(forward_ends)
+                if settled[current]:
+                    continue
+                settled[current] = 1
+                settled_count += 1
+                if stats is not None:
+                    stats.edges_relaxed += offsets[current + 1] - offsets[current]
+                for arc in range(offsets[current], offsets[current + 1]):
+                    other = targets[arc]
+                    total_cost = current_cost + arc_costs[arc]
+                    if turn_costs:
+                        total_cost += turn_costs.get((previous[current] + 1) * arc_count + arc, 0)
+                    if total_cost < cost[other]:
+                        cost[other] = total_cost
+                        previous[other] = arc
+                        heapq.heappush(forward_ends, (total_cost, other))
+                        # an immediate U-turn back along the same link is not a route
+                        if following[other] != -1 and arc_links[following[other]] == arc_links[arc]:
+                            continue
+                        meeting_cost = total_cost + backward_cost[other]
+                        if turn_costs and following[other] != -1:
+                            meeting_cost += turn_costs.get((arc + 1) * arc_count + following[other], 0)
+                        if meeting_cost < best_cost:
+                            best_cost, meeting = meeting_cost, other
+            else:
+                current_cost, current = heapq.heappop(backward_ends)
+                if backward_settled[current]:
+                    continue
+                backward_settled[current] = 1
+                settled_count += 1
+                if stats is not None:
+                    stats.edges_relaxed += reverse_offsets[current + 1] - reverse_offsets[current]
+                for r in range(reverse_offsets[current], reverse_offsets[current + 1]):
+                    arc = reverse_arcs[r]
+                    other = arc_sources[arc]
+                    total_cost = current_cost + arc_costs[arc]
+                    if turn_costs and following[current] != -1:
+                        total_cost += turn_costs.get((arc + 1) * arc_count + following[current], 0)
+                    if total_cost < backward_cost[other]:
+                        backward_cost[other] = total_cost
+                        following[other] = arc
+                        heapq.heappush(backward_ends, (total_cost, other))
+                        if previous[other] != -1 and arc_links[previous[other]] == arc_links[arc]:
+                            continue
+                        meeting_cost = total_cost + cost[other]
+                        if turn_costs:
+                            meeting_cost += turn_costs.get((previous[other] + 1) * arc_count + arc, 0)
+                        if meeting_cost < best_cost:
+                            best_cost, meeting = meeting_cost, other
+        # continue the forward labels along the backward half of the route
+        current = meeting
+        while meeting != -1 and current != sink:
+            arc = following[current]
+            cost[targets[arc]] = cost[current] + arc_costs[arc] + \
+                turn_costs.get((previous[current] + 1) * arc_count + arc, 0)
+            previous[targets[arc]] = arc
+            current = targets[arc]
+        # only the route's labels are final, the rest of both frontiers are tentative
+        route = bytearray(len(self.node_list))
+        route[source] = 1
+        current = sink if meeting != -1 else source
+        while current != source:
+            route[current] = 1
+            current = arc_sources[previous[current]]
+        tree = CompiledShortestPathTree(self, start_location, source, cost, previous, max_cost=max_cost,
+                                        settled=route)
+        if stats is not None:
+            self.finish_stats(stats, tree, settled_count, forward_ends + backward_ends, begin)
+        self.tree = tree
+        return tree
+
+    def update_link_costs(self, costs: dict):
+        # key = link id, value = new cost of every arc of the link, or None to ask the link_cost hook again
+        old_costs = {}
+        for link_id, new_cost in costs.items():
+            j = self.link_index[link_id]
+            link = self.link_list[j]
+            for i in {self.node_index[link.start_node_id], self.node_index[link.end_node_id]}:
+                for arc in range(self.offsets[i], self.offsets[i + 1]):
+                    if self.arc_links[arc] != j:
+                        continue
+                    arc_cost = self.link_cost(link, self.node_list[i]) if new_cost is None else new_cost
+                    if arc_cost < 0:
+                        raise ValueError("Link {0} has a negative cost".format(link_id))
+                    if arc_cost != self.arc_costs[arc]:
+                        old_costs.setdefault(arc, self.arc_costs[arc])
+                        self.arc_costs[arc] = arc_cost
+        self.version += 1
+        return CostUpdate(self.version, old_costs)
+
+    def repair(self, tree: CompiledShortestPathTree, update: CostUpdate):
+        self.check_no_turn_costs()
+        if not tree.complete or tree.arc_previous is not None:
+            raise ValueError("Only trees from complete node-based runs can be repaired")
+        if tree.version != update.version - 1:
+            raise ValueError("Tree was not built on the network version the update applies to")
+        offsets, targets, arc_costs, arc_sources = self.offsets, self.targets, self.arc_costs, self.arc_sources
+        cost, previous, max_cost = tree.cost, tree.previous, tree.max_cost
+        # nodes reached through an arc that became dearer lose their labels, along with their subtrees
+        affected = set()
+        stack = [targets[arc] for arc, old_cost in update.old_costs.items()
+                 if arc_costs[arc] > old_cost and previous[targets[arc]] == arc]
+        while stack:
+            current = stack.pop()
+            if current in affected:
+                continue
+            affected.add(current)
+            for arc in range(offsets[current], offsets[current + 1]):
+                if previous[targets[arc]] == arc:
+                    stack.append(targets[arc])
+        for current in affected:
+            cost[current] = max_cost
+            previous[current] = -1
+        #
+        loose_ends = []
+        for current in affected:
+            for r in range(self.reverse_offsets[current], self.reverse_offsets[current + 1]):
+                arc = self.reverse_arcs[r]
+                other = arc_sources[arc]
+                if other not in affected and tree.reached(other) and cost[other] + arc_costs[arc] < cost[current]:
+                    cost[current] = cost[other] + arc_costs[arc]
+                    previous[current] = arc
+            if previous[current] != -1:
+                heapq.heappush(loose_ends, (cost[current], current))
+        for arc, old_cost in update.old_costs.items():
+            current, other = arc_sources[arc], targets[arc]
+            if arc_costs[arc] < old_cost and tree.reached(current) and cost[current] + arc_costs[arc] < cost[other]:
+                cost[other] = cost[current] + arc_costs[arc]
+                previous[other] = arc
+                heapq.heappush(loose_ends, (cost[other], other))
+        #
+        repaired = set(affected)
+        while loose_ends:
+            current_cost, current = heapq.heappop(loose_ends)
+            if current_cost > cost[current]:
+                continue
+            repaired.add(current)
+            for arc in range(offsets[current], offsets[current + 1]):
+                other = targets[arc]
+                total_cost = current_cost + arc_costs[arc]
+                if total_cost < cost[other]:
+                    cost[other] = total_cost
+                    previous[other] = arc
+                    heapq.heappush(loose_ends, (total_cost, other))
+        tree.version = update.version
+        return repaired
+
+    def costs_to(self, sink, max_cost=infinity_cost):
+        # index = node index, value = cost to reach sink, found over the reverse arcs
+        offsets, arcs, arc_sources, arc_costs = self.reverse_offsets, self.reverse_arcs, self.arc_sources, self.arc_costs
+        cost = [max_cost] * len(self.node_list)
+        cost[sink] = 0
+        loose_ends = [(0, sink)]
+        while loose_ends:
+            current_cost, current = heapq.heappop(loose_ends)
+            if current_cost > cost[current]:
+                continue
+            for r in range(offsets[current], offsets[current + 1]):
+                arc = arcs[r]
+                other = arc_sources[arc]
+                total_cost = current_cost + arc_costs[arc]
+                if total_cost < cost[other]:
+                    cost[other] = total_cost
+                    heapq.heappush(loose_ends, (total_cost, other))
+        return cost
+
+    def spur_path(self, spur, sink, banned_arcs, banned_nodes, costs_to_sink, max_cost):
+        # A* towards sink avoiding the banned arcs and nodes, guided by the unrestricted costs to sink
+        offsets, targets, arc_costs = self.offsets, self.targets, self.arc_costs
+        cost = {spur: 0}  # key = node index, value = cost from spur
+        previous = {spur: -1}  # key = node index, value = arc index
+        settled = set()
+        loose_ends = [(costs_to_sink[spur], spur)]
+        while loose_ends:
+            _, current = heapq.heappop(loose_ends)
+            if current in settled:
+                continue
+            settled.add(current)
+            if current == sink:
+                arcs = []
+                while previous[current] != -1:
+                    arcs.append(previous[current])
+                    current = self.arc_sources[previous[current]]
+                return cost[sink], arcs[::-1]
+            for arc in range(offsets[current], offsets[current + 1]):
+                other = targets[arc]
+                if arc in banned_arcs or other in banned_nodes or costs_to_sink[other] >= max_cost:
+                    continue
+                total_cost = cost[current] + arc_costs[arc]
+                if total_cost < cost.get(other, max_cost):
+                    cost[other] = total_cost
+                    previous[other] = arc
+                    heapq.heappush(loose_ends, (total_cost + costs_to_sink[other], other))
+        return None
+
+    def k_shortest_paths(self, start_location: Node, end_location: Node, k, max_cost=infinity_cost):
+        # Yen's loopless paths, spurring each new path only from its deviation node onwards (Lawler)
+        if self.turn_costs:
+            # the arc searches below charge no junction costs, so go through the hooks instead
+            return super().k_shortest_paths(start_location, end_location, k, max_cost)
+        source = self.node_index[start_location.node_id]
+        sink = self.node_index[end_location.node_id]
+        arc_costs, targets = self.arc_costs, self.targets
+        costs_to_sink = self.costs_to(sink, max_cost)
+        if costs_to_sink[source] >= max_cost or k < 1:
+            return []
+        first = self.spur_path(source, sink, set(), set(), costs_to_sink, max_cost)
+        accepted = [(first[0], first[1], 0)]  # value = (cost, arcs, deviation index)
+        candidates = []  # value = (cost, count, arcs, deviation index)
+        seen = {tuple(first[1])}
+        count = 0
+        while len(accepted) < k:
+            _, arcs, deviation = accepted[-1]
+            nodes = [source] + [targets[arc] for arc in arcs]
+            root_cost = sum(arc_costs[arc] for arc in arcs[:deviation])
+            for d in range(deviation, len(arcs)):
+                root = arcs[:d]
+                banned_arcs = {other[1][d] for other in accepted if len(other[1]) > d and other[1][:d] == root}
+                spur = self.spur_path(nodes[d], sink, banned_arcs, set(nodes[:d]), costs_to_sink, max_cost - root_cost)
+                if spur is not None:
+                    path = root + spur[1]
+                    if tuple(path) not in seen:
+                        seen.add(tuple(path))
+                        count += 1
+                        heapq.heappush(candidates, (root_cost + spur[0], count, path, d))
+                root_cost += arc_costs[arcs[d]]
+            if not candidates:
+                break
+            cost, _, path, d = heapq.heappop(candidates)
+            accepted.append((cost, path, d))
+        return [Route(cost, [self.node_ids[source]] + [self.node_ids[targets[arc]] for arc in arcs],
+                      [self.link_list[self.arc_links[arc]] for arc in arcs]) for cost, arcs, _ in accepted]
+
+    def cost_matrix(self, origins, destinations, max_cost=infinity_cost):
+        import numpy
+        columns = array('q', [self.node_index[node.node_id] for node in destinations])
+        matrix = numpy.full((len(origins), len(destinations)), max_cost, dtype=float)
+        for i, node in enumerate(origins):
+            tree = self.run(node, targets=destinations, max_cost=max_cost)
+            matrix[i, :] = [tree.cost[j] if tree.reached(j) else max_cost for j in columns]
+        return matrix
+
+    def get_path_indices(self, end_node: Node):
+        return self.tree.get_path_indices(end_node)
+
+    def get_links_attached(self, node: Node):
+        i = self.node_index[node.node_id]
+        return [self.link_list[self.arc_links[arc]] for arc in range(self.offsets[i], self.offsets[i + 1])]
+
+    def get_links_arriving(self, node: Node):
+        i = self.node_index[node.node_id]
+        return [self.link_list[self.arc_links[self.reverse_arcs[r]]]
+                for r in range(self.reverse_offsets[i], self.reverse_offsets[i + 1])]
+
+    def get_other_node(self, link: Link, start_node: Node):
+        if link.start_node_id == start_node.node_id:
+            return self.node_list[self.node_index[link.end_node_id]]
+        elif link.end_node_id == start_node.node_id:
+            return self.node_list[self.node_index[link.start_node_id]]
+        else:
+            raise ValueError("Node not connected to link")
+
+    def junction_cost(self, link_prev: Link, middle_node: Node, link_next: Link):
+        return 0
+
+    def link_cost(self, link: Link, start_node: Node):
+        return distance(self.node_list[self.node_index[link.start_node_id]],
+                        self.node_list[self.node_index[link.end_node_id]])
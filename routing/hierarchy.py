@@ -0,0 +1,356 @@
+import heapq
+import math
+import pickle
+from array import array
+
+from .compiled import CompiledNetwork
+from .network import Node, infinity_cost
+
+
+class ContractionHierarchy:
+    file_version = 2
+
+    def __init__(self, network: CompiledNetwork):
+        network.check_no_turn_costs()
+        self.network = network
+        self.version = network.version  # network version the shortcuts were built on
+        self.rank = array('q')  # index = node index, value = contraction order
+        # edges 0 .. arc count - 1 are the network arcs, the rest are shortcuts
+        self.edge_sources = array('q')
+        self.edge_targets = array('q')
+        self.edge_costs = array('d')
+        self.edge_firsts = array('q')  # first half of a shortcut, -1 for an arc
+        self.edge_seconds = array('q')  # second half of a shortcut, -1 for an arc
+        self.up_offsets = array('q')  # index = node index, edges to higher ranked heads
+        self.up_edges = array('q')
+        self.down_offsets = array('q')  # index = node index, edges from higher ranked tails
+        self.down_edges = array('q')
+        self.initialise_run()
+
+    @classmethod
+    def build(cls, network: CompiledNetwork, witness_limit=50, estimate_limit=5):
+        hierarchy = cls(network)
+        hierarchy.contract(witness_limit, estimate_limit)
+        hierarchy.compile_search_graph()
+        return hierarchy
+
+    def initialise_run(self):
+        self.start_location = None
+        self.max_cost = infinity_cost  # cost cap of the last query
+        self.lowest_cost = {}  # key = node index on the last route, value = (cost, arc index or -1)
+
+    def add_edge(self, source, target, cost, first=-1, second=-1):
+        self.edge_sources.append(source)
+        self.edge_targets.append(target)
+        self.edge_costs.append(cost)
+        self.edge_firsts.append(first)
+        self.edge_seconds.append(second)
+        return len(self.edge_costs) - 1
+
+    def contract(self, witness_limit, estimate_limit):
+        network = self.network
+        node_count = len(network.node_list)
+        outgoing = [{} for _ in range(node_count)]  # key = head, value = edge
+        incoming = [{} for _ in range(node_count)]  # key = tail, value = edge
+        for arc in range(len(network.targets)):
+            source, target = network.arc_sources[arc], network.targets[arc]
+            self.add_edge(source, target, network.arc_costs[arc])
+            if target not in outgoing[source] or network.arc_costs[arc] < self.edge_costs[outgoing[source][target]]:
+                outgoing[source][target] = arc
+                incoming[target][source] = arc
+        #
+        deleted_neighbours = [0] * node_count
+        contracted = bytearray(node_count)
+        rank = [0] * node_count
+        priorities = [self.priority(v, outgoing, incoming, deleted_neighbours, witness_limit)
+                      for v in range(node_count)]
+        queue = [(priority, v) for v, priority in enumerate(priorities)]
+        heapq.heapify(queue)
+        order = 0
+        while queue:
+            priority, v = heapq.heappop(queue)
+            if contracted[v] or priority != priorities[v]:
+                continue
+            shortcuts = self.shortcuts(v, outgoing, incoming, witness_limit)
+            priority = len(shortcuts) - len(outgoing[v]) - len(incoming[v]) + deleted_neighbours[v]
+            if queue and priority > queue[0][0]:
+                priorities[v] = priority
+                heapq.heappush(queue, (priority, v))
+                continue
+            contracted[v] = 1
+            rank[v] = order
+            order += 1
+            for source, target, cost, first, second in shortcuts:
+                edge = self.add_edge(source, target, cost, first, second)
+                outgoing[source][target] = edge
+                incoming[target][source] = edge
+            neighbours = set(incoming[v]) | set(outgoing[v])
+            for u in incoming[v]:
+                del outgoing[u][v]
+            for w in outgoing[v]:
+                del incoming[w][v]
+            outgoing[v] = {}
+            incoming[v] = {}
+            for u in neighbours:
+                deleted_neighbours[u] += 1
+                # cheap estimate, it is recomputed with the full witness limit before contraction
+                priorities[u] = self.priority(u, outgoing, incoming, deleted_neighbours, estimate_limit)
+                heapq.heappush(queue, (priorities[u], u))
+        self.rank = array('q', rank)
+
+    def priority(self, v, outgoing, incoming, deleted_neighbours, witness_limit):
+        shortcuts = self.shortcuts(v, outgoing, incoming, witness_limit)
+        return len(shortcuts) - len(outgoing[v]) - len(incoming[v]) + deleted_neighbours[v]
+
+    def shortcuts(self, v, outgoing, incoming, witness_limit):
+        costs = self.edge_costs
+        shortcuts = []
+        for u, first in incoming[v].items():
+            heads = [(w, second) for w, second in outgoing[v].items() if w != u]
+            if not heads:
+                continue
+            limit = max(costs[first] + costs[second] for _, second in heads)
+            witness = self.witness_search(u, v, {w for w, _ in heads}, limit, outgoing, witness_limit)
+            for w, second in heads:
+                cost = costs[first] + costs[second]
+                if witness.get(w, math.inf) > cost:
+                    shortcuts.append((u, w, cost, first, second))
+        return shortcuts
+
+    def witness_search(self, source, excluded, targets, limit, outgoing, witness_limit):
+        costs = self.edge_costs
+        lowest_cost = {source: 0}
+        visited = set()
+        remaining = len(targets)
+        loose_ends = [(0, source)]
+        while loose_ends and len(visited) < witness_limit:
+            current_cost, current = heapq.heappop(loose_ends)
+            if current in visited:
+                continue
+            visited.add(current)
+            if current in targets:
+                remaining -= 1
+                if remaining == 0:
+                    break
+            for other, edge in outgoing[current].items():
+                if other == excluded:
+                    continue
+                total_cost = current_cost + costs[edge]
+                if total_cost <= limit and total_cost < lowest_cost.get(other, math.inf):
+                    lowest_cost[other] = total_cost
+                    heapq.heappush(loose_ends, (total_cost, other))
+        return lowest_cost
+
+    def compile_search_graph(self):
+        node_count = len(self.rank)
+        up = [{} for _ in range(node_count)]  # key = head, value = edge
+        down = [{} for _ in range(node_count)]  # key = tail, value = edge
+        for edge in range(len(self.edge_costs)):
+            source, target = self.edge_sources[edge], self.edge_targets[edge]
+            if self.rank[source] < self.rank[target]:
+                best = up[source].get(target)
+                if best is None or self.edge_costs[edge] < self.edge_costs[best]:
+                    up[source][target] = edge
+            else:
+                best = down[target].get(source)
+                if best is None or self.edge_costs[edge] < self.edge_costs[best]:
+                    down[target][source] = edge
+        self.up_offsets = array('q', [0])
+        self.up_edges = array('q')
+        for edges in up:
+            self.up_edges.extend(edges.values())
+            self.up_offsets.append(len(self.up_edges))
+        self.down_offsets = array('q', [0])
+        self.down_edges = array('q')
+        for edges in down:
+            self.down_edges.extend(edges.values())
+            self.down_offsets.append(len(self.down_edges))
+
+    def check_version(self):
+        if self.version != self.network.version:
+            raise ValueError("Hierarchy was built before the latest link cost update")
+
+    def run(self, start_location: Node, end_location: Node, max_cost=infinity_cost):
+        self.check_version()
+        self.initialise_run()
+        self.start_location = start_location
+        self.max_cost = max_cost
+        network = self.network
+        source = network.node_index[start_location.node_id]
+        sink = network.node_index[end_location.node_id]
+        forward = {source: (0, -1)}  # key = node index, value = (cost, edge)
+        backward = {sink: (0, -1)}
+        forward_ends = [(0, source)]
+        backward_ends = [(0, sink)]
+        best_cost, meeting = (0, source) if source == sink else (max_cost, -1)
+        edge_sources, edge_targets, edge_costs = self.edge_sources, self.edge_targets, self.edge_costs
+        #
+        while (forward_ends and forward_ends[0][0] < best_cost) or (backward_ends and backward_ends[0][0] < best_cost):
+            if forward_ends and forward_ends[0][0] < best_cost and \
+                    (not backward_ends or backward_ends[0][0] >= best_cost or forward_ends[0][0] <= backward_ends[0][0]):
+                current_cost, current = heapq.heappop(forward_ends)
+                if current_cost > forward[current][0]:
+                    continue
+                if current in backward and current_cost + backward[current][0] < best_cost:
+                    best_cost, meeting = current_cost + backward[current][0], current
+                for k in range(self.up_offsets[current], self.up_offsets[current + 1]):
+                    edge = self.up_edges[k]
+                    other = edge_targets[edge]
+                    total_cost = current_cost + edge_costs[edge]
+                    if other not in forward or total_cost < forward[other][0]:
+                        forward[other] = total_cost, edge
+                        heapq.heappush(forward_ends, (total_cost, other))
+            else:
+                current_cost, current = heapq.heappop(backward_ends)
+                if current_cost > backward[current][0]:
+                    continue
+                if current in forward and current_cost + forward[current][0] < best_cost:
+                    best_cost, meeting = current_cost + forward[current][0], current
+                for k in range(self.down_offsets[current], self.down_offsets[current + 1]):
+                    edge = self.down_edges[k]
+                    other = edge_sources[edge]
+                    total_cost = current_cost + edge_costs[edge]
+                    if other not in backward or total_cost < backward[other][0]:
+                        backward[other] = total_cost, edge
+                        heapq.heappush(backward_ends, (total_cost, other))
+        #
+        if meeting == -1:
+            return max_cost
+        edges = []
+        current = meeting
+        while forward[current][1] != -1:
+            edges.append(forward[current][1])
+            current = edge_sources[forward[current][1]]
+        edges.reverse()
+        current = meeting
+        while backward[current][1] != -1:
+            edges.append(backward[current][1])
+            current = edge_targets[backward[current][1]]
+        #
+        current_cost = 0
+        self.lowest_cost[source] = 0, -1
+        for arc in self.unpack(edges):
+            current_cost += network.arc_costs[arc]
+            self.lowest_cost[network.targets[arc]] = current_cost, arc
+        return best_cost
+
+    def upward_costs(self, source, offsets, edges, heads):
+        edge_costs = self.edge_costs
+        lowest_cost = {source: 0}  # key = node index, value = cost
+        loose_ends = [(0, source)]
+        while loose_ends:
+            current_cost, current = heapq.heappop(loose_ends)
+            if current_cost > lowest_cost[current]:
+                continue
+            for k in range(offsets[current], offsets[current + 1]):
+                edge = edges[k]
+                other = heads[edge]
+                total_cost = current_cost + edge_costs[edge]
+                if total_cost < lowest_cost.get(other, math.inf):
+                    lowest_cost[other] = total_cost
+                    heapq.heappush(loose_ends, (total_cost, other))
+        return lowest_cost
+
+    def cost_matrix(self, origins, destinations, max_cost=infinity_cost):
+        import numpy
+        self.check_version()
+        node_index = self.network.node_index
+        matrix = numpy.full((len(origins), len(destinations)), max_cost, dtype=float)
+        # bucket of every node reached upwards from a destination: destination columns and their costs
+        bucket_columns, bucket_costs = {}, {}
+        for j, node in enumerate(destinations):
+            backward = self.upward_costs(node_index[node.node_id], self.down_offsets, self.down_edges,
+                                         self.edge_sources)
+            for v, cost in backward.items():
+                if v not in bucket_columns:
+                    bucket_columns[v], bucket_costs[v] = array('q'), array('d')
+                bucket_columns[v].append(j)
+                bucket_costs[v].append(cost)
+        for i, node in enumerate(origins):
+            row = [max_cost] * len(destinations)
+            forward = self.upward_costs(node_index[node.node_id], self.up_offsets, self.up_edges, self.edge_targets)
+            for v, cost in forward.items():
+                if v in bucket_columns:
+                    for j, backward_cost in zip(bucket_columns[v], bucket_costs[v]):
+                        if cost + backward_cost < row[j]:
+                            row[j] = cost + backward_cost
+            matrix[i, :] = row
+        return matrix
+
+    def unpack(self, edges):
+        arcs = []
+        stack = [x for x in reversed(edges)]
+        while stack:
+            edge = stack.pop()
+            if self.edge_firsts[edge] == -1:
+                arcs.append(edge)
+            else:
+                stack.append(self.edge_seconds[edge])
+                stack.append(self.edge_firsts[edge])
+        return arcs
+
+    def get_cost(self, node: Node):
+        i = self.network.node_index.get(node.node_id)
+        if i in self.lowest_cost:
+            return self.lowest_cost[i][0]
+        else:
+            return max(self.max_cost, infinity_cost)
+
+    def get_previous_link(self, node: Node):
+        i = self.network.node_index.get(node.node_id)
+        if i in self.lowest_cost and self.lowest_cost[i][1] != -1:
+            return self.network.link_list[self.network.arc_links[self.lowest_cost[i][1]]]
+        else:
+            return None
+
+    def get_path_indices(self, end_node: Node):
+        path = []
+        i = self.network.node_index.get(end_node.node_id)
+        if i in self.lowest_cost:
+            while self.lowest_cost[i][1] != -1:
+                path.append(i)
+                i = self.network.arc_sources[self.lowest_cost[i][1]]
+            path.append(i)
+        return [x for x in reversed(path)]
+
+    def get_path(self, end_node: Node):
+        return [self.network.node_list[i] for i in self.get_path_indices(end_node)]
+
+    def get_path_ids(self, end_node: Node):
+        return [self.network.node_ids[i] for i in self.get_path_indices(end_node)]
+
+    def get_path_links(self, end_node: Node):
+        path = self.get_path_indices(end_node)
+        return [self.get_previous_link(self.network.node_list[i]) for i in path[1:]]
+
+    def save(self, path):
+        data = {
+            "version": self.file_version,
+            "node_ids": list(self.network.node_ids),
+            "arc_count": len(self.network.targets),
+            "arc_costs": array('d', self.network.arc_costs),
+            "rank": self.rank,
+            "edge_sources": self.edge_sources,
+            "edge_targets": self.edge_targets,
+            "edge_costs": self.edge_costs,
+            "edge_firsts": self.edge_firsts,
+            "edge_seconds": self.edge_seconds,
+        }
+        with open(path, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path, network: CompiledNetwork):
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        if data.get("version") != cls.file_version:
+            raise ValueError("Unsupported hierarchy file version")
+        if data["node_ids"] != list(network.node_ids) or data["arc_count"] != len(network.targets):
+            raise ValueError("Hierarchy was built for a different network")
+        if data["arc_costs"] != array('d', network.arc_costs):
+            raise ValueError("Hierarchy was built for different link costs")
+        hierarchy = cls(network)
+        for key in ["rank", "edge_sources", "edge_targets", "edge_costs", "edge_firsts", "edge_seconds"]:
+            setattr(hierarchy, key, data[key])
+        hierarchy.compile_search_graph()
+        return hierarchy
@@ -0,0 +1,164 @@
+import contextlib
+import csv
+import json
+import re
+
+from .network import Link, Node
+from .tables import LinkTable, NodeTable
+
+_features_pattern = re.compile(r'"features"\s*:\s*\[')
+_separators = " \t\r\n,\x1e"
+
+
+@contextlib.contextmanager
+def _open_source(source, newline=None):
+    if hasattr(source, "read"):
+        yield source
+    else:
+        with open(source, "r", encoding="utf-8", newline=newline) as f:
+            yield f
+
+
+def _metadata(row, used_fields):
+    metadata = {key: value for key, value in row.items() if key not in used_fields and value not in ("", None)}
+    return metadata or None
+
+
+def read_csv_nodes(source, id_field="id", coord_fields=("x", "y"), id_type=int, delimiter=","):
+    used_fields = {id_field, *coord_fields}
+    with _open_source(source, newline="") as f:
+        for row in csv.DictReader(f, delimiter=delimiter):
+            try:
+                cells = [row.get(field) for field in coord_fields]
+                coords = None
+                if any(cells):
+                    coords = tuple(float(cell) for cell in cells)
+                yield Node(id_type(row[id_field]), coords, _metadata(row, used_fields))
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError("Invalid node record {0}: {1}".format(row, e)) from e
+
+
+def read_csv_links(source, id_field="id", start_field="start", end_field="end", id_type=int, delimiter=","):
+    used_fields = {id_field, start_field, end_field}
+    with _open_source(source, newline="") as f:
+        for row in csv.DictReader(f, delimiter=delimiter):
+            try:
+                yield Link(id_type(row[id_field]), id_type(row[start_field]), id_type(row[end_field]),
+                           _metadata(row, used_fields))
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError("Invalid link record {0}: {1}".format(row, e)) from e
+
+
+def _stream_objects(f, chunk_size):
+    # yields the features of a FeatureCollection, or each object of a newline delimited or RS separated file,
+    # holding at most one feature and one chunk of text at a time
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    at_end = False
+    in_collection = False
+    while True:
+        while position < len(buffer) and buffer[position] in _separators:
+            position += 1
+        if in_collection and position < len(buffer) and buffer[position] == "]":
+            return
+        if position == len(buffer):
+            if at_end:
+                if in_collection:
+                    raise ValueError("GeoJSON feature collection is not closed")
+                return
+            chunk = f.read(chunk_size)
+            at_end = not chunk
+            buffer, position = chunk, 0
+            continue
+        try:
+            value, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            match = None if in_collection else _features_pattern.search(buffer, position)
+            if match:
+                in_collection = True
+                position = match.end()
+                continue
+            if at_end:
+                raise ValueError("Invalid GeoJSON text near: {0}".format(buffer[position:position + 40]))
+            chunk = f.read(chunk_size)
+            at_end = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        if not in_collection and isinstance(value, dict) and value.get("type") == "FeatureCollection":
+            yield from value.get("features", [])
+        else:
+            yield value
+
+
+def _position(point, lat_lon):
+    # GeoJSON positions are [longitude, latitude, ...]
+    if lat_lon:
+        return (point[1], point[0], *point[2:])
+    return tuple(point)
+
+
+def read_geojson(source, id_field="id", start_field="start", end_field="end", chunk_size=65536, lat_lon=True):
+    # Point features become nodes and LineString features become links. Links without start and end
+    # properties are joined to the nodes at their end coordinates, creating nodes for new coordinates.
+    # With lat_lon the coords are (latitude, longitude) as great_circle_distance expects.
+    # Created nodes get negative ids, so only a Point with a negative id can clash with them.
+    node_ids = {}  # key = coords, value = node id
+    used_ids = set()
+    next_id = -1
+    with _open_source(source) as f:
+        for feature in _stream_objects(f, chunk_size):
+            try:
+                geometry = feature.get("geometry") or {}
+                properties = dict(feature.get("properties") or {})
+                property_id = properties.pop(id_field, None)
+                feature_id = feature.get("id", property_id)
+                if geometry.get("type") == "Point":
+                    if feature_id in used_ids:
+                        raise ValueError("Node id {0} is already in use".format(feature_id))
+                    coords = _position(geometry["coordinates"], lat_lon)
+                    node = Node(feature_id, coords, properties or None)
+                    node_ids.setdefault(coords, feature_id)
+                    used_ids.add(feature_id)
+                    yield node
+                elif geometry.get("type") == "LineString":
+                    points = geometry["coordinates"]
+                    ends = [properties.pop(start_field, None), properties.pop(end_field, None)]
+                    for k, point in enumerate((points[0], points[-1])):
+                        if ends[k] is not None:
+                            continue
+                        coords = _position(point, lat_lon)
+                        if coords not in node_ids:
+                            while next_id in used_ids:
+                                next_id -= 1
+                            node_ids[coords] = next_id
+                            used_ids.add(next_id)
+                            yield Node(next_id, coords)
+                        ends[k] = node_ids[coords]
+                    yield Link(feature_id, ends[0], ends[1], properties or None)
+                else:
+                    raise ValueError("Unsupported geometry {0}".format(geometry.get("type")))
+            except (AttributeError, IndexError, KeyError, TypeError, ValueError) as e:
+                raise ValueError("Invalid feature {0}: {1}".format(str(feature)[:80], e)) from e
+
+
+def build_dicts(records):
+    nodes, links = {}, {}
+    for record in records:
+        if isinstance(record, Node):
+            nodes[record.node_id] = record
+        else:
+            links[record.link_id] = record
+    return nodes, links
+
+
+def build_tables(records, dimensions=2):
+    # links must follow the nodes they connect
+    nodes = NodeTable(dimensions)
+    links = LinkTable(nodes)
+    for record in records:
+        if isinstance(record, Node):
+            nodes.append(record.node_id, record.coords, record.metadata)
+        else:
+            links.append(record.link_id, record.start_node_id, record.end_node_id, record.metadata)
+    return nodes, links
@@ -0,0 +1,86 @@
+from .network import Node, earth_radius
+from .tables import NodeTable
+
+metrics = ("euclidean", "manhattan", "great_circle")
+
+
+def coords_array(nodes):
+    import numpy as np
+    if isinstance(nodes, NodeTable):
+        if not all(nodes.has_coords):
+            raise ValueError("Coords are null")
+        return np.array(nodes.coords, dtype=np.float64).reshape(-1, nodes.dimensions)
+    rows = []
+    for node in nodes:
+        if not node.coords:
+            raise ValueError("Coords are null")
+        rows.append(node.coords)
+    try:
+        coords = np.array(rows, dtype=np.float64)
+    except ValueError:
+        raise TypeError("Coords do not share same types")
+    return coords.reshape(len(rows), -1)
+
+
+def kernel_distances(coords1, coords2, metric="euclidean"):
+    # coords are float arrays of shape (n, d) or (d,), broadcast against each other
+    import numpy as np
+    if coords1.shape[-1] != coords2.shape[-1]:
+        raise TypeError("Coords do not share same types")
+    # the per dimension loops keep the summation order of the scalar functions so results are identical
+    if metric == "euclidean":
+        diff = coords1 - coords2
+        length2 = diff[..., 0]*diff[..., 0]
+        for k in range(1, diff.shape[-1]):
+            length2 = length2 + diff[..., k]*diff[..., k]
+        return np.sqrt(length2)
+    if metric == "manhattan":
+        diff = np.abs(coords1 - coords2)
+        length = diff[..., 0]
+        for k in range(1, diff.shape[-1]):
+            length = length + diff[..., k]
+        return length
+    if metric == "great_circle":
+        if coords1.shape[-1] != 2:
+            raise TypeError("Coords are not latitude and longitude")
+        lat1 = np.radians(coords1[..., 0])
+        lat2 = np.radians(coords2[..., 0])
+        half_dlat = np.sin((lat2 - lat1) / 2)
+        half_dlon = np.sin(np.radians(coords2[..., 1] - coords1[..., 1]) / 2)
+        a = half_dlat*half_dlat + np.cos(lat1)*np.cos(lat2)*half_dlon*half_dlon
+        return 2*earth_radius*np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    raise ValueError("Unknown metric {0}".format(metric))
+
+
+def pair_distances(nodes1, nodes2, metric="euclidean"):
+    if len(nodes1) != len(nodes2):
+        raise ValueError("Node sequences differ in length")
+    return kernel_distances(coords_array(nodes1), coords_array(nodes2), metric)
+
+
+def distances_from(node: Node, nodes, metric="euclidean"):
+    return kernel_distances(coords_array([node])[0], coords_array(nodes), metric)
+
+
+def arc_distances(network, metric="euclidean"):
+    # network is a CompiledNetwork, result is indexed by arc like its arc_costs
+    import numpy as np
+    coords = coords_array(network.node_list)
+    sources = np.array(network.arc_sources, dtype=np.int64)
+    targets = np.array(network.targets, dtype=np.int64)
+    return kernel_distances(coords[sources], coords[targets], metric)
+
+
+def distance_heuristic(network, metric="euclidean"):
+    # distances from every node to the target are computed together the first time a target is seen
+    coords = coords_array(network.node_list)
+    table = {}  # key = target node id, value = distances indexed by node index
+
+    def heuristic(node: Node, target: Node):
+        distances = table.get(target.node_id)
+        if distances is None:
+            distances = kernel_distances(coords, coords[network.node_index[target.node_id]], metric).tolist()
+            table.clear()
+            table[target.node_id] = distances
+        return distances[network.node_index[node.node_id]]
+    return heuristic
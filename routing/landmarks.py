@@ -0,0 +1,148 @@
+import math
+import pickle
+import random
+from array import array
+
+from .compiled import CompiledNetwork
+from .network import Node
+
+
+class Landmarks:
+    file_version = 2
+
+    def __init__(self, network: CompiledNetwork):
+        network.check_no_turn_costs()
+        self.network = network
+        self.version = network.version  # network version the tables were built on
+        self.landmarks = array('q')  # node indices
+        # index = landmark number * node count + node index, math.inf when unreachable
+        self.from_costs = array('d')  # cost from the landmark to the node
+        self.to_costs = array('d')  # cost from the node to the landmark
+
+    @classmethod
+    def build(cls, network: CompiledNetwork, count=8, method="avoid", seed=0):
+        if method not in ("avoid", "farthest"):
+            raise ValueError("Unknown landmark selection {0}".format(method))
+        landmarks = cls(network)
+        node_count = len(network.node_list)
+        rnd = random.Random(seed)
+        # the first landmark is the node farthest from a random start
+        start = network.run(network.node_list[rnd.randrange(node_count)], max_cost=math.inf)
+        landmarks.add(landmarks.farthest(start.cost))
+        while len(landmarks.landmarks) < min(count, node_count):
+            chosen = -1
+            if method == "avoid":
+                chosen = landmarks.avoid(rnd.randrange(node_count))
+            if chosen == -1:
+                closest = [min(landmarks.from_costs[k * node_count + i] for k in range(len(landmarks.landmarks)))
+                           for i in range(node_count)]
+                chosen = landmarks.farthest(closest)
+            if chosen == -1:
+                break
+            landmarks.add(chosen)
+        return landmarks
+
+    def farthest(self, costs):
+        # the reached node with the highest cost, or an unreached one to cover another component
+        best, best_cost = -1, -1
+        for i, cost in enumerate(costs):
+            if i in self.landmarks:
+                continue
+            if cost == math.inf:
+                return i
+            if cost > best_cost:
+                best, best_cost = i, cost
+        return best
+
+    def avoid(self, root):
+        # grow the tree from root and descend into the subtree that the current landmarks cover worst
+        network = self.network
+        tree = network.run(network.node_list[root], max_cost=math.inf)
+        cost, previous = tree.cost, tree.previous
+        reached = sorted((i for i in range(len(cost)) if tree.reached(i)), key=lambda i: -cost[i])
+        size = [0.0] * len(cost)
+        covered = bytearray(len(cost))
+        children = {}  # key = node index, value = child node indices
+        for i in reached:
+            size[i] += cost[i] - self.lower_bound(root, i)
+            if i in self.landmarks:
+                covered[i] = 1
+            if covered[i]:
+                size[i] = 0.0
+            if previous[i] != -1:
+                parent = network.arc_sources[previous[i]]
+                size[parent] += size[i]
+                covered[parent] |= covered[i]
+                children.setdefault(parent, []).append(i)
+        current = root
+        while current in children:
+            best = max(children[current], key=lambda i: size[i])
+            if size[best] <= 0:
+                break
+            current = best
+        return -1 if current == root or current in self.landmarks else current
+
+    def add(self, i):
+        network = self.network
+        self.landmarks.append(i)
+        self.from_costs.extend(network.run(network.node_list[i], max_cost=math.inf).cost)
+        if network.directed:
+            self.to_costs.extend(network.costs_to(i, max_cost=math.inf))
+        else:
+            self.to_costs.extend(self.from_costs[-len(network.node_list):])
+
+    def lower_bound(self, source, target):
+        node_count = len(self.network.node_list)
+        bound = 0
+        for k in range(len(self.landmarks)):
+            offset = k * node_count
+            # triangle inequality through each landmark, both ways round
+            from_source, from_target = self.from_costs[offset + source], self.from_costs[offset + target]
+            if from_source != math.inf and from_target != math.inf and from_target - from_source > bound:
+                bound = from_target - from_source
+            to_source, to_target = self.to_costs[offset + source], self.to_costs[offset + target]
+            if to_source != math.inf and to_target != math.inf and to_source - to_target > bound:
+                bound = to_source - to_target
+        return bound
+
+    def check_version(self):
+        if self.version != self.network.version:
+            raise ValueError("Landmarks were built before the latest link cost update")
+
+    def heuristic(self):
+        self.check_version()
+        node_index = self.network.node_index
+
+        def landmark_heuristic(node: Node, target: Node):
+            # bounds go stale, and may overestimate, once link costs change
+            self.check_version()
+            return self.lower_bound(node_index[node.node_id], node_index[target.node_id])
+        return landmark_heuristic
+
+    def save(self, path):
+        data = {
+            "version": self.file_version,
+            "node_ids": list(self.network.node_ids),
+            "arc_count": len(self.network.targets),
+            "arc_costs": array('d', self.network.arc_costs),
+            "landmarks": self.landmarks,
+            "from_costs": self.from_costs,
+            "to_costs": self.to_costs,
+        }
+        with open(path, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path, network: CompiledNetwork):
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        if data.get("version") != cls.file_version:
+            raise ValueError("Unsupported landmark file version")
+        if data["node_ids"] != list(network.node_ids) or data["arc_count"] != len(network.targets):
+            raise ValueError("Landmarks were built for a different network")
+        if data["arc_costs"] != array('d', network.arc_costs):
+            raise ValueError("Landmarks were built for different link costs")
+        landmarks = cls(network)
+        for key in ["landmarks", "from_costs", "to_costs"]:
+            setattr(landmarks, key, data[key])
+        return landmarks
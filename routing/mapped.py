@@ -0,0 +1,170 @@
+import bisect
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+
+from .compiled import CompiledNetwork, CompiledShortestPathTree
+from .network import Link, Network, Node
+from .profiles import ProfileTable
+from .tables import TableSequence
+
+
+class SortedIndex(Mapping):
+    def __init__(self, ids, sorted_ids, sorted_rows):
+        self.ids = ids  # index = row, value = id
+        self.sorted_ids = sorted_ids  # ids in ascending order
+        self.sorted_rows = sorted_rows  # index = position in sorted_ids, value = row
+
+    def __getitem__(self, key):
+        if not isinstance(key, int):
+            raise KeyError(key)
+        k = bisect.bisect_left(self.sorted_ids, key)
+        if k == len(self.sorted_ids) or self.sorted_ids[k] != key:
+            raise KeyError(key)
+        return self.sorted_rows[k]
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class MappedNetwork(CompiledNetwork):
+    magic = b"RTGRAPH\0"
+    file_version = 1
+    # magic, version, flags, dimensions, node count, link count, arc count
+    header = struct.Struct("<8sIIqqqq")
+    directed_flag = 1
+    big_endian_flag = 2
+
+    def __init__(self, path):
+        if type(self).junction_cost is not CompiledNetwork.junction_cost:
+            raise ValueError("Mapped graphs do not support junction costs")
+        Network.__init__(self)
+        self.tree = CompiledShortestPathTree(self)
+        self.profiles = ProfileTable()
+        self.arc_profiles = None
+        self.turn_costs = {}
+        self.path = path
+        with open(path, "rb") as f:
+            self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.views = []
+        try:
+            self.map_sections()
+        except Exception:
+            self.close()
+            raise
+
+    def map_sections(self):
+        if len(self.mapping) < self.header.size:
+            raise ValueError("File is not a mapped graph")
+        magic, version, flags, dimensions, node_count, link_count, arc_count = self.header.unpack_from(self.mapping)
+        if magic != self.magic:
+            raise ValueError("File is not a mapped graph")
+        if version != self.file_version:
+            raise ValueError("Unsupported graph file version")
+        if bool(flags & self.big_endian_flag) != (sys.byteorder == "big"):
+            raise ValueError("Graph file was written with a different byte order")
+        self.directed = bool(flags & self.directed_flag)
+        self.dimensions = dimensions
+        buffer = memoryview(self.mapping)
+        self.views.append(buffer)
+        position = self.header.size
+
+        def section(code, count):
+            nonlocal position
+            size = count * array(code).itemsize
+            if position + size > len(self.mapping):
+                raise ValueError("Graph file is truncated")
+            view = buffer[position:position + size].cast(code)
+            self.views.append(view)
+            position += (size + 7) // 8 * 8
+            return view
+
+        self.offsets = section('q', node_count + 1)
+        self.targets = section('q', arc_count)
+        self.arc_sources = section('q', arc_count)
+        self.arc_links = section('q', arc_count)
+        self.arc_costs = section('d', arc_count)
+        self.reverse_offsets = section('q', node_count + 1)
+        self.reverse_arcs = section('q', arc_count)
+        self.coords = section('d', node_count * dimensions)
+        self.has_coords = section('B', node_count)
+        self.node_ids = section('q', node_count)
+        self.node_index = SortedIndex(self.node_ids, section('q', node_count), section('q', node_count))
+        self.link_ids = section('q', link_count)
+        self.link_index = SortedIndex(self.link_ids, section('q', link_count), section('q', link_count))
+        self.link_starts = section('q', link_count)
+        self.link_ends = section('q', link_count)
+        self.node_list = TableSequence(self.node, node_count)
+        self.link_list = TableSequence(self.link, link_count)
+
+    def close(self):
+        for view in reversed(self.views):
+            view.release()
+        self.views = []
+        self.mapping.close()
+
+    def __reduce__(self):
+        # workers map the same file rather than receiving a copy of the arrays
+        return self.__class__, (self.path,)
+
+    def update_link_costs(self, costs: dict):
+        raise ValueError("Mapped graphs are read-only, save a network with the new costs instead")
+
+    def repair(self, tree: CompiledShortestPathTree, update):
+        raise ValueError("Mapped graphs are read-only, save a network with the new costs instead")
+
+    def node(self, i):
+        coords = None
+        if self.has_coords[i]:
+            coords = tuple(self.coords[i * self.dimensions:(i + 1) * self.dimensions])
+        return Node(self.node_ids[i], coords)
+
+    def link(self, j):
+        return Link(self.link_ids[j], self.node_ids[self.link_starts[j]], self.node_ids[self.link_ends[j]])
+
+    @classmethod
+    def save(cls, network: CompiledNetwork, path):
+        if network.turn_costs:
+            raise ValueError("Mapped graphs do not store junction costs")
+        node_count = len(network.node_list)
+        link_count = len(network.link_list)
+        dimensions = max((len(node.coords) for node in network.node_list if node.coords), default=0)
+        coords = array('d')
+        has_coords = array('B')
+        for node in network.node_list:
+            if node.coords and len(node.coords) == dimensions:
+                coords.extend(node.coords)
+                has_coords.append(1)
+            else:
+                coords.extend([0.0] * dimensions)
+                has_coords.append(0)
+        try:
+            node_ids = array('q', network.node_ids)
+            link_ids = array('q', [link.link_id for link in network.link_list])
+        except TypeError:
+            raise TypeError("Mapped graphs need integer node and link ids")
+        link_starts = array('q', [network.node_index[link.start_node_id] for link in network.link_list])
+        link_ends = array('q', [network.node_index[link.end_node_id] for link in network.link_list])
+        node_order = sorted(range(node_count), key=node_ids.__getitem__)
+        link_order = sorted(range(link_count), key=link_ids.__getitem__)
+        flags = (cls.directed_flag if network.directed else 0) | (cls.big_endian_flag if sys.byteorder == "big" else 0)
+        sections = [
+            array('q', network.offsets), array('q', network.targets), array('q', network.arc_sources),
+            array('q', network.arc_links), array('d', network.arc_costs), array('q', network.reverse_offsets),
+            array('q', network.reverse_arcs), coords, has_coords,
+            node_ids, array('q', [node_ids[i] for i in node_order]), array('q', node_order),
+            link_ids, array('q', [link_ids[j] for j in link_order]), array('q', link_order),
+            link_starts, link_ends,
+        ]
+        with open(path, "wb") as f:
+            f.write(cls.header.pack(cls.magic, cls.file_version, flags, dimensions,
+                                    node_count, link_count, len(network.targets)))
+            for data in sections:
+                data = data.tobytes()
+                f.write(data)
+                f.write(bytes(-len(data) % 8))
@@ -1,10 +1,18 @@
+import functools
+import heapq
+import itertools
 import math
+import multiprocessing
+import time
 
 
 infinity_cost = 999  # float("inf")
+earth_radius = 6371008.8  # mean radius in metres
 
 
 class Node:
+    __slots__ = ("node_id", "coords", "metadata")
+
     def __init__(self, node_id, coords=None, metadata: dict = None):
         if coords and not (isinstance(coords, tuple) or isinstance(coords, list)):
             raise TypeError("Coords not a recognised form")
@@ -25,6 +33,8 @@ class Node:
 
 
 class Link:
+    __slots__ = ("link_id", "start_node_id", "end_node_id", "metadata")
+
     def __init__(self, link_id, start_node_id, end_node_id, metadata: dict = None):
         if metadata and not isinstance(metadata, dict):
             raise TypeError("Metadata is not a dictionary")
@@ -74,57 +84,141 @@ def manhattan_distance(node1: Node, node2: Node):
     return length
 
 
-class Network:
-    def __init__(self):
-        self.start_location = None
-        self.lowest_cost = {}  # key = node, value = (cost, previous_link)
-        self.visited = set()  # key = node
+def great_circle_distance(node1: Node, node2: Node):
+    # coords are (latitude, longitude) in degrees, result in metres
+    coords1 = node1.coords
+    coords2 = node2.coords
+    if not (coords1 and coords2):
+        raise ValueError("Coords are null")
+    if type(coords1) != type(coords2):
+        raise TypeError("Coords do not share same types")
+    if len(coords1) != 2 or len(coords2) != 2:
+        raise TypeError("Coords are not latitude and longitude")
+    lat1 = math.radians(coords1[0])
+    lat2 = math.radians(coords2[0])
+    half_dlat = math.sin((lat2 - lat1) / 2)
+    half_dlon = math.sin(math.radians(coords2[1] - coords1[1]) / 2)
+    a = half_dlat*half_dlat + math.cos(lat1)*math.cos(lat2)*half_dlon*half_dlon
+    return 2*earth_radius*math.asin(math.sqrt(min(a, 1.0)))
 
-    def initialise_run(self):
-        self.start_location = None
-        self.lowest_cost.clear()
-        self.visited.clear()
 
-    def run(self, start_location: Node):
-        self.initialise_run()
+def _scaled_heuristic(heuristic, factor, node1: Node, node2: Node):
+    return factor * heuristic(node1, node2)
+
+
+def scaled(heuristic, factor):
+    # a partial rather than a closure, so run_many can pickle it for its workers
+    return functools.partial(_scaled_heuristic, heuristic, factor)
+
+
+_worker_network = None
+
+
+def _initialise_worker(network):
+    global _worker_network
+    _worker_network = network
+    # statistics still ride back on each tree, the parent process tells the observers
+    if network.observers is not None:
+        network.observers = []
+
+
+def _run_worker(query):
+    start_location, options = query
+    return start_location, _worker_network.run(start_location, **options)
+
+
+class SearchStats:
+    def __init__(self, start_location: Node = None):
         self.start_location = start_location
-        self.lowest_cost[self.start_location] = 0, None
-        #
-        loose_ends = [(0, start_location)]
-        #
-        while len(loose_ends) > 0:
-            loose_ends.sort(key=lambda x: x[0])
-            current_node = loose_ends[0][1]
-            del loose_ends[0]
-            if current_node in self.visited:
-                continue
-            #
-            current_cost, prev_link = self.lowest_cost[current_node]
-            self.visited.add(current_node)
-            #
-            links = self.get_links_attached(current_node)
-            for link in links:
-                node_cost = self.junction_cost(prev_link, current_node, link)
-                link_cost = self.link_cost(link, current_node)
-                total_cost = current_cost + node_cost + link_cost
-                #
-                other = self.get_other_node(link, current_node)
-                assert other != current_node
-                if other in self.lowest_cost:
-                    last_cost, _ = self.lowest_cost[other]
-                else:
-                    last_cost = infinity_cost
-                if total_cost < last_cost:
-                    self.lowest_cost[other] = total_cost, link
-                    loose_ends.append((total_cost, other))
-                elif last_cost != infinity_cost:
-                    loose_ends.append((last_cost, other))
+        self.nodes_settled = 0
+        self.edges_relaxed = 0
+        self.heap_pushes = 0
+        self.heap_pops = 0
+        self.stale_pops = 0
+        self.max_frontier = 0
+        self.hook_calls = {}  # key = hook name, value = number of calls
+        self.hook_time = {}  # key = hook name, value = seconds spent in the hook
+        self.wall_time = 0.0
+
+    def timed(self, hook, name=None):
+        name = name or hook.__name__
+        self.hook_calls[name] = 0
+        self.hook_time[name] = 0.0
+
+        def timed_hook(*args):
+            begin = time.perf_counter()
+            try:
+                return hook(*args)
+            finally:
+                self.hook_time[name] += time.perf_counter() - begin
+                self.hook_calls[name] += 1
+        return timed_hook
+
+    def finish(self, loose_ends, begin):
+        self.stale_pops = self.heap_pops - self.nodes_settled
+        self.heap_pushes = self.heap_pops + len(loose_ends)
+        self.wall_time = time.perf_counter() - begin
+
+    def as_dict(self):
+        data = {key: value for key, value in self.__dict__.items() if key != "start_location"}
+        data["hook_calls"] = dict(self.hook_calls)
+        data["hook_time"] = dict(self.hook_time)
+        return data
+
+
+class TurnRestrictions:
+    def __init__(self, bans=()):
+        self.banned = set()  # key = (link_id, next link_id)
+        for link_id, next_link_id in bans:
+            self.ban(link_id, next_link_id)
+
+    def ban(self, link_id, next_link_id):
+        self.banned.add((link_id, next_link_id))
+
+    def is_banned(self, link_id, next_link_id):
+        return (link_id, next_link_id) in self.banned
+
+    def __len__(self):
+        return len(self.banned)
+
+
+class Route:
+    def __init__(self, cost, node_ids: list, links: list):
+        self.cost = cost
+        self.node_ids = node_ids
+        self.links = links
+
+    def __repr__(self):
+        return "Route(cost={0}, node ids={1})".format(self.cost, self.node_ids)
+
+
+class ShortestPathTree:
+    def __init__(self, network, start_location: Node = None, max_cost=infinity_cost):
+        self.network = network
+        self.start_location = start_location
+        self.max_cost = max_cost  # cost of unreached nodes
+        self.version = getattr(network, "version", 0)  # network version the tree was built on
+        self.lowest_cost = {}  # key = node, value = (cost, previous_link)
+        self.visited = set()  # key = node
+        self.edge_cost = {}  # key = (node, previous_link), value = (cost, link before previous_link)
+        self.owner = {}  # key = node, value = source node it was reached from, only set by multi-source runs
+        self.stats = None  # SearchStats of the run when instrumentation is enabled
+
+    def __getstate__(self):
+        # the network stays behind when a tree is sent between processes
+        state = self.__dict__.copy()
+        state["network"] = None
+        return state
 
     def get_cost(self, node: Node):
         if node in self.lowest_cost:
             return self.lowest_cost[node][0]
         else:
-            return infinity_cost
+            return self.unreached_cost()
+
+    def unreached_cost(self):
+        # never below a reached cost, and still infinity_cost for small caps
+        return max(self.max_cost, infinity_cost)
 
     def get_previous_link(self, node: Node):
         if node in self.lowest_cost:
@@ -133,13 +227,35 @@ class Network:
             return None
 
     def get_path(self, end_node: Node):
+        if self.edge_cost:
+            return self.get_edge_path(end_node)
         path = []
         if end_node in self.lowest_cost:
             curr = end_node
             while curr != self.start_location:
-                path.append(curr)
                 _, prev = self.lowest_cost[curr]
-                curr = self.get_other_node(prev, curr)
+                if prev is None:
+                    break
+                path.append(curr)
+                curr = self.network.get_other_node(prev, curr)
+            path.append(curr)
+        return [x for x in reversed(path)]
+
+    def get_owner(self, node: Node):
+        if node not in self.lowest_cost:
+            return None
+        return self.owner.get(node, self.start_location)
+
+    def get_edge_path(self, end_node: Node):
+        path = []
+        if end_node in self.lowest_cost:
+            curr = end_node
+            _, prev = self.lowest_cost[curr]
+            while prev is not None:
+                path.append(curr)
+                _, before = self.edge_cost[curr, prev]
+                curr = self.network.get_other_node(prev, curr)
+                prev = before
             path.append(curr)
         return [x for x in reversed(path)]
 
@@ -147,9 +263,438 @@ class Network:
         path = self.get_path(end_node)
         return [n.node_id for n in path]
 
+
+class Network:
+    def __init__(self):
+        self.version = 0  # bumped whenever link costs change
+        self.observers = None  # callables given the SearchStats of every run, None when instrumentation is off
+        self.tree = ShortestPathTree(self)  # result of the last run, kept for the get_* methods
+
+    # the attributes of earlier releases read and write the tree of the last run
+    @property
+    def start_location(self):
+        return self.tree.start_location
+
+    @start_location.setter
+    def start_location(self, value):
+        self.tree.start_location = value
+
+    @property
+    def lowest_cost(self):
+        return self.tree.lowest_cost
+
+    @lowest_cost.setter
+    def lowest_cost(self, value):
+        self.tree.lowest_cost = value
+
+    @property
+    def visited(self):
+        return self.tree.visited
+
+    @visited.setter
+    def visited(self, value):
+        self.tree.visited = value
+
+    @property
+    def edge_cost(self):
+        return self.tree.edge_cost
+
+    @edge_cost.setter
+    def edge_cost(self, value):
+        self.tree.edge_cost = value
+
+    def initialise_run(self):
+        self.tree = ShortestPathTree(self)
+
+    def enable_stats(self, *observers):
+        self.observers = list(observers)
+
+    def disable_stats(self):
+        self.observers = None
+
+    def start_stats(self, start_location: Node):
+        return None if self.observers is None else SearchStats(start_location)
+
+    def finish_stats(self, stats: SearchStats, tree, settled, loose_ends, begin):
+        stats.nodes_settled = settled
+        stats.finish(loose_ends, begin)
+        tree.stats = stats
+        for observer in self.observers:
+            observer(stats)
+
+    def hooks(self, stats: SearchStats):
+        # timing wrappers are only put in place while instrumentation is on
+        hooks = [self.get_links_attached, self.junction_cost, self.link_cost, self.get_other_node]
+        if stats is None:
+            return hooks
+        return [stats.timed(hook) for hook in hooks]
+
+    def run(self, start_location: Node, target: Node = None, heuristic=None,
+            targets=None, max_cost=infinity_cost, max_settled=None):
+        if heuristic and target is None:
+            raise ValueError("Heuristic needs a target node")
+        stats = self.start_stats(start_location)
+        begin = time.perf_counter()
+        get_links_attached, junction_cost, link_cost, get_other_node = self.hooks(stats)
+        if stats is not None and heuristic:
+            heuristic = stats.timed(heuristic, "heuristic")
+        tree = ShortestPathTree(self, start_location, max_cost)
+        lowest_cost, visited = tree.lowest_cost, tree.visited
+        lowest_cost[start_location] = 0, None
+        remaining = set(targets) if targets else None
+        #
+        order = itertools.count()
+        loose_ends = [(0, next(order), start_location)]
+        #
+        stopped = False
+        while len(loose_ends) > 0:
+            if stats is not None:
+                stats.heap_pops += 1
+                stats.max_frontier = max(stats.max_frontier, len(loose_ends))
+            _, _, current_node = heapq.heappop(loose_ends)
+            if current_node in visited:
+                continue
+            #
+            current_cost, prev_link = lowest_cost[current_node]
+            visited.add(current_node)
+            if remaining is not None:
+                remaining.discard(current_node)
+            if current_node == target or remaining is not None and not remaining or \
+                    max_settled is not None and len(visited) >= max_settled:
+                stopped = True
+                break
+            #
+            for link in get_links_attached(current_node):
+                if stats is not None:
+                    stats.edges_relaxed += 1
+                total_cost = current_cost + junction_cost(prev_link, current_node, link) + \
+                    link_cost(link, current_node)
+                #
+                other = get_other_node(link, current_node)
+                assert other != current_node
+                if other in lowest_cost:
+                    last_cost, _ = lowest_cost[other]
+                else:
+                    last_cost = max_cost
+                if total_cost < last_cost:
+                    lowest_cost[other] = total_cost, link
+                    if heuristic:
+                        heapq.heappush(loose_ends, (total_cost + heuristic(other, target), next(order), other))
+                    else:
+                        heapq.heappush(loose_ends, (total_cost, next(order), other))
+        if stopped:
+            # labels of unsettled frontier nodes are only tentative
+            tree.lowest_cost = {node: lowest_cost[node] for node in visited}
+        if stats is not None:
+            self.finish_stats(stats, tree, len(visited), loose_ends, begin)
+        self.tree = tree
+        return tree
+
+    def run_multi_source(self, sources, offsets=None, max_cost=infinity_cost):
+        # one search from every source at once, offsets are the costs already incurred at each source
+        stats = self.start_stats(None)
+        begin = time.perf_counter()
+        get_links_attached, junction_cost, link_cost, get_other_node = self.hooks(stats)
+        tree = ShortestPathTree(self, None, max_cost)
+        lowest_cost, visited, owner = tree.lowest_cost, tree.visited, tree.owner
+        order = itertools.count()
+        loose_ends = []
+        for source, offset in zip(sources, offsets if offsets is not None else itertools.repeat(0)):
+            if offset < lowest_cost.get(source, (max_cost, None))[0]:
+                lowest_cost[source] = offset, None
+                owner[source] = source
+                heapq.heappush(loose_ends, (offset, next(order), source))
+        #
+        while len(loose_ends) > 0:
+            if stats is not None:
+                stats.heap_pops += 1
+                stats.max_frontier = max(stats.max_frontier, len(loose_ends))
+            _, _, current_node = heapq.heappop(loose_ends)
+            if current_node in visited:
+                continue
+            #
+            current_cost, prev_link = lowest_cost[current_node]
+            visited.add(current_node)
+            #
+            for link in get_links_attached(current_node):
+                if stats is not None:
+                    stats.edges_relaxed += 1
+                total_cost = current_cost + junction_cost(prev_link, current_node, link) + \
+                    link_cost(link, current_node)
+                other = get_other_node(link, current_node)
+                if other in lowest_cost:
+                    last_cost, _ = lowest_cost[other]
+                else:
+                    last_cost = max_cost
+                if total_cost < last_cost:
+                    lowest_cost[other] = total_cost, link
+                    owner[other] = owner[current_node]
+                    heapq.heappush(loose_ends, (total_cost, next(order), other))
+        if stats is not None:
+            self.finish_stats(stats, tree, len(visited), loose_ends, begin)
+        self.tree = tree
+        return tree
+
+    def run_many(self, starts, workers=None, **options):
+        if workers == 1:
+            for start_location in starts:
+                yield start_location, self.run(start_location, **options)
+            return
+        # forked workers share the network pages copy-on-write, other start methods pickle it once per worker
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        with context.Pool(workers, initializer=_initialise_worker, initargs=(self,)) as pool:
+            for start_location, tree in pool.imap_unordered(_run_worker, [(start, options) for start in starts]):
+                tree.network = self
+                if self.observers and tree.stats is not None:
+                    for observer in self.observers:
+                        observer(tree.stats)
+                yield start_location, tree
+
+    def run_edge_based(self, start_location: Node, turn_restrictions: TurnRestrictions = None,
+                       target: Node = None, max_cost=infinity_cost):
+        stats = self.start_stats(start_location)
+        begin = time.perf_counter()
+        get_links_attached, junction_cost, link_cost, get_other_node = self.hooks(stats)
+        tree = ShortestPathTree(self, start_location, max_cost)
+        lowest_cost, visited, edge_cost = tree.lowest_cost, tree.visited, tree.edge_cost
+        edge_cost[start_location, None] = 0, None
+        banned = turn_restrictions.banned if turn_restrictions else set()
+        settled = set()
+        #
+        order = itertools.count()
+        loose_ends = [(0, next(order), start_location, None)]
+        #
+        while len(loose_ends) > 0:
+            if stats is not None:
+                stats.heap_pops += 1
+                stats.max_frontier = max(stats.max_frontier, len(loose_ends))
+            current_cost, _, current_node, prev_link = heapq.heappop(loose_ends)
+            if (current_node, prev_link) in settled:
+                continue
+            settled.add((current_node, prev_link))
+            if current_node not in visited:
+                visited.add(current_node)
+                lowest_cost[current_node] = current_cost, prev_link
+                if current_node == target:
+                    break
+            #
+            for link in get_links_attached(current_node):
+                if stats is not None:
+                    stats.edges_relaxed += 1
+                if prev_link is not None and (prev_link.link_id, link.link_id) in banned:
+                    continue
+                total_cost = current_cost + junction_cost(prev_link, current_node, link) + \
+                    link_cost(link, current_node)
+                #
+                other = get_other_node(link, current_node)
+                assert other != current_node
+                if (other, link) in edge_cost:
+                    last_cost, _ = edge_cost[other, link]
+                else:
+                    last_cost = max_cost
+                if total_cost < last_cost:
+                    edge_cost[other, link] = total_cost, prev_link
+                    heapq.heappush(loose_ends, (total_cost, next(order), other, link))
+        # settled counts (node, previous link) states, as those are what the heap holds
+        if stats is not None:
+            self.finish_stats(stats, tree, len(settled), loose_ends, begin)
+        self.tree = tree
+        return tree
+
+    def run_bidirectional(self, start_location: Node, end_location: Node, max_cost=infinity_cost):
+        stats = self.start_stats(start_location)
+        begin = time.perf_counter()
+        get_links_attached, junction_cost, link_cost, get_other_node = self.hooks(stats)
+        get_links_arriving = self.get_links_arriving if stats is None else stats.timed(self.get_links_arriving)
+        tree = ShortestPathTree(self, start_location, max_cost)
+        lowest_cost, visited = tree.lowest_cost, tree.visited
+        lowest_cost[start_location] = 0, None
+        backward_cost = {end_location: (0, None)}  # key = node, value = (cost to end, next_link)
+        backward_visited = set()
+        #
+        order = itertools.count()
+        forward_ends = [(0, next(order), start_location)]
+        backward_ends = [(0, next(order), end_location)]
+        best_cost, meeting_node = max_cost, None
+        if start_location == end_location:
+            best_cost, meeting_node = 0, start_location
+        #
+        while forward_ends and backward_ends:
+            if forward_ends[0][0] + backward_ends[0][0] >= best_cost:
+                break
+            if stats is not None:
+                stats.heap_pops += 1
+                stats.max_frontier = max(stats.max_frontier, len(forward_ends) + len(backward_ends))
+            if forward_ends[0][0] <= backward_ends[0][0]:
+                _, _, current_node = heapq.heappop(forward_ends)
+                if current_node in visited:
+                    continue
+                current_cost, prev_link = lowest_cost[current_node]
+                visited.add(current_node)
+                for link in get_links_attached(current_node):
+                    if stats is not None:
+                        stats.edges_relaxed += 1
+                    total_cost = current_cost + junction_cost(prev_link, current_node, link) + \
+                        link_cost(link, current_node)
+                    other = get_other_node(link, current_node)
+                    assert other != current_node
+                    if other in lowest_cost:
+                        last_cost, _ = lowest_cost[other]
+                    else:
+                        last_cost = max_cost
+                    if total_cost < last_cost:
+                        lowest_cost[other] = total_cost, link
+                        heapq.heappush(forward_ends, (total_cost, next(order), other))
+                        if other in backward_cost:
+                            meeting_cost = self.meeting_cost(other, lowest_cost[other], backward_cost[other])
+                            if meeting_cost < best_cost:
+                                best_cost, meeting_node = meeting_cost, other
+            else:
+                _, _, current_node = heapq.heappop(backward_ends)
+                if current_node in backward_visited:
+                    continue
+                current_cost, next_link = backward_cost[current_node]
+                backward_visited.add(current_node)
+                for link in get_links_arriving(current_node):
+                    if stats is not None:
+                        stats.edges_relaxed += 1
+                    other = get_other_node(link, current_node)
+                    assert other != current_node
+                    total_cost = current_cost + link_cost(link, other)
+                    if next_link:
+                        total_cost += junction_cost(link, current_node, next_link)
+                    if other in backward_cost:
+                        last_cost, _ = backward_cost[other]
+                    else:
+                        last_cost = max_cost
+                    if total_cost < last_cost:
+                        backward_cost[other] = total_cost, link
+                        heapq.heappush(backward_ends, (total_cost, next(order), other))
+                        if other in lowest_cost:
+                            meeting_cost = self.meeting_cost(other, lowest_cost[other], backward_cost[other])
+                            if meeting_cost < best_cost:
+                                best_cost, meeting_node = meeting_cost, other
+        #
+        if stats is not None:
+            self.finish_stats(stats, tree, len(visited) + len(backward_visited), forward_ends + backward_ends, begin)
+        self.tree = tree
+        route = [start_location]
+        if meeting_node is not None:
+            # continue the forward labels along the backward half of the route
+            current_node = meeting_node
+            current_cost, prev_link = lowest_cost[current_node]
+            while current_node != end_location:
+                _, next_link = backward_cost[current_node]
+                if prev_link:
+                    current_cost += self.junction_cost(prev_link, current_node, next_link)
+                current_cost += self.link_cost(next_link, current_node)
+                current_node = self.get_other_node(next_link, current_node)
+                lowest_cost[current_node] = current_cost, next_link
+                prev_link = next_link
+            route = tree.get_path(end_location)
+        # only the route's labels are final, the rest of both frontiers are tentative
+        tree.lowest_cost = {node: lowest_cost[node] for node in route}
+        tree.visited = set(route)
+        return tree
+
+    def spur_route(self, spur: Node, end_location: Node, prev_link, banned_links, banned_nodes, max_cost):
+        # Dijkstra from spur, entered over prev_link, to end_location avoiding the banned links and nodes
+        lowest_cost = {spur: (0, prev_link)}
+        visited = set()
+        order = itertools.count()
+        loose_ends = [(0, next(order), spur)]
+        while len(loose_ends) > 0:
+            _, _, current_node = heapq.heappop(loose_ends)
+            if current_node in visited:
+                continue
+            current_cost, prev_link = lowest_cost[current_node]
+            visited.add(current_node)
+            if current_node == end_location:
+                nodes, links = [current_node], []
+                while current_node != spur:
+                    link = lowest_cost[current_node][1]
+                    current_node = self.get_other_node(link, current_node)
+                    nodes.append(current_node)
+                    links.append(link)
+                return current_cost, nodes[::-1], links[::-1]
+            for link in self.get_links_attached(current_node):
+                if link in banned_links:
+                    continue
+                other = self.get_other_node(link, current_node)
+                if other in banned_nodes:
+                    continue
+                total_cost = current_cost + self.junction_cost(prev_link, current_node, link) + \
+                    self.link_cost(link, current_node)
+                if other in lowest_cost:
+                    last_cost, _ = lowest_cost[other]
+                else:
+                    last_cost = max_cost
+                if total_cost < last_cost:
+                    lowest_cost[other] = total_cost, link
+                    heapq.heappush(loose_ends, (total_cost, next(order), other))
+        return None
+
+    def k_shortest_paths(self, start_location: Node, end_location: Node, k, max_cost=infinity_cost):
+        # Yen's loopless paths, spurring each new path only from its deviation node onwards (Lawler)
+        first = self.spur_route(start_location, end_location, None, set(), set(), max_cost) if k >= 1 else None
+        if first is None:
+            return []
+        accepted = [(first[0], first[1], first[2], 0)]  # value = (cost, nodes, links, deviation index)
+        candidates = []  # value = (cost, count, nodes, links, deviation index)
+        seen = {tuple(first[2])}
+        count = 0
+        while len(accepted) < k:
+            _, nodes, links, deviation = accepted[-1]
+            root_cost, prev_link = 0, None
+            for d in range(len(links)):
+                if d >= deviation:
+                    root = links[:d]
+                    banned_links = {other[2][d] for other in accepted if len(other[2]) > d and other[2][:d] == root}
+                    spur = self.spur_route(nodes[d], end_location, prev_link, banned_links, set(nodes[:d]),
+                                          max_cost - root_cost)
+                    if spur is not None and tuple(root + spur[2]) not in seen:
+                        seen.add(tuple(root + spur[2]))
+                        count += 1
+                        heapq.heappush(candidates, (root_cost + spur[0], count, nodes[:d] + spur[1], root + spur[2], d))
+                root_cost += self.junction_cost(prev_link, nodes[d], links[d]) + self.link_cost(links[d], nodes[d])
+                prev_link = links[d]
+            if not candidates:
+                break
+            cost, _, nodes, links, d = heapq.heappop(candidates)
+            accepted.append((cost, nodes, links, d))
+        return [Route(cost, [node.node_id for node in nodes], links) for cost, nodes, links, _ in accepted]
+
+    def meeting_cost(self, node: Node, forward, backward):
+        forward_cost, prev_link = forward
+        backward_cost, next_link = backward
+        if prev_link and next_link:
+            if prev_link == next_link:
+                return infinity_cost
+            return forward_cost + self.junction_cost(prev_link, node, next_link) + backward_cost
+        return forward_cost + backward_cost
+
+    def get_cost(self, node: Node):
+        return self.tree.get_cost(node)
+
+    def get_previous_link(self, node: Node):
+        return self.tree.get_previous_link(node)
+
+    def get_path(self, end_node: Node):
+        return self.tree.get_path(end_node)
+
+    def get_path_ids(self, end_node: Node):
+        return self.tree.get_path_ids(end_node)
+
+    def get_owner(self, node: Node):
+        return self.tree.get_owner(node)
+
     def get_links_attached(self, node: Node):
         raise NotImplementedError
 
+    def get_links_arriving(self, node: Node):
+        raise NotImplementedError
+
     def get_other_node(self, link: Link, start_node: Node):
         raise NotImplementedError
 
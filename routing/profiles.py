@@ -0,0 +1,79 @@
+import bisect
+from array import array
+
+
+def interpolate(times, costs, period, time, lo, hi):
+    # times[lo:hi] are ascending breakpoints, wrapped around period when it is non zero
+    if period:
+        time %= period
+    j = bisect.bisect_right(times, time, lo, hi)
+    if j == lo or j == hi:
+        if not period or hi - lo == 1:
+            return costs[lo] if j == lo else costs[hi - 1]
+        # between the last breakpoint and the first one of the next period
+        time0, time1 = times[hi - 1], times[lo] + period
+        if j == lo:
+            time += period
+        cost0, cost1 = costs[hi - 1], costs[lo]
+    else:
+        time0, time1 = times[j - 1], times[j]
+        cost0, cost1 = costs[j - 1], costs[j]
+    return cost0 + (cost1 - cost0) * (time - time0) / (time1 - time0)
+
+
+class TravelTimeProfile:
+    def __init__(self, times, costs, period=0):
+        if not times or len(times) != len(costs):
+            raise ValueError("Profile needs one cost per breakpoint")
+        if any(t1 <= t0 for t0, t1 in zip(times, times[1:])):
+            raise ValueError("Profile breakpoints are not ascending")
+        if any(cost < 0 for cost in costs):
+            raise ValueError("Profile has a negative cost")
+        if period and (times[0] < 0 or times[-1] >= period):
+            raise ValueError("Profile breakpoints are outside the period")
+        self.times = array('d', times)
+        self.costs = array('d', costs)
+        self.period = period
+        # FIFO: leaving later never means arriving earlier
+        points = list(zip(self.times, self.costs))
+        if period and len(points) > 1:
+            points.append((self.times[0] + period, self.costs[0]))
+        for (t0, c0), (t1, c1) in zip(points, points[1:]):
+            if (c1 - c0) / (t1 - t0) < -1:
+                raise ValueError("Profile is not FIFO")
+
+    def key(self):
+        return tuple(self.times), tuple(self.costs), self.period
+
+    def evaluate(self, time):
+        return interpolate(self.times, self.costs, self.period, time, 0, len(self.times))
+
+    def __eq__(self, other):
+        return isinstance(other, TravelTimeProfile) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+
+class ProfileTable:
+    def __init__(self):
+        self.offsets = array('q', [0])  # index = profile index, breakpoints in times[offsets[k]:offsets[k + 1]]
+        self.times = array('d')
+        self.costs = array('d')
+        self.periods = array('d')
+        self.index = {}  # key = profile, value = profile index
+
+    def add(self, profile: TravelTimeProfile):
+        if profile not in self.index:
+            self.index[profile] = len(self.periods)
+            self.times.extend(profile.times)
+            self.costs.extend(profile.costs)
+            self.periods.append(profile.period)
+            self.offsets.append(len(self.times))
+        return self.index[profile]
+
+    def evaluate(self, k, time):
+        return interpolate(self.times, self.costs, self.periods[k], time, self.offsets[k], self.offsets[k + 1])
+
+    def __len__(self):
+        return len(self.periods)
@@ -0,0 +1,154 @@
+import heapq
+import math
+
+
+class KDTree:
+    leaf_size = 8
+
+    def __init__(self, points: list, items: list):
+        # points are equal length coordinate tuples, items are returned alongside them
+        self.dimensions = len(points[0]) if points else 0
+        order = list(range(len(points)))
+        self.build(points, order, 0, len(order), 0)
+        self.points = [points[i] for i in order]  # tree order, the median of each range splits it
+        self.items = [items[i] for i in order]
+
+    def build(self, points, order, lo, hi, depth):
+        # ranges are split at their median in place, so the tree needs no node objects
+        while hi - lo > self.leaf_size:
+            axis = depth % self.dimensions
+            order[lo:hi] = sorted(order[lo:hi], key=lambda i: points[i][axis])
+            mid = (lo + hi) // 2
+            self.build(points, order, lo, mid, depth + 1)
+            lo, depth = mid + 1, depth + 1
+
+    def distance2(self, point, j):
+        length2 = 0
+        for p1, p2 in zip(point, self.points[j]):
+            length2 += (p1 - p2)*(p1 - p2)
+        return length2
+
+    def nearest(self, point, k=1):
+        best = []  # max heap of (-squared distance, -position)
+
+        def visit(lo, hi, depth):
+            if hi - lo <= self.leaf_size:
+                for j in range(lo, hi):
+                    entry = (-self.distance2(point, j), -j)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry > best[0]:
+                        heapq.heapreplace(best, entry)
+                return
+            axis = depth % self.dimensions
+            mid = (lo + hi) // 2
+            diff = point[axis] - self.points[mid][axis]
+            near, far = ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+            visit(near[0], near[1], depth + 1)
+            entry = (-self.distance2(point, mid), -mid)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+            if len(best) < k or diff*diff <= -best[0][0]:
+                visit(far[0], far[1], depth + 1)
+
+        if k > 0 and self.points:
+            visit(0, len(self.points), 0)
+        return [(math.sqrt(-d2), self.items[-j]) for d2, j in sorted(best, reverse=True)]
+
+    def within(self, point, radius):
+        radius2 = radius * radius
+        found = []  # value = (squared distance, position)
+
+        def visit(lo, hi, depth):
+            if hi - lo <= self.leaf_size:
+                for j in range(lo, hi):
+                    d2 = self.distance2(point, j)
+                    if d2 <= radius2:
+                        found.append((d2, j))
+                return
+            axis = depth % self.dimensions
+            mid = (lo + hi) // 2
+            diff = point[axis] - self.points[mid][axis]
+            d2 = self.distance2(point, mid)
+            if d2 <= radius2:
+                found.append((d2, mid))
+            if diff < 0 or diff*diff <= radius2:
+                visit(lo, mid, depth + 1)
+            if diff >= 0 or diff*diff <= radius2:
+                visit(mid + 1, hi, depth + 1)
+
+        if self.points:
+            visit(0, len(self.points), 0)
+        return [(math.sqrt(d2), self.items[j]) for d2, j in sorted(found)]
+
+
+class SpatialIndex:
+    def __init__(self, nodes: dict, links: dict = None):
+        node_list = [node for node in nodes.values() if node.coords]
+        self.dimensions = len(node_list[0].coords) if node_list else 0
+        if any(len(node.coords) != self.dimensions for node in node_list):
+            raise TypeError("Coords do not share same types")
+        self.node_tree = KDTree([tuple(node.coords) for node in node_list], node_list)
+        # links are indexed by their midpoints, widened by the longest half length when searching
+        self.segments = []  # value = (link, start coords, end coords)
+        self.max_half_length = 0
+        midpoints = []
+        for link in (links or {}).values():
+            start, end = nodes[link.start_node_id].coords, nodes[link.end_node_id].coords
+            if not (start and end):
+                continue
+            self.segments.append((link, tuple(start), tuple(end)))
+            midpoints.append(tuple((p1 + p2) / 2 for p1, p2 in zip(start, end)))
+            half_length = math.sqrt(sum((p1 - p2)*(p1 - p2) for p1, p2 in zip(start, end))) / 2
+            self.max_half_length = max(self.max_half_length, half_length)
+        self.link_tree = KDTree(midpoints, list(range(len(self.segments))))
+
+    def check(self, coords):
+        # an index without coords has no dimensions to match, and finds nothing
+        if self.dimensions and len(coords) != self.dimensions:
+            raise TypeError("Coords do not share same types")
+        return tuple(coords)
+
+    def nearest(self, coords, k=1):
+        return self.node_tree.nearest(self.check(coords), k)
+
+    def within(self, coords, radius):
+        return self.node_tree.within(self.check(coords), radius)
+
+    def nearest_many(self, points, k=1):
+        return [self.nearest(coords, k) for coords in points]
+
+    @staticmethod
+    def project(point, start, end):
+        # closest point of the segment to point, and how far along the segment it lies
+        direction = [p2 - p1 for p1, p2 in zip(start, end)]
+        length2 = sum(p * p for p in direction)
+        fraction = 0.0
+        if length2 > 0:
+            fraction = sum((p - p1) * d for p, p1, d in zip(point, start, direction)) / length2
+            fraction = min(max(fraction, 0.0), 1.0)
+        snapped = tuple(p1 + fraction * d for p1, d in zip(start, direction))
+        distance = math.sqrt(sum((p1 - p2)*(p1 - p2) for p1, p2 in zip(point, snapped)))
+        return distance, snapped, fraction
+
+    def snap(self, coords):
+        # value = (distance, link, snapped coords, fraction along the link from its start node), or None
+        point = self.check(coords)
+        closest = self.link_tree.nearest(point)
+        if not closest:
+            return None
+        _, start, end = self.segments[closest[0][1]]
+        distance, snapped, fraction = self.project(point, start, end)
+        best = (distance, closest[0][1], snapped, fraction)
+        # any closer segment has its midpoint within the longest half length of the best distance so far
+        for _, s in self.link_tree.within(point, distance + self.max_half_length):
+            _, start, end = self.segments[s]
+            distance, snapped, fraction = self.project(point, start, end)
+            if (distance, s) < best[:2]:
+                best = (distance, s, snapped, fraction)
+        return best[0], self.segments[best[1]][0], best[2], best[3]
+
+    def snap_many(self, points):
+        return [self.snap(coords) for coords in points]
@@ -0,0 +1,155 @@
+from array import array
+from collections.abc import Mapping, Sequence
+
+from .network import Link, Node
+
+
+class TableSequence(Sequence):
+    def __init__(self, view, length):
+        self.view = view
+        self.length = length
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.view(j) for j in range(*i.indices(self.length))]
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError("Table index out of range")
+        return self.view(i)
+
+    def __len__(self):
+        return self.length
+
+
+class MetadataColumn:
+    def __init__(self):
+        self.values = []  # interned metadata dictionaries
+        self.lookup = {}  # key = frozen metadata items, value = index into values
+        self.index = array('q')  # index = row, value = index into values or -1
+
+    def append(self, metadata: dict):
+        if metadata is None:
+            self.index.append(-1)
+            return
+        try:
+            key = frozenset(metadata.items()) if isinstance(metadata, dict) else None
+        except TypeError:
+            key = None
+        if key is None or key not in self.lookup:
+            self.values.append(metadata)
+            if key is not None:
+                self.lookup[key] = len(self.values) - 1
+            self.index.append(len(self.values) - 1)
+        else:
+            self.index.append(self.lookup[key])
+
+    def __getitem__(self, row):
+        i = self.index[row]
+        return None if i == -1 else self.values[i]
+
+
+class NodeTable(Mapping):
+    def __init__(self, dimensions=2):
+        self.dimensions = dimensions
+        self.node_ids = []
+        self.node_index = {}  # key = node_id, value = row
+        self.coords = array('d')  # dimensions values per row, zeros when the node has no coords
+        self.has_coords = bytearray()
+        self.metadata = MetadataColumn()
+
+    @classmethod
+    def from_nodes(cls, nodes, dimensions=2):
+        table = cls(dimensions)
+        for node in nodes:
+            table.append(node.node_id, node.coords, node.metadata)
+        return table
+
+    def append(self, node_id, coords=None, metadata: dict = None):
+        if coords and not (isinstance(coords, tuple) or isinstance(coords, list)):
+            raise TypeError("Coords not a recognised form")
+        if coords and len(coords) != self.dimensions:
+            raise TypeError("Coords do not match table dimensions")
+        if metadata and not isinstance(metadata, dict):
+            raise TypeError("Metadata is not a dictionary")
+        if node_id in self.node_index:
+            raise ValueError("Node {0} is already in the table".format(node_id))
+        self.node_index[node_id] = len(self.node_ids)
+        self.node_ids.append(node_id)
+        if coords:
+            self.coords.extend(coords)
+            self.has_coords.append(1)
+        else:
+            self.coords.extend([0.0] * self.dimensions)
+            self.has_coords.append(0)
+        self.metadata.append(metadata)
+
+    def node(self, i):
+        coords = None
+        if self.has_coords[i]:
+            coords = tuple(self.coords[i * self.dimensions:(i + 1) * self.dimensions])
+        return Node(self.node_ids[i], coords, self.metadata[i])
+
+    def sequence(self):
+        return TableSequence(self.node, len(self.node_ids))
+
+    def __getitem__(self, node_id):
+        return self.node(self.node_index[node_id])
+
+    def __contains__(self, node_id):
+        return node_id in self.node_index
+
+    def __iter__(self):
+        return iter(self.node_ids)
+
+    def __len__(self):
+        return len(self.node_ids)
+
+
+class LinkTable(Mapping):
+    def __init__(self, nodes: NodeTable):
+        self.nodes = nodes
+        self.link_ids = []
+        self.link_index = {}  # key = link_id, value = row
+        self.start_nodes = array('q')  # index = row, value = node table row
+        self.end_nodes = array('q')
+        self.metadata = MetadataColumn()
+
+    @classmethod
+    def from_links(cls, nodes: NodeTable, links):
+        table = cls(nodes)
+        for link in links:
+            table.append(link.link_id, link.start_node_id, link.end_node_id, link.metadata)
+        return table
+
+    def append(self, link_id, start_node_id, end_node_id, metadata: dict = None):
+        if metadata and not isinstance(metadata, dict):
+            raise TypeError("Metadata is not a dictionary")
+        if start_node_id not in self.nodes.node_index or end_node_id not in self.nodes.node_index:
+            raise ValueError("Link {0} is not connected to known nodes".format(link_id))
+        if link_id in self.link_index:
+            raise ValueError("Link {0} is already in the table".format(link_id))
+        self.link_index[link_id] = len(self.link_ids)
+        self.link_ids.append(link_id)
+        self.start_nodes.append(self.nodes.node_index[start_node_id])
+        self.end_nodes.append(self.nodes.node_index[end_node_id])
+        self.metadata.append(metadata)
+
+    def link(self, j):
+        node_ids = self.nodes.node_ids
+        return Link(self.link_ids[j], node_ids[self.start_nodes[j]], node_ids[self.end_nodes[j]], self.metadata[j])
+
+    def sequence(self):
+        return TableSequence(self.link, len(self.link_ids))
+
+    def __getitem__(self, link_id):
+        return self.link(self.link_index[link_id])
+
+    def __contains__(self, link_id):
+        return link_id in self.link_index
+
+    def __iter__(self):
+        return iter(self.link_ids)
+
+    def __len__(self):
+        return len(self.link_ids)
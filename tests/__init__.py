@@ -2,3 +2,14 @@ from .distance_tests import DistanceTests
 from .link_tests import LinkTests
 from .node_tests import NodeTests
 from .network_tests import NetworkTests, ExampleNetworkTests
+from .tables_tests import TableTests
+from .compiled_tests import CompiledNetworkTests
+from .mapped_tests import MappedNetworkTests
+from .ingest_tests import IngestTests
+from .dynamic_tests import DynamicCostTests
+from .cache_tests import TreeCacheTests
+from .profiles_tests import TravelTimeProfileTests
+from .landmarks_tests import LandmarkTests
+from .spatial_tests import SpatialIndexTests
+from .kernels_tests import KernelTests
+from .hierarchy_tests import ContractionHierarchyTests
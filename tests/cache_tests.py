@@ -0,0 +1,69 @@
+import random
+import unittest
+
+import routing
+
+
+class TreeCacheTests(unittest.TestCase):
+
+    @staticmethod
+    def random_network():
+        rand = random.Random(8)
+        nodes = {i: routing.Node(i, (rand.random(), rand.random())) for i in range(60)}
+        links = {j: routing.Link(j, rand.randrange(60), rand.randrange(60)) for j in range(200)}
+        return routing.CompiledNetwork(nodes, links)
+
+    def test_Cache_Hits_and_misses_counted(self):
+        network = TreeCacheTests.random_network()
+        cache = routing.TreeCache(network)
+        first = cache.run(network.node_list[0])
+        self.assertIs(cache.run(network.node_list[0]), first, "Cached tree not returned")
+        self.assertIs(network.tree, first, "Network tree not set on a hit")
+        cache.run(network.node_list[1])
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 2, 0), "Wrong statistics")
+        self.assertEqual(stats["entries"], 2, "Wrong entry count")
+        self.assertEqual(stats["bytes"], 2 * first.nbytes(), "Wrong byte count")
+
+    def test_Cache_Least_recently_used_evicted_When_entry_limit_reached(self):
+        network = TreeCacheTests.random_network()
+        cache = routing.TreeCache(network, max_entries=2)
+        cache.run(network.node_list[0])
+        cache.run(network.node_list[1])
+        cache.run(network.node_list[0])
+        cache.run(network.node_list[2])
+        self.assertEqual(cache.stats()["evictions"], 1, "Wrong eviction count")
+        self.assertListEqual([key[0] for key in cache.entries], [0, 2], "Wrong entry evicted")
+
+    def test_Cache_Evicts_When_byte_limit_reached(self):
+        network = TreeCacheTests.random_network()
+        size = network.run(network.node_list[0]).nbytes()
+        cache = routing.TreeCache(network, max_bytes=2 * size)
+        for i in range(5):
+            cache.run(network.node_list[i])
+        self.assertEqual(len(cache), 2, "Byte limit not applied")
+        self.assertLessEqual(cache.stats()["bytes"], 2 * size, "Byte limit exceeded")
+        self.assertEqual(routing.TreeCache(network, max_bytes=size - 1).run(network.node_list[0]).get_cost(
+            network.node_list[0]), 0, "Oversized tree not returned")
+
+    def test_Cache_Misses_When_version_changes(self):
+        network = TreeCacheTests.random_network()
+        cache = routing.TreeCache(network)
+        first = cache.run(network.node_list[0])
+        network.update_link_costs({0: 0.5, 1: 0.5})
+        second = cache.run(network.node_list[0])
+        self.assertIsNot(second, first, "Stale tree returned")
+        self.assertEqual(cache.stats()["evictions"], 1, "Stale tree not evicted")
+        self.assertEqual(len(cache), 1, "Stale tree kept")
+
+    def test_Cache_Repair_keeps_trees(self):
+        network = TreeCacheTests.random_network()
+        cache = routing.TreeCache(network)
+        trees = [cache.run(network.node_list[i]) for i in range(3)]
+        cache.repair(network.update_link_costs({0: 0.5, 1: 5.0, 2: 0.0}))
+        for i, tree in enumerate(trees):
+            self.assertIs(cache.run(network.node_list[i]), tree, "Repaired tree not kept")
+            expected = network.run(network.node_list[i])
+            for node in network.node_list:
+                self.assertAlmostEqual(tree.get_cost(node), expected.get_cost(node), msg="Repaired cost differs")
+        self.assertEqual(cache.stats()["hits"], 3, "Repaired trees not hit")
@@ -0,0 +1,364 @@
+import importlib.util
+import math
+import random
+import unittest
+
+import routing
+from .network_tests import NetworkTests
+
+
+class CompiledNetworkTests(unittest.TestCase):
+
+    class FlatNetwork(routing.CompiledNetwork):
+        def link_cost(self, link: routing.Link, start_node: routing.Node):
+            return 10
+
+    def test_Compiled_network_Values_correct_Network_cycle(self):
+        nodes = {1: routing.Node(1, (0, 0)), 2: routing.Node(2, (1, 0)), 3: routing.Node(3, (3, 4))}
+        links = {1: routing.Link(1, 1, 2), 2: routing.Link(2, 2, 3), 3: routing.Link(3, 1, 3)}
+        network = routing.CompiledNetwork(nodes, links)
+        network.run(nodes[1])
+        #
+        self.assertEqual(network.get_cost(nodes[1]), 0, "Cost to start is not zero")
+        self.assertIsNone(network.get_previous_link(nodes[1]), "Node has a previous link")
+        self.assertListEqual(network.get_path_ids(nodes[1]), [1], "Wrong shortest path")
+        #
+        self.assertEqual(network.get_cost(nodes[2]), 1, "Cost to 2 is not 1")
+        self.assertEqual(network.get_previous_link(nodes[2]), links[1], "Node has incorrect route")
+        self.assertListEqual(network.get_path_ids(nodes[2]), [1, 2], "Wrong shortest path")
+        #
+        self.assertEqual(network.get_cost(nodes[3]), 5, "Cost to 3 is not 5")
+        self.assertEqual(network.get_previous_link(nodes[3]), links[3], "Node has incorrect route")
+        self.assertListEqual(network.get_path(nodes[3]), [nodes[1], nodes[3]], "Wrong shortest path")
+
+    def test_Compiled_network_Values_correct_Network_unconnected_point(self):
+        nodes = {1: routing.Node(1, (0,)), 2: routing.Node(2, (1,)), 3: routing.Node(3, (9,))}
+        links = {1: routing.Link(1, 1, 2)}
+        network = routing.CompiledNetwork(nodes, links)
+        network.run(nodes[1])
+        self.assertEqual(network.get_cost(nodes[3]), routing.infinity_cost, "Node is connected to network")
+        self.assertIsNone(network.get_previous_link(nodes[3]), "Node has a previous link")
+        self.assertListEqual(network.get_path_ids(nodes[3]), [], "Wrong shortest path")
+
+    def test_Compiled_network_Values_correct_Directed_links(self):
+        nodes = {1: routing.Node(1), 2: routing.Node(2), 3: routing.Node(3)}
+        links = {1: routing.Link(1, 1, 2), 2: routing.Link(2, 3, 2)}
+        network = CompiledNetworkTests.FlatNetwork(nodes, links, directed=True)
+        network.run(nodes[1])
+        self.assertEqual(network.get_cost(nodes[2]), 10, "Cost to 2 is not 10")
+        self.assertEqual(network.get_cost(nodes[3]), routing.infinity_cost, "Link followed against direction")
+        network.run(nodes[3])
+        self.assertListEqual(network.get_path_ids(nodes[2]), [3, 2], "Wrong shortest path")
+        self.assertEqual(network.get_cost(nodes[1]), routing.infinity_cost, "Link followed against direction")
+
+    def test_Compiled_network_Values_match_Simple_network(self):
+        nodes, links = {}, {}
+        for y in range(8):
+            for x in range(8):
+                nodes[y * 8 + x] = routing.Node(y * 8 + x, (x + 0.1 * y * y, y + 0.2 * x))
+                if x > 0:
+                    links[len(links)] = routing.Link(len(links), y * 8 + x - 1, y * 8 + x)
+                if y > 0:
+                    links[len(links)] = routing.Link(len(links), (y - 1) * 8 + x, y * 8 + x)
+        compiled = routing.CompiledNetwork(nodes, links)
+        simple = NetworkTests.SimpleNetwork(nodes, links)
+        compiled.run(nodes[27])
+        simple.run(nodes[27])
+        for node in nodes.values():
+            self.assertAlmostEqual(compiled.get_cost(node), simple.get_cost(node), msg="Costs differ")
+            self.assertListEqual(compiled.get_path_ids(node), simple.get_path_ids(node), "Paths differ")
+
+    def test_Compiled_network_Astar_matches_Dijkstra_When_distance_heuristic_used(self):
+        nodes, links = {}, {}
+        for y in range(10):
+            for x in range(10):
+                nodes[y * 10 + x] = routing.Node(y * 10 + x, (x, y))
+                if x > 0:
+                    links[len(links)] = routing.Link(len(links), y * 10 + x - 1, y * 10 + x)
+                if y > 0:
+                    links[len(links)] = routing.Link(len(links), (y - 1) * 10 + x, y * 10 + x)
+        network = routing.CompiledNetwork(nodes, links)
+        network.run(nodes[0])
+        full_cost = network.get_cost(nodes[99])
+        network.run(nodes[0], target=nodes[99], heuristic=routing.manhattan_distance)
+        self.assertEqual(network.get_cost(nodes[99]), full_cost, "A* cost differs from Dijkstra")
+        self.assertEqual(len(network.get_path_ids(nodes[99])), 19, "Wrong shortest path length")
+        self.assertEqual(network.get_path_ids(nodes[99])[-1], 99, "Path does not end at target")
+
+    def test_Compiled_network_Bounded_search_When_max_cost_and_targets_used(self):
+        nodes = {i: routing.Node(i, (i,)) for i in range(1, 7)}
+        links = {i: routing.Link(i, i, i + 1) for i in range(1, 6)}
+        network = routing.CompiledNetwork(nodes, links)
+        network.run(nodes[3], max_cost=2)
+        self.assertEqual(network.get_cost(nodes[4]), 1, "Cost to 4 is not 1")
+        self.assertEqual(network.get_cost(nodes[6]), routing.infinity_cost, "Node beyond max cost reached")
+        self.assertListEqual(network.get_path_ids(nodes[6]), [], "Wrong shortest path")
+        network.run(nodes[1], targets=[nodes[2]])
+        self.assertEqual(network.get_cost(nodes[2]), 1, "Cost to 2 is not 1")
+        self.assertEqual(network.get_cost(nodes[4]), routing.infinity_cost, "Search continued past targets")
+        network.run(nodes[1], max_settled=2)
+        self.assertEqual(network.get_cost(nodes[4]), routing.infinity_cost, "Search continued past settle limit")
+
+    def test_Compiled_network_Unreached_cost_not_below_reached_When_max_cost_raised(self):
+        nodes = {1: routing.Node(1, (0,)), 2: routing.Node(2, (1500,)), 3: routing.Node(3, (9,))}
+        links = {1: routing.Link(1, 1, 2)}
+        network = routing.CompiledNetwork(nodes, links)
+        tree = network.run(nodes[1], max_cost=math.inf)
+        self.assertEqual(tree.get_cost(nodes[2]), 1500, "Cost to 2 is not 1500")
+        self.assertEqual(tree.get_cost(nodes[3]), math.inf, "Unreached node looks cheaper than a reached one")
+        self.assertEqual(network.run(nodes[1]).get_cost(nodes[3]), routing.infinity_cost, "Default unreached cost changed")
+
+    def test_Compiled_network_Drops_frontier_labels_When_stopped_early(self):
+        nodes = {1: routing.Node(1, (0, 0)), 2: routing.Node(2, (1, 0)), 3: routing.Node(3, (1, 1)),
+                 4: routing.Node(4, (2, 0)), 5: routing.Node(5, (9, 0))}
+        links = {1: routing.Link(1, 1, 2), 2: routing.Link(2, 2, 3), 3: routing.Link(3, 1, 5), 4: routing.Link(4, 5, 4)}
+        network = routing.CompiledNetwork(nodes, links)
+        network.run(nodes[1], target=nodes[2])
+        self.assertEqual(network.get_cost(nodes[5]), routing.infinity_cost, "Tentative label kept")
+        self.assertListEqual(network.get_path_ids(nodes[5]), [], "Wrong shortest path")
+        network.run(nodes[1], max_settled=3)
+        self.assertEqual(network.get_cost(nodes[3]), 2, "Cost to 3 is not 2")
+        self.assertEqual(network.get_cost(nodes[5]), routing.infinity_cost, "Tentative label kept")
+
+    def test_Compiled_network_Bidirectional_matches_Dijkstra_Network_grid(self):
+        rnd = random.Random(1)
+        nodes, links = {}, {}
+        for y in range(8):
+            for x in range(8):
+                nodes[y * 8 + x] = routing.Node(y * 8 + x, (x + 0.3 * rnd.random(), y + 0.3 * rnd.random()))
+                if x > 0:
+                    links[len(links)] = routing.Link(len(links), y * 8 + x - 1, y * 8 + x)
+                if y > 0:
+                    links[len(links)] = routing.Link(len(links), (y - 1) * 8 + x, y * 8 + x)
+        network = routing.CompiledNetwork(nodes, links, directed=True)
+        for end in [63, 7, 56, 9, 0]:
+            full = network.run(nodes[9])
+            cost, path = network.get_cost(nodes[end]), network.get_path_ids(nodes[end])
+            tree = network.run_bidirectional(nodes[9], nodes[end])
+            self.assertAlmostEqual(tree.get_cost(nodes[end]), cost, msg="Bidirectional cost differs from Dijkstra")
+            self.assertAlmostEqual(network.get_cost(nodes[end]), cost, msg="Bidirectional cost differs from Dijkstra")
+            self.assertListEqual(network.get_path_ids(nodes[end]), path, "Wrong shortest path")
+            for node_id, node in nodes.items():
+                expected = full.get_cost(node) if node_id in path + [9] else routing.infinity_cost
+                self.assertAlmostEqual(tree.get_cost(node), expected, msg="Tentative label kept off the route")
+
+    def test_Compiled_network_Edge_based_finds_route_When_first_arrival_has_banned_turn(self):
+        nodes = {1: routing.Node(1, (0, 0)), 2: routing.Node(2, (2, 0)), 3: routing.Node(3, (1, 1)),
+                 4: routing.Node(4, (3, 0))}
+        links = {1: routing.Link(1, 1, 2), 2: routing.Link(2, 1, 3), 3: routing.Link(3, 3, 2), 4: routing.Link(4, 2, 4)}
+        network = routing.CompiledNetwork(nodes, links)
+        network.run(nodes[1])
+        self.assertListEqual(network.get_path_ids(nodes[4]), [1, 2, 4], "Wrong shortest path")
+        network.run_edge_based(nodes[1], routing.TurnRestrictions([(1, 4)]))
+        self.assertAlmostEqual(network.get_cost(nodes[4]), 2 * 2 ** 0.5 + 1, msg="Cost to target is not correct")
+        self.assertEqual(network.get_previous_link(nodes[4]), links[4], "Node has wrong previous link")
+        self.assertListEqual(network.get_path_ids(nodes[4]), [1, 3, 2, 4], "Wrong shortest path")
+        self.assertListEqual(network.get_path_ids(nodes[2]), [1, 2], "Wrong shortest path")
+
+    def test_Compiled_network_Junction_costs_match_Simple_network(self):
+        rand = random.Random(5)
+        nodes, links = {}, {}
+        for y in range(5):
+            for x in range(5):
+                nodes[y * 5 + x] = routing.Node(y * 5 + x, (x + 0.3 * rand.random(), y + 0.3 * rand.random()))
+                if x > 0:
+                    links[len(links)] = routing.Link(len(links), y * 5 + x - 1, y * 5 + x)
+                if y > 0:
+                    links[len(links)] = routing.Link(len(links), (y - 1) * 5 + x, y * 5 + x)
+
+        def junction_cost(link_prev, middle_node, link_next):
+            return 100 if link_prev and middle_node.node_id in (7, 12) else 0
+
+        class CompiledTurnNetwork(routing.CompiledNetwork):
+            def junction_cost(self, link_prev, middle_node, link_next):
+                return junction_cost(link_prev, middle_node, link_next)
+
+        class SimpleTurnNetwork(NetworkTests.SimpleNetwork):
+            def junction_cost(self, link_prev, middle_node, link_next):
+                return junction_cost(link_prev, middle_node, link_next)
+
+        compiled = CompiledTurnNetwork(nodes, links)
+        simple = SimpleTurnNetwork(nodes, links)
+        for run in ["run", "run_edge_based"]:
+            getattr(compiled, run)(nodes[2])
+            getattr(simple, run)(nodes[2])
+            for node in nodes.values():
+                self.assertAlmostEqual(compiled.get_cost(node), simple.get_cost(node), msg="Costs differ")
+                self.assertListEqual(compiled.get_path_ids(node), simple.get_path_ids(node), "Paths differ")
+        for end in [22, 12, 7, 0]:
+            compiled.run_bidirectional(nodes[2], nodes[end])
+            simple.run_bidirectional(nodes[2], nodes[end])
+            self.assertAlmostEqual(compiled.get_cost(nodes[end]), simple.get_cost(nodes[end]), msg="Costs differ")
+        routes = compiled.k_shortest_paths(nodes[2], nodes[22], 4)
+        expected = simple.k_shortest_paths(nodes[2], nodes[22], 4)
+        self.assertListEqual([route.node_ids for route in routes], [route.node_ids for route in expected],
+                             "Routes differ")
+        self.assertAlmostEqual(routes[0].cost, compiled.run(nodes[2]).get_cost(nodes[22]), msg="Costs differ")
+
+    def test_Compiled_network_Bidirectional_rejects_U_turn_meeting_When_junction_costs_used(self):
+        nodes = {1: routing.Node(1, (0, 0)), 2: routing.Node(2, (1, 0)), 3: routing.Node(3, (2, 0)),
+                 4: routing.Node(4, (1, 1))}
+        links = {1: routing.Link(1, 1, 2), 2: routing.Link(2, 2, 3), 3: routing.Link(3, 2, 4)}
+
+        def junction_cost(link_prev, middle_node, link_next):
+            return 100 if link_prev and {link_prev.link_id, link_next.link_id} == {1, 2} else 0
+
+        class CompiledTurnNetwork(routing.CompiledNetwork):
+            def junction_cost(self, link_prev, middle_node, link_next):
+                return junction_cost(link_prev, middle_node, link_next)
+
+        class SimpleTurnNetwork(NetworkTests.SimpleNetwork):
+            def junction_cost(self, link_prev, middle_node, link_next):
+                return junction_cost(link_prev, middle_node, link_next)
+
+        compiled = CompiledTurnNetwork(nodes, links)
+        simple = SimpleTurnNetwork(nodes, links)
+        for start, end in [(1, 3), (3, 1)]:
+            tree = compiled.run_bidirectional(nodes[start], nodes[end])
+            expected = simple.run_bidirectional(nodes[start], nodes[end])
+            self.assertEqual(tree.get_cost(nodes[end]), 102, "U-turn accepted as a meeting")
+            self.assertEqual(tree.get_cost(nodes[end]), expected.get_cost(nodes[end]), "Costs differ")
+            self.assertListEqual(tree.get_path_ids(nodes[end]), [start, 2, end], "Wrong shortest path")
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+    def test_Compiled_network_Cost_matrix_Values_correct(self):
+        nodes = {1: routing.Node(1, (0,)), 2: routing.Node(2, (1,)), 3: routing.Node(3, (3,)), 4: routing.Node(4, (9,))}
+        links = {1: routing.Link(1, 1, 2), 2: routing.Link(2, 2, 3)}
+        network = routing.CompiledNetwork(nodes, links)
+        matrix = network.cost_matrix([nodes[1], nodes[3]], [nodes[1], nodes[2], nodes[3], nodes[4]])
+        self.assertListEqual(matrix.tolist(), [[0, 1, 3, routing.infinity_cost], [3, 2, 0, routing.infinity_cost]],
+                             "Wrong cost matrix")
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+    def test_Compiled_network_Cost_matrix_Unreached_filled_with_max_cost(self):
+        nodes = {1: routing.Node(1, (0,)), 2: routing.Node(2, (1500,)), 3: routing.Node(3, (9,))}
+        links = {1: routing.Link(1, 1, 2)}
+        network = routing.CompiledNetwork(nodes, links)
+        matrix = network.cost_matrix([nodes[1]], [nodes[2], nodes[3]], max_cost=math.inf)
+        self.assertListEqual(matrix.tolist(), [[1500, math.inf]], "Unreached pair cheaper than a reached one")
+        hierarchy = routing.ContractionHierarchy.build(network)
+        self.assertListEqual(hierarchy.cost_matrix([nodes[1]], [nodes[2], nodes[3]], max_cost=math.inf).tolist(),
+                             [[1500, math.inf]], "Hierarchy matrix differs")
+
+    def test_Compiled_network_Run_many_matches_run_When_workers_used(self):
+        nodes = {i: routing.Node(i, (i, i % 3)) for i in range(1, 7)}
+        links = {i: routing.Link(i, i, i + 1) for i in range(1, 6)}
+        network = routing.CompiledNetwork(nodes, links)
+        results = dict(network.run_many([nodes[1], nodes[4]], workers=2, max_cost=5))
+        for start in [nodes[1], nodes[4]]:
+            tree = network.run(start, max_cost=5)
+            self.assertEqual(results[start].cost, tree.cost, "Run many costs differ from run")
+            self.assertEqual(results[start].previous, tree.previous, "Run many links differ from run")
+            for node in nodes.values():
+                self.assertListEqual(results[start].get_path_ids(node), tree.get_path_ids(node), "Wrong shortest path")
+
+    def test_Compiled_network_Run_many_matches_run_When_scaled_heuristic_used(self):
+        nodes = {i: routing.Node(i, (i, i % 3)) for i in range(1, 7)}
+        links = {i: routing.Link(i, i, i + 1) for i in range(1, 6)}
+        network = routing.CompiledNetwork(nodes, links)
+        heuristic = routing.scaled(routing.distance, 0.5)
+        results = dict(network.run_many([nodes[1], nodes[4]], workers=2, target=nodes[6], heuristic=heuristic))
+        for start in [nodes[1], nodes[4]]:
+            tree = network.run(start, target=nodes[6], heuristic=heuristic)
+            self.assertEqual(results[start].get_cost(nodes[6]), tree.get_cost(nodes[6]), "Run many costs differ from run")
+            self.assertListEqual(results[start].get_path_ids(nodes[6]), tree.get_path_ids(nodes[6]), "Wrong shortest path")
+
+    def test_Compiled_network_Throws_value_error_When_link_to_unknown_node(self):
+        with self.assertRaises(ValueError):
+            routing.CompiledNetwork({1: routing.Node(1)}, {1: routing.Link(1, 1, 2)})
+
+    @staticmethod
+    def simple_path_costs(network, source, sink):
+        costs = []
+        stack = [(source, 0, {source})]
+        while stack:
+            current, cost, visited = stack.pop()
+            if current == sink:
+                costs.append(cost)
+                continue
+            for arc in range(network.offsets[current], network.offsets[current + 1]):
+                other = network.targets[arc]
+                if other not in visited:
+                    stack.append((other, cost + network.arc_costs[arc], visited | {other}))
+        return sorted(costs)
+
+    def test_Compiled_network_K_shortest_paths_match_enumeration(self):
+        rand = random.Random(12)
+        for directed in (False, True):
+            nodes = {i: routing.Node(i, (rand.random(), rand.random())) for i in range(12)}
+            links = {j: routing.Link(j, rand.randrange(12), rand.randrange(12)) for j in range(24)}
+            network = routing.CompiledNetwork(nodes, links, directed=directed)
+            expected = CompiledNetworkTests.simple_path_costs(network, 0, 5)
+            routes = network.k_shortest_paths(nodes[0], nodes[5], 8)
+            self.assertEqual(len(routes), min(8, len(expected)), "Wrong number of routes")
+            for route, cost in zip(routes, expected):
+                self.assertAlmostEqual(route.cost, cost, msg="Route cost is not the next shortest")
+                self.assertEqual(route.node_ids[0], 0, "Route does not start at the source")
+                self.assertEqual(route.node_ids[-1], 5, "Route does not end at the sink")
+                self.assertEqual(len(set(route.node_ids)), len(route.node_ids), "Route has a loop")
+                self.assertAlmostEqual(sum(network.link_cost(link, nodes[start])
+                                           for link, start in zip(route.links, route.node_ids)), route.cost,
+                                       msg="Route links do not add up to its cost")
+
+    def test_Compiled_network_K_shortest_paths_Values_correct_Parallel_links(self):
+        nodes = {1: routing.Node(1), 2: routing.Node(2), 3: routing.Node(3)}
+        links = {1: routing.Link(1, 1, 2), 2: routing.Link(2, 1, 2), 3: routing.Link(3, 2, 3)}
+        routes = CompiledNetworkTests.FlatNetwork(nodes, links).k_shortest_paths(nodes[1], nodes[3], 3)
+        self.assertListEqual([route.cost for route in routes], [20, 20], "Wrong route costs")
+        self.assertListEqual(sorted(route.links[0].link_id for route in routes), [1, 2], "Parallel link not used")
+        self.assertListEqual(CompiledNetworkTests.FlatNetwork(nodes, links).k_shortest_paths(nodes[3], nodes[1], 2,
+                             max_cost=15), [], "Route found above max cost")
+
+    def test_Compiled_network_Multi_source_matches_best_single_runs(self):
+        rand = random.Random(3)
+        nodes = {i: routing.Node(i, (rand.random(), rand.random())) for i in range(80)}
+        links = {j: routing.Link(j, rand.randrange(80), rand.randrange(80)) for j in range(200)}
+        network = routing.CompiledNetwork(nodes, links, directed=True)
+        sources, offsets = [nodes[1], nodes[40], nodes[41], nodes[40]], [0.3, 0, 0.1, 0.5]
+        singles = [network.run(source) for source in sources]
+        tree = network.run_multi_source(sources, offsets)
+        for node in nodes.values():
+            best = min(offset + single.get_cost(node) for offset, single in zip(offsets, singles))
+            if best >= routing.infinity_cost:
+                self.assertIsNone(tree.get_owner(node), "Unreached node has an owner")
+                self.assertListEqual(tree.get_path(node), [], "Unreached node has a path")
+                continue
+            self.assertAlmostEqual(tree.get_cost(node), best, msg="Multi-source cost is not the best source")
+            owner = tree.get_owner(node)
+            self.assertEqual(tree.get_path(node)[0], owner, "Path does not start at the owning source")
+            k = sources.index(owner)
+            self.assertAlmostEqual(offsets[k] + singles[k].get_cost(node), best, msg="Owner is not the best source")
+        self.assertEqual(tree.get_cost(nodes[40]), 0, "Duplicate source did not keep its lowest offset")
+        self.assertEqual(network.run(nodes[1]).get_owner(nodes[1]), nodes[1], "Single run start is not the owner")
+
+    def test_Compiled_network_Stats_reported_When_enabled(self):
+        nodes = {i: routing.Node(i, (i, i % 3)) for i in range(1, 7)}
+        links = {i: routing.Link(i, i, i + 1) for i in range(1, 6)}
+        network = routing.CompiledNetwork(nodes, links)
+        reported = []
+        network.enable_stats(reported.append)
+        stats = network.run(nodes[1]).stats
+        self.assertEqual(stats.nodes_settled, 6, "Wrong settled count")
+        self.assertEqual(stats.edges_relaxed, 10, "Wrong relaxed edge count")
+        self.assertEqual(stats.heap_pushes, stats.heap_pops, "Pushes do not match pops")
+        self.assertEqual(stats.stale_pops, 0, "Wrong stale pop count")
+        results = dict(network.run_many([nodes[1], nodes[4]], workers=2))
+        self.assertEqual(len(reported), 3, "Observer not told about worker runs")
+        self.assertEqual(results[nodes[4]].stats.nodes_settled, 6, "Worker stats lost")
+
+    def test_Compiled_network_Stats_reported_When_other_searches_used(self):
+        nodes = {i: routing.Node(i, (i, i % 3)) for i in range(1, 7)}
+        links = {i: routing.Link(i, i, i + 1) for i in range(1, 6)}
+        network = routing.CompiledNetwork(nodes, links)
+        reported = []
+        network.enable_stats(reported.append)
+        trees = [network.run_edge_based(nodes[1]), network.run_bidirectional(nodes[1], nodes[6]),
+                 network.run_multi_source([nodes[1], nodes[6]]), network.run(nodes[1], departure_time=0)]
+        self.assertListEqual(reported, [tree.stats for tree in trees], "Observer not told about every run")
+        for tree in trees:
+            stats = tree.stats
+            self.assertGreater(stats.nodes_settled, 0, "Settled nodes not counted")
+            self.assertGreater(stats.edges_relaxed, 0, "Relaxed edges not counted")
+            self.assertEqual(stats.stale_pops, stats.heap_pops - stats.nodes_settled, "Wrong stale pop count")
+        self.assertEqual(trees[2].stats.nodes_settled, 6, "Wrong settled count")
+        self.assertEqual(trees[3].stats.edges_relaxed, 10, "Wrong relaxed edge count")
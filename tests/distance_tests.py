@@ -79,3 +79,14 @@ class DistanceTests(unittest.TestCase):
             end = routing.Node(2, [3, 2])
             routing.manhattan_distance(start, end)
 
+
+    def test_Great_circle_distance_Correct_value_When_lat_lon_coords_used(self):
+        london = routing.Node(1, (51.5074, -0.1278))
+        paris = routing.Node(2, (48.8566, 2.3522))
+        self.assertAlmostEqual(routing.great_circle_distance(london, paris), 343556, delta=100,
+                               msg="Incorrect distance between nodes")
+        self.assertEqual(routing.great_circle_distance(london, london), 0, msg="Incorrect distance between nodes")
+
+    def test_Great_circle_distance_Throw_type_error_When_not_lat_lon_coords_used(self):
+        with self.assertRaises(TypeError):
+            routing.great_circle_distance(routing.Node(1, (1, 1, 1)), routing.Node(2, (3, 3, 3)))
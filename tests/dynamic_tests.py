@@ -0,0 +1,78 @@
+import random
+import unittest
+
+import routing
+
+
+class DynamicCostTests(unittest.TestCase):
+
+    @staticmethod
+    def random_network(directed=False):
+        rand = random.Random(5)
+        nodes = {i: routing.Node(i, (rand.random(), rand.random())) for i in range(120)}
+        links = {j: routing.Link(j, rand.randrange(120), rand.randrange(120)) for j in range(400)}
+        return routing.CompiledNetwork(nodes, links, directed=directed)
+
+    def assertMatchesRerun(self, network, tree):
+        expected = network.run(tree.start_location)
+        for i, node in enumerate(network.node_list):
+            self.assertAlmostEqual(tree.get_cost(node), expected.get_cost(node), msg="Repaired cost differs")
+            path = tree.get_path_indices(node)
+            if path:
+                self.assertEqual(path[0], tree.source, "Repaired path does not start at the source")
+                total = sum(network.arc_costs[tree.previous[k]] for k in path[1:])
+                self.assertAlmostEqual(total, tree.get_cost(node), msg="Repaired path cost is wrong")
+
+    def test_Repair_Matches_rerun_When_costs_change(self):
+        rand = random.Random(6)
+        for directed in (False, True):
+            network = DynamicCostTests.random_network(directed)
+            trees = [network.run(network.node_list[i]) for i in (0, 17, 64)]
+            for _ in range(8):
+                changes = {rand.randrange(400): rand.choice([0.0, rand.random() * 2, 5.0]) for _ in range(20)}
+                update = network.update_link_costs(changes)
+                for tree in trees:
+                    network.repair(tree, update)
+                    self.assertEqual(tree.version, network.version, "Tree version not bumped")
+                    self.assertMatchesRerun(network, tree)
+
+    def test_Repair_Touches_only_affected_nodes(self):
+        network = DynamicCostTests.random_network()
+        tree = network.run(network.node_list[0])
+        leaf = next(i for i in range(len(network.node_list))
+                    if tree.reached(i) and i != tree.source
+                    and all(tree.previous[network.targets[arc]] != arc
+                            for arc in range(network.offsets[i], network.offsets[i + 1])))
+        link_id = network.link_list[network.arc_links[tree.previous[leaf]]].link_id
+        update = network.update_link_costs({link_id: 10.0})
+        repaired = network.repair(tree, update)
+        self.assertLessEqual(len(repaired), 2, "Repair touched more than the affected subtree")
+        self.assertMatchesRerun(network, tree)
+
+    def test_Update_link_costs_Hook_reevaluated_When_cost_none(self):
+        network = DynamicCostTests.random_network()
+        tree = network.run(network.node_list[0])
+        network.update_link_costs({3: 7.0, 4: 7.0})
+        update = network.update_link_costs({3: None})
+        self.assertEqual(network.version, 2, "Version not bumped per update")
+        link = network.link_list[network.link_index[3]]
+        start = network.node_list[network.node_index[link.start_node_id]]
+        self.assertIn(network.link_cost(link, start), [network.arc_costs[arc] for arc in update.old_costs],
+                      "Hook cost not restored")
+        with self.assertRaises(ValueError):
+            network.repair(tree, update)
+        with self.assertRaises(ValueError):
+            network.update_link_costs({5: -1})
+
+    def test_Repair_Throw_value_error_When_tree_partial(self):
+        network = DynamicCostTests.random_network()
+        tree = network.run(network.node_list[0], target=network.node_list[1])
+        with self.assertRaises(ValueError):
+            network.repair(tree, network.update_link_costs({1: 1.0}))
+
+    def test_Hierarchy_Throw_value_error_When_costs_changed(self):
+        network = DynamicCostTests.random_network()
+        hierarchy = routing.ContractionHierarchy.build(network)
+        network.update_link_costs({1: 1.0})
+        with self.assertRaises(ValueError):
+            hierarchy.run(network.node_list[0], network.node_list[1])
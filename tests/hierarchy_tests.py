@@ -0,0 +1,129 @@
+import importlib.util
+import math
+import os
+import random
+import tempfile
+import unittest
+
+import routing
+
+
+class ContractionHierarchyTests(unittest.TestCase):
+
+    @staticmethod
+    def random_network(directed=False):
+        rnd = random.Random(7)
+        nodes, links = {}, {}
+        for y in range(9):
+            for x in range(9):
+                nodes[y * 9 + x] = routing.Node(y * 9 + x, (x + 0.4 * rnd.random(), y + 0.4 * rnd.random()))
+                if x > 0:
+                    links[len(links)] = routing.Link(len(links), y * 9 + x - 1, y * 9 + x)
+                if y > 0 and rnd.random() < 0.8:
+                    links[len(links)] = routing.Link(len(links), y * 9 + x, (y - 1) * 9 + x)
+        return routing.CompiledNetwork(nodes, links, directed=directed)
+
+    def assertMatchesDijkstra(self, network, hierarchy):
+        for start in [0, 40, 80, 13]:
+            network.run(network.node_list[start])
+            for node in network.node_list:
+                cost = hierarchy.run(network.node_list[start], node)
+                self.assertAlmostEqual(cost, network.get_cost(node), msg="Hierarchy cost differs from Dijkstra")
+                self.assertAlmostEqual(hierarchy.get_cost(node), network.get_cost(node), msg="Wrong route cost")
+                self.assertListEqual(hierarchy.get_path_ids(node), network.get_path_ids(node), "Wrong shortest path")
+
+    def test_Hierarchy_matches_Dijkstra_When_undirected_network_used(self):
+        network = ContractionHierarchyTests.random_network()
+        self.assertMatchesDijkstra(network, routing.ContractionHierarchy.build(network))
+
+    def test_Hierarchy_matches_Dijkstra_When_directed_network_used(self):
+        network = ContractionHierarchyTests.random_network(directed=True)
+        self.assertMatchesDijkstra(network, routing.ContractionHierarchy.build(network))
+
+    def test_Hierarchy_Path_links_unpack_to_original_links(self):
+        nodes = {1: routing.Node(1, (0, 0)), 2: routing.Node(2, (1, 0)), 3: routing.Node(3, (2, 0)),
+                 4: routing.Node(4, (3, 0))}
+        links = {1: routing.Link(1, 1, 2), 2: routing.Link(2, 2, 3), 3: routing.Link(3, 3, 4)}
+        network = routing.CompiledNetwork(nodes, links)
+        hierarchy = routing.ContractionHierarchy.build(network)
+        self.assertEqual(hierarchy.run(nodes[4], nodes[1]), 3, "Cost to target is not 3")
+        self.assertListEqual(hierarchy.get_path_links(nodes[1]), [links[3], links[2], links[1]], "Wrong links")
+        self.assertListEqual(hierarchy.get_path_ids(nodes[1]), [4, 3, 2, 1], "Wrong shortest path")
+        self.assertEqual(hierarchy.get_previous_link(nodes[4]), None, "Start has a previous link")
+
+    def test_Hierarchy_Values_correct_Network_unconnected_point(self):
+        nodes = {1: routing.Node(1, (0,)), 2: routing.Node(2, (1,)), 3: routing.Node(3, (9,))}
+        links = {1: routing.Link(1, 1, 2)}
+        hierarchy = routing.ContractionHierarchy.build(routing.CompiledNetwork(nodes, links))
+        self.assertEqual(hierarchy.run(nodes[1], nodes[3]), routing.infinity_cost, "Node is connected to network")
+        self.assertListEqual(hierarchy.get_path_ids(nodes[3]), [], "Wrong shortest path")
+
+    def test_Hierarchy_Reaches_nodes_beyond_infinity_cost_When_max_cost_raised(self):
+        nodes = {i: routing.Node(i, (300 * i,)) for i in range(10)}
+        links = {i: routing.Link(i, i, i + 1) for i in range(9)}
+        network = routing.CompiledNetwork(nodes, links)
+        hierarchy = routing.ContractionHierarchy.build(network)
+        self.assertEqual(hierarchy.run(nodes[0], nodes[9]), routing.infinity_cost, "Node beyond default cap reached")
+        self.assertEqual(hierarchy.run(nodes[0], nodes[9], max_cost=math.inf), 2700, "Cost to 9 is not 2700")
+        self.assertListEqual(hierarchy.get_path_ids(nodes[9]), list(range(10)), "Wrong shortest path")
+        self.assertEqual(hierarchy.run(nodes[0], nodes[4], max_cost=math.inf), 1200, "Cost to 4 is not 1200")
+        self.assertEqual(hierarchy.get_cost(nodes[9]), math.inf, "Node off the route looks cheaper than the route")
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+    def test_Hierarchy_Cost_matrix_Reaches_nodes_beyond_infinity_cost_When_max_cost_raised(self):
+        nodes = {i: routing.Node(i, (300 * i,)) for i in range(10)}
+        links = {i: routing.Link(i, i, i + 1) for i in range(9)}
+        hierarchy = routing.ContractionHierarchy.build(routing.CompiledNetwork(nodes, links))
+        matrix = hierarchy.cost_matrix([nodes[0]], [nodes[5], nodes[9]], max_cost=math.inf)
+        self.assertListEqual(list(matrix[0]), [1500, 2700], "Matrix costs capped")
+
+    def test_Hierarchy_Save_and_load_Values_unchanged(self):
+        network = ContractionHierarchyTests.random_network()
+        hierarchy = routing.ContractionHierarchy.build(network)
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            hierarchy.save(path)
+            loaded = routing.ContractionHierarchy.load(path, network)
+        finally:
+            os.remove(path)
+        self.assertMatchesDijkstra(network, loaded)
+
+    def test_Hierarchy_Load_throws_value_error_When_network_differs(self):
+        network = ContractionHierarchyTests.random_network()
+        hierarchy = routing.ContractionHierarchy.build(network)
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            hierarchy.save(path)
+            with self.assertRaises(ValueError):
+                routing.ContractionHierarchy.load(path, ContractionHierarchyTests.random_network(directed=True))
+        finally:
+            os.remove(path)
+
+    def test_Hierarchy_Load_throws_value_error_When_link_costs_differ(self):
+        network = ContractionHierarchyTests.random_network()
+        hierarchy = routing.ContractionHierarchy.build(network)
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            hierarchy.save(path)
+            changed = ContractionHierarchyTests.random_network()
+            changed.update_link_costs({link.link_id: 50 for link in changed.link_list[1::2]})
+            with self.assertRaises(ValueError):
+                routing.ContractionHierarchy.load(path, changed)
+        finally:
+            os.remove(path)
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+    def test_Hierarchy_Cost_matrix_matches_Dijkstra(self):
+        network = ContractionHierarchyTests.random_network(directed=True)
+        hierarchy = routing.ContractionHierarchy.build(network)
+        origins = [network.node_list[i] for i in [0, 40, 80, 13]]
+        destinations = network.node_list[::3]
+        matrix = hierarchy.cost_matrix(origins, destinations)
+        self.assertEqual(matrix.shape, (4, len(destinations)), "Wrong matrix shape")
+        for i, origin in enumerate(origins):
+            network.run(origin)
+            for j, destination in enumerate(destinations):
+                self.assertAlmostEqual(matrix[i, j], network.get_cost(destination), msg="Matrix cost differs")
@@ -0,0 +1,120 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import routing
+
+
+class IngestTests(unittest.TestCase):
+
+    nodes_csv = "id,x,y,type\n1,0,0,junction\n2,3,4,\n3,,,crossing\n"
+    links_csv = "id,start,end,speed\n10,1,2,30\n11,2,3,\n"
+
+    def feature_collection(self):
+        return {
+            "type": "FeatureCollection",
+            "name": "test",
+            "features": [
+                {"type": "Feature", "id": 1, "geometry": {"type": "Point", "coordinates": [0, 0]},
+                 "properties": {"type": "junction"}},
+                {"type": "Feature", "id": 5, "geometry": {"type": "LineString", "coordinates": [[0, 0], [1, 1], [3, 4]]},
+                 "properties": {"speed": 30}},
+                {"type": "Feature", "geometry": {"type": "LineString", "coordinates": [[3, 4], [6, 8]]},
+                 "properties": {"id": 6, "start": -1, "end": 1}},
+            ],
+        }
+
+    def test_Read_csv_Values_correct(self):
+        nodes = list(routing.read_csv_nodes(io.StringIO(self.nodes_csv)))
+        self.assertListEqual([node.node_id for node in nodes], [1, 2, 3], "Wrong node ids")
+        self.assertTupleEqual(nodes[1].coords, (3.0, 4.0), "Wrong coords")
+        self.assertIsNone(nodes[2].coords, "Empty coords not null")
+        self.assertDictEqual(nodes[0].metadata, {"type": "junction"}, "Wrong metadata")
+        self.assertIsNone(nodes[1].metadata, "Empty metadata not null")
+        links = list(routing.read_csv_links(io.StringIO(self.links_csv)))
+        self.assertEqual(links[0], routing.Link(10, 1, 2), "Wrong link")
+        self.assertEqual((links[1].start_node_id, links[1].end_node_id), (2, 3), "Wrong link ends")
+        self.assertDictEqual(links[0].metadata, {"speed": "30"}, "Wrong metadata")
+
+    def test_Read_csv_Throw_value_error_When_record_invalid(self):
+        with self.assertRaises(ValueError):
+            list(routing.read_csv_nodes(io.StringIO("id,x,y\n1,0,zero\n")))
+        with self.assertRaises(ValueError):
+            list(routing.read_csv_nodes(io.StringIO("id,x,y\n1,0,\n")))
+        with self.assertRaises(ValueError):
+            list(routing.read_csv_links(io.StringIO("id,start\n1,2\n")))
+
+    def test_Read_csv_From_path_Builds_network(self):
+        handles = []
+        try:
+            for text in (self.nodes_csv.replace("3,,,", "3,6,8,"), self.links_csv):
+                handle, path = tempfile.mkstemp(suffix=".csv")
+                with os.fdopen(handle, "w") as f:
+                    f.write(text)
+                handles.append(path)
+            records = list(routing.read_csv_nodes(handles[0])) + list(routing.read_csv_links(handles[1]))
+        finally:
+            for path in handles:
+                os.remove(path)
+        nodes, links = routing.build_dicts(records)
+        network = routing.CompiledNetwork(nodes, links)
+        self.assertEqual(network.run(nodes[1]).get_cost(nodes[3]), 10, "Wrong cost through ingested network")
+
+    def test_Read_geojson_Values_correct_When_chunked(self):
+        text = json.dumps(self.feature_collection(), indent=2)
+        for chunk_size in (3, 64, 65536):
+            records = list(routing.read_geojson(io.StringIO(text), chunk_size=chunk_size))
+            nodes, links = routing.build_dicts(records)
+            self.assertListEqual(sorted(nodes), [-1, 1], "Wrong node ids")
+            self.assertTupleEqual(nodes[-1].coords, (4, 3), "Wrong generated node")
+            self.assertEqual((links[5].start_node_id, links[5].end_node_id), (1, -1), "Wrong link ends")
+            self.assertEqual((links[6].start_node_id, links[6].end_node_id), (-1, 1), "Wrong link ends")
+            self.assertDictEqual(links[5].metadata, {"speed": 30}, "Wrong metadata")
+            self.assertIsNone(links[6].metadata, "Id property kept as metadata")
+
+    def test_Read_geojson_Values_correct_When_feature_sequence(self):
+        features = self.feature_collection()["features"]
+        text = "\n".join(json.dumps(feature) for feature in features)
+        records = list(routing.read_geojson(io.StringIO("\x1e" + text.replace("\n", "\n\x1e")), chunk_size=5))
+        self.assertEqual(len(records), 4, "Wrong record count")
+        nodes, links = routing.build_tables(records)
+        self.assertIsInstance(nodes, routing.NodeTable, "Not a node table")
+        self.assertEqual(links[5], routing.Link(5, 1, -1), "Wrong link")
+
+    def test_Read_geojson_Great_circle_distance_correct_When_lat_lon(self):
+        features = [
+            {"type": "Feature", "id": 1, "geometry": {"type": "Point", "coordinates": [-0.1278, 51.5074]}},
+            {"type": "Feature", "id": 2, "geometry": {"type": "Point", "coordinates": [2.3522, 48.8566]}},
+        ]
+        text = json.dumps({"type": "FeatureCollection", "features": features})
+        london, paris = routing.read_geojson(io.StringIO(text))
+        self.assertAlmostEqual(routing.great_circle_distance(london, paris), 343556, delta=100,
+                               msg="Incorrect distance between ingested nodes")
+        london, paris = routing.read_geojson(io.StringIO(text), lat_lon=False)
+        self.assertTupleEqual(london.coords, (-0.1278, 51.5074), "Axes swapped When not lat_lon")
+
+    def test_Read_geojson_Throw_value_error_When_invalid(self):
+        with self.assertRaises(ValueError):
+            list(routing.read_geojson(io.StringIO('{"type": "FeatureCollection", "features": [{"type": "Feature"')))
+        with self.assertRaises(ValueError):
+            list(routing.read_geojson(io.StringIO('{"type": "Feature", "geometry": {"type": "Polygon"}}')))
+        with self.assertRaises(ValueError):
+            list(routing.read_geojson(io.StringIO('{"type": "Feature", "id": 1, "geometry": '
+                                                  '{"type": "Point", "coordinates": 7}}')))
+
+    def test_Read_geojson_Generated_ids_do_not_clash_When_point_follows_line(self):
+        features = [
+            {"type": "Feature", "id": 10, "geometry": {"type": "LineString", "coordinates": [[0, 0], [1, 1]]}},
+            {"type": "Feature", "id": 0, "geometry": {"type": "Point", "coordinates": [5, 5]}},
+            {"type": "Feature", "id": 11, "geometry": {"type": "LineString", "coordinates": [[5, 5], [0, 0]]}},
+        ]
+        text = json.dumps({"type": "FeatureCollection", "features": features})
+        nodes, links = routing.build_tables(routing.read_geojson(io.StringIO(text)))
+        self.assertListEqual(sorted(nodes), [-2, -1, 0], "Wrong node ids")
+        self.assertEqual(links[11], routing.Link(11, 0, -1), "Wrong link")
+        features.append({"type": "Feature", "id": 0, "geometry": {"type": "Point", "coordinates": [7, 7]}})
+        text = json.dumps({"type": "FeatureCollection", "features": features})
+        with self.assertRaises(ValueError):
+            list(routing.read_geojson(io.StringIO(text)))
@@ -0,0 +1,73 @@
+import importlib.util
+import random
+import unittest
+
+import routing
+
+
+@unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+class KernelTests(unittest.TestCase):
+
+    def random_nodes(self, count, seed, dimensions=2):
+        rand = random.Random(seed)
+        return [routing.Node(i, tuple(rand.uniform(-80, 80) for _ in range(dimensions))) for i in range(count)]
+
+    def test_Pair_distances_Identical_to_scalar_When_euclidean_and_manhattan(self):
+        for dimensions in (1, 2, 3):
+            nodes1 = self.random_nodes(200, 1, dimensions)
+            nodes2 = self.random_nodes(200, 2, dimensions)
+            euclidean = routing.pair_distances(nodes1, nodes2)
+            manhattan = routing.pair_distances(nodes1, nodes2, "manhattan")
+            for k, (node1, node2) in enumerate(zip(nodes1, nodes2)):
+                self.assertEqual(euclidean[k], routing.distance(node1, node2), "Euclidean distance differs")
+                self.assertEqual(manhattan[k], routing.manhattan_distance(node1, node2), "Manhattan distance differs")
+
+    def test_Pair_distances_Match_scalar_When_great_circle(self):
+        nodes1 = self.random_nodes(200, 3)
+        nodes2 = self.random_nodes(200, 4)
+        great_circle = routing.pair_distances(nodes1, nodes2, "great_circle")
+        for k, (node1, node2) in enumerate(zip(nodes1, nodes2)):
+            self.assertAlmostEqual(great_circle[k], routing.great_circle_distance(node1, node2), places=6,
+                                   msg="Great circle distance differs")
+
+    def test_Distances_from_Identical_to_scalar(self):
+        nodes = self.random_nodes(100, 5)
+        result = routing.distances_from(nodes[0], nodes)
+        self.assertListEqual(result.tolist(), [routing.distance(nodes[0], node) for node in nodes],
+                             "One to many distances differ")
+
+    def test_Kernels_Throw_errors_When_invalid(self):
+        with self.assertRaises(ValueError):
+            routing.distances_from(routing.Node(1), [routing.Node(2, (1, 1))])
+        with self.assertRaises(TypeError):
+            routing.pair_distances([routing.Node(1, (1, 1))], [routing.Node(2, (1, 1, 1))])
+        with self.assertRaises(ValueError):
+            routing.pair_distances([routing.Node(1, (1, 1))], [])
+        with self.assertRaises(ValueError):
+            routing.pair_distances([routing.Node(1, (1, 1))], [routing.Node(2, (1, 1))], "chebyshev")
+
+    def test_Arc_distances_Identical_to_link_costs(self):
+        nodes = {node.node_id: node for node in self.random_nodes(50, 6)}
+        rand = random.Random(7)
+        links = {j: routing.Link(j, rand.randrange(50), rand.randrange(50)) for j in range(150)}
+        network = routing.CompiledNetwork(nodes, links)
+        self.assertListEqual(routing.arc_distances(network).tolist(), list(network.arc_costs),
+                             "Arc distances differ from link costs")
+        table = routing.NodeTable.from_nodes(nodes.values())
+        network = routing.CompiledNetwork(table, routing.LinkTable.from_links(table, links.values()))
+        self.assertListEqual(routing.arc_distances(network).tolist(), list(network.arc_costs),
+                             "Arc distances differ from link costs")
+
+    def test_Distance_heuristic_Same_paths_as_scalar_heuristic(self):
+        nodes = {node.node_id: node for node in self.random_nodes(80, 8)}
+        rand = random.Random(9)
+        links = {j: routing.Link(j, rand.randrange(80), rand.randrange(80)) for j in range(300)}
+        network = routing.CompiledNetwork(nodes, links)
+        heuristic = routing.distance_heuristic(network)
+        for target in (nodes[5], nodes[70]):
+            self.assertEqual(heuristic(nodes[1], target), routing.distance(nodes[1], target), "Heuristic differs")
+            expected = network.run(nodes[0], target=target, heuristic=routing.distance)
+            result = network.run(nodes[0], target=target, heuristic=heuristic)
+            self.assertEqual(result.get_cost(target), expected.get_cost(target), "Heuristic run cost differs")
+            self.assertListEqual(result.get_path_ids(target), expected.get_path_ids(target),
+                                 "Heuristic run path differs")
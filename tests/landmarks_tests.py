@@ -0,0 +1,92 @@
+import os
+import random
+import tempfile
+import unittest
+
+import routing
+
+
+class LandmarkTests(unittest.TestCase):
+
+    class MetadataNetwork(routing.CompiledNetwork):
+        def link_cost(self, link: routing.Link, start_node: routing.Node):
+            return link.metadata["cost"]
+
+    @staticmethod
+    def random_network(directed=False):
+        # no coords, so only landmarks can guide the search
+        rand = random.Random(13)
+        nodes = {i: routing.Node(i) for i in range(90)}
+        links = {j: routing.Link(j, rand.randrange(90), rand.randrange(90), {"cost": rand.randint(1, 9)})
+                 for j in range(260)}
+        return LandmarkTests.MetadataNetwork(nodes, links, directed=directed)
+
+    def assertAdmissible(self, network, landmarks):
+        heuristic = landmarks.heuristic()
+        positive = 0
+        for source in range(0, 90, 11):
+            tree = network.run(network.node_list[source])
+            for node in network.node_list:
+                if not tree.reached(network.node_index[node.node_id]):
+                    continue
+                bound = heuristic(network.node_list[source], node)
+                self.assertLessEqual(bound, tree.get_cost(node) + 1e-9, "Landmark bound overestimates")
+                positive += bound > 0
+        self.assertGreater(positive, 0, "Landmark bounds are all zero")
+
+    def test_Landmarks_Heuristic_admissible(self):
+        for directed in (False, True):
+            for method in ("avoid", "farthest"):
+                network = LandmarkTests.random_network(directed)
+                landmarks = routing.Landmarks.build(network, count=4, method=method)
+                self.assertEqual(len(landmarks.landmarks), 4, "Wrong landmark count")
+                self.assertEqual(len(set(landmarks.landmarks)), 4, "Landmark chosen twice")
+                self.assertAdmissible(network, landmarks)
+
+    def test_Landmarks_A_star_matches_Dijkstra(self):
+        for directed in (False, True):
+            network = LandmarkTests.random_network(directed)
+            heuristic = routing.Landmarks.build(network, count=6).heuristic()
+            for source, sink in [(0, 45), (3, 88), (17, 2), (60, 61)]:
+                start, end = network.node_list[source], network.node_list[sink]
+                expected = network.run(start).get_cost(end)
+                self.assertEqual(network.run(start, target=end, heuristic=heuristic).get_cost(end), expected,
+                                 "Landmark A* cost differs")
+                self.assertEqual(routing.Network.run(network, start, target=end, heuristic=heuristic).get_cost(end),
+                                 expected, "Landmark A* cost differs through the hooks")
+
+    def test_Landmarks_Save_and_load(self):
+        network = LandmarkTests.random_network(directed=True)
+        landmarks = routing.Landmarks.build(network, count=3)
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        try:
+            landmarks.save(path)
+            loaded = routing.Landmarks.load(path, network)
+            with self.assertRaises(ValueError):
+                routing.Landmarks.load(path, LandmarkTests.random_network())
+            changed = LandmarkTests.random_network(directed=True)
+            changed.update_link_costs({0: 100})
+            with self.assertRaises(ValueError):
+                routing.Landmarks.load(path, changed)
+        finally:
+            os.remove(path)
+        self.assertEqual(loaded.landmarks, landmarks.landmarks, "Landmarks differ after load")
+        self.assertEqual(loaded.from_costs, landmarks.from_costs, "Tables differ after load")
+        self.assertAdmissible(network, loaded)
+
+    def test_Landmarks_Throw_value_error_When_costs_changed(self):
+        network = LandmarkTests.random_network()
+        landmarks = routing.Landmarks.build(network, count=2)
+        network.update_link_costs({0: 1})
+        with self.assertRaises(ValueError):
+            landmarks.heuristic()
+        with self.assertRaises(ValueError):
+            routing.Landmarks.build(network, method="central")
+
+    def test_Landmarks_Heuristic_throws_value_error_When_costs_changed_after_creation(self):
+        network = LandmarkTests.random_network()
+        heuristic = routing.Landmarks.build(network, count=2).heuristic()
+        network.update_link_costs({0: 1})
+        with self.assertRaises(ValueError):
+            network.run(network.node_list[0], target=network.node_list[-1], heuristic=heuristic)
@@ -0,0 +1,125 @@
+import os
+import pickle
+import random
+import struct
+import tempfile
+import unittest
+
+import routing
+
+
+class MappedNetworkTests(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    @staticmethod
+    def random_network(directed=False):
+        rand = random.Random(11)
+        nodes = {i * 3: routing.Node(i * 3, (rand.random(), rand.random())) for i in range(70)}
+        nodes[300] = routing.Node(300)
+        links = {j * 7 + 1: routing.Link(j * 7 + 1, rand.randrange(70) * 3, rand.randrange(70) * 3) for j in range(250)}
+        return routing.CompiledNetwork(nodes, links, directed=directed)
+
+    def assertMatchesCompiled(self, compiled, mapped):
+        for start in (0, 30, 300):
+            expected = compiled.run(compiled.node_list[compiled.node_index[start]])
+            result = mapped.run(mapped.node_list[mapped.node_index[start]])
+            for node in compiled.node_list:
+                self.assertEqual(result.get_cost(node), expected.get_cost(node), "Mapped cost differs")
+                self.assertListEqual(result.get_path_ids(node), expected.get_path_ids(node), "Mapped path differs")
+                self.assertEqual(result.get_previous_link(node), expected.get_previous_link(node),
+                                 "Mapped previous link differs")
+
+    def test_Mapped_network_Values_correct_Round_trip(self):
+        for directed in (False, True):
+            compiled = MappedNetworkTests.random_network(directed)
+            routing.MappedNetwork.save(compiled, self.path)
+            mapped = routing.MappedNetwork(self.path)
+            try:
+                self.assertEqual(mapped.directed, directed, "Direction not stored")
+                self.assertListEqual(list(mapped.node_ids), compiled.node_ids, "Node ids differ")
+                self.assertEqual(mapped.node_list[1].coords, compiled.node_list[1].coords, "Coords differ")
+                self.assertIsNone(mapped.node_list[mapped.node_index[300]].coords, "Missing coords not kept")
+                self.assertNotIn(1, mapped.node_index, "Unknown node in index")
+                self.assertNotIn("a", mapped.node_index, "Unknown node in index")
+                self.assertMatchesCompiled(compiled, mapped)
+            finally:
+                mapped.close()
+
+    def test_Mapped_network_Values_correct_Other_searches(self):
+        compiled = MappedNetworkTests.random_network()
+        routing.MappedNetwork.save(compiled, self.path)
+        mapped = routing.MappedNetwork(self.path)
+        try:
+            start, end = mapped.node_list[0], mapped.node_list[50]
+            expected = compiled.run(start)
+            self.assertEqual(mapped.run(start, target=end, heuristic=routing.distance).get_cost(end),
+                             expected.get_cost(end), "A* cost differs")
+            self.assertEqual(mapped.run_bidirectional(start, end).get_cost(end), expected.get_cost(end),
+                             "Bidirectional cost differs")
+            self.assertEqual(mapped.run_edge_based(start).get_cost(end), expected.get_cost(end),
+                             "Edge-based cost differs")
+            hierarchy = routing.ContractionHierarchy.build(mapped)
+            self.assertAlmostEqual(hierarchy.run(start, end), expected.get_cost(end), msg="Hierarchy cost differs")
+        finally:
+            mapped.close()
+
+    def test_Mapped_network_Pickle_reopens_file(self):
+        compiled = MappedNetworkTests.random_network()
+        routing.MappedNetwork.save(compiled, self.path)
+        mapped = routing.MappedNetwork(self.path)
+        copy = pickle.loads(pickle.dumps(mapped))
+        try:
+            self.assertMatchesCompiled(compiled, copy)
+            trees = dict(mapped.run_many([mapped.node_list[0], mapped.node_list[5]], workers=2))
+            self.assertEqual(trees[mapped.node_list[5]].get_cost(mapped.node_list[9]),
+                             compiled.run(compiled.node_list[5]).get_cost(compiled.node_list[9]), "Worker cost differs")
+        finally:
+            copy.close()
+            mapped.close()
+
+    def test_Mapped_network_Save_throws_type_error_When_ids_not_integers(self):
+        nodes = {"a": routing.Node("a", (0, 0)), "b": routing.Node("b", (1, 0))}
+        network = routing.CompiledNetwork(nodes, {1: routing.Link(1, "a", "b")})
+        with self.assertRaises(TypeError):
+            routing.MappedNetwork.save(network, self.path)
+
+    def test_Mapped_network_Load_throws_value_error_When_file_invalid(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a graph file at all, just some text padding it out")
+        with self.assertRaises(ValueError):
+            routing.MappedNetwork(self.path)
+        routing.MappedNetwork.save(MappedNetworkTests.random_network(), self.path)
+        with open(self.path, "r+b") as f:
+            f.seek(8)
+            f.write(struct.pack("<I", routing.MappedNetwork.file_version + 1))
+        with self.assertRaises(ValueError):
+            routing.MappedNetwork(self.path)
+        routing.MappedNetwork.save(MappedNetworkTests.random_network(), self.path)
+        with open(self.path, "r+b") as f:
+            f.truncate(200)
+        with self.assertRaises(ValueError):
+            routing.MappedNetwork(self.path)
+
+    def test_Mapped_network_Throws_value_error_When_costs_changed_or_junction_costs_used(self):
+        routing.MappedNetwork.save(MappedNetworkTests.random_network(), self.path)
+        mapped = routing.MappedNetwork(self.path)
+        try:
+            with self.assertRaises(ValueError):
+                mapped.update_link_costs({1: 5})
+            with self.assertRaises(ValueError):
+                mapped.repair(mapped.run(mapped.node_list[0]), routing.CostUpdate(1, {}))
+        finally:
+            mapped.close()
+
+        class TurnMappedNetwork(routing.MappedNetwork):
+            def junction_cost(self, link_prev, middle_node, link_next):
+                return 5
+
+        with self.assertRaises(ValueError):
+            TurnMappedNetwork(self.path)
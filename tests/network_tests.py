@@ -1,3 +1,6 @@
+import math
+import random
+import threading
 import unittest
 
 import routing
@@ -34,6 +37,9 @@ class NetworkTests(unittest.TestCase):
                     links.append(link)
             return links
 
+        def get_links_arriving(self, node: routing.Node):
+            return self.get_links_attached(node)
+
         def get_other_node(self, link: routing.Link, start_node: routing.Node):
             if link.start_node_id == start_node.node_id:
                 return self.nodes[link.end_node_id]
@@ -152,6 +158,309 @@ class NetworkTests(unittest.TestCase):
         self.assertEqual(prev, links[3], "Node has incorrect route")
         self.assertListEqual(path, [1, 3], "Wrong shortest path")
 
+    def test_Simple_network_Values_correct_Network_grid(self):
+        nodes, links = {}, {}
+        for y in range(10):
+            for x in range(10):
+                nodes[(x, y)] = routing.Node((x, y), (x, y))
+                if x > 0:
+                    links[len(links)] = routing.Link(len(links), (x - 1, y), (x, y))
+                if y > 0:
+                    links[len(links)] = routing.Link(len(links), (x, y - 1), (x, y))
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        network.run(nodes[(0, 0)])
+        for (x, y), node in nodes.items():
+            self.assertEqual(network.get_cost(node), x + y, "Cost to grid node is not manhattan distance")
+            self.assertEqual(len(network.get_path_ids(node)), x + y + 1, "Wrong shortest path length")
+
+    def test_Simple_network_Astar_matches_Dijkstra_When_distance_heuristic_used(self):
+        nodes, links = {}, {}
+        for y in range(10):
+            for x in range(10):
+                nodes[(x, y)] = routing.Node((x, y), (x, y))
+                if x > 0:
+                    links[len(links)] = routing.Link(len(links), (x - 1, y), (x, y))
+                if y > 0:
+                    links[len(links)] = routing.Link(len(links), (x, y - 1), (x, y))
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        network.run(nodes[(2, 3)])
+        full_cost, full_visited = network.get_cost(nodes[(8, 3)]), len(network.visited)
+        network.run(nodes[(2, 3)], target=nodes[(8, 3)], heuristic=routing.distance)
+        self.assertEqual(network.get_cost(nodes[(8, 3)]), full_cost, "A* cost differs from Dijkstra")
+        self.assertListEqual(network.get_path_ids(nodes[(8, 3)]), [(x, 3) for x in range(2, 9)], "Wrong shortest path")
+        self.assertLess(len(network.visited), full_visited / 4, "A* did not reduce settled nodes")
+
+    def test_Simple_network_Stops_at_target_When_no_heuristic_used(self):
+        nodes = {1: routing.Node(1, (0,)), 2: routing.Node(2, (1,)), 3: routing.Node(3, (2,)), 4: routing.Node(4, (3,))}
+        links = {1: routing.Link(1, 1, 2), 2: routing.Link(2, 2, 3), 3: routing.Link(3, 3, 4)}
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        network.run(nodes[1], target=nodes[2])
+        self.assertEqual(network.get_cost(nodes[2]), 1, "Cost to target is not 1")
+        self.assertNotIn(nodes[3], network.visited, "Search continued past target")
+        self.assertEqual(network.get_cost(nodes[4]), routing.infinity_cost, "Search continued past target")
+
+    def test_Simple_network_Astar_matches_Dijkstra_When_scaled_heuristic_used(self):
+        nodes = {1: routing.Node(1, (0, 0)), 2: routing.Node(2, (1, 0)), 3: routing.Node(3, (3, 4))}
+        links = {1: routing.Link(1, 1, 2), 2: routing.Link(2, 2, 3), 3: routing.Link(3, 1, 3)}
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        network.run(nodes[1], target=nodes[3], heuristic=routing.scaled(routing.manhattan_distance, 0.5))
+        self.assertEqual(network.get_cost(nodes[3]), 5, "Cost to 3 is not 5")
+        self.assertListEqual(network.get_path_ids(nodes[3]), [1, 3], "Wrong shortest path")
+
+    def test_Simple_network_Stops_When_all_targets_settled(self):
+        nodes = {i: routing.Node(i, (i,)) for i in range(1, 7)}
+        links = {i: routing.Link(i, i, i + 1) for i in range(1, 6)}
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        network.run(nodes[1], targets=[nodes[3], nodes[2]])
+        self.assertEqual(network.get_cost(nodes[3]), 2, "Cost to 3 is not 2")
+        self.assertSetEqual(network.visited, {nodes[1], nodes[2], nodes[3]}, "Search continued past targets")
+
+    def test_Simple_network_Stops_When_max_cost_reached(self):
+        nodes = {i: routing.Node(i, (i,)) for i in range(1, 7)}
+        links = {i: routing.Link(i, i, i + 1) for i in range(1, 6)}
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        network.run(nodes[3], max_cost=2)
+        self.assertSetEqual(set(network.lowest_cost), {nodes[2], nodes[3], nodes[4]}, "Explored outside max cost")
+        self.assertEqual(network.get_cost(nodes[6]), routing.infinity_cost, "Node beyond max cost reached")
+        self.assertListEqual(network.get_path_ids(nodes[6]), [], "Wrong shortest path")
+
+    def test_Simple_network_Reaches_nodes_beyond_infinity_cost_When_max_cost_raised(self):
+        nodes = {1: routing.Node(1, (0,)), 2: routing.Node(2, (600,)), 3: routing.Node(3, (1200,))}
+        links = {1: routing.Link(1, 1, 2), 2: routing.Link(2, 2, 3)}
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        network.run(nodes[1])
+        self.assertEqual(network.get_cost(nodes[3]), routing.infinity_cost, "Node beyond default cap reached")
+        network.run(nodes[1], max_cost=float("inf"))
+        self.assertEqual(network.get_cost(nodes[3]), 1200, "Cost to 3 is not 1200")
+        self.assertListEqual(network.get_path_ids(nodes[3]), [1, 2, 3], "Wrong shortest path")
+
+    def test_Simple_network_Unreached_cost_not_below_reached_When_max_cost_raised(self):
+        nodes = {1: routing.Node(1, (0,)), 2: routing.Node(2, (1500,)), 3: routing.Node(3, (9,))}
+        links = {1: routing.Link(1, 1, 2)}
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        tree = network.run(nodes[1], max_cost=math.inf)
+        self.assertEqual(tree.get_cost(nodes[2]), 1500, "Cost to 2 is not 1500")
+        self.assertEqual(tree.get_cost(nodes[3]), math.inf, "Unreached node looks cheaper than a reached one")
+        self.assertEqual(network.run(nodes[1]).get_cost(nodes[3]), routing.infinity_cost, "Default unreached cost changed")
+
+    def test_Simple_network_Stops_When_max_settled_reached(self):
+        nodes = {i: routing.Node(i, (i,)) for i in range(1, 7)}
+        links = {i: routing.Link(i, i, i + 1) for i in range(1, 6)}
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        network.run(nodes[1], max_settled=3)
+        self.assertEqual(len(network.visited), 3, "Wrong number of settled nodes")
+        self.assertNotIn(nodes[5], network.lowest_cost, "Explored past settle limit")
+
+    def test_Simple_network_Drops_frontier_labels_When_stopped_early(self):
+        nodes = {i: routing.Node(i, (0,)) for i in range(1, 5)}
+        links = {1: routing.Link(1, 1, 2), 2: routing.Link(2, 2, 4), 3: routing.Link(3, 4, 3), 4: routing.Link(4, 1, 3)}
+        costs = {1: 1, 2: 1, 3: 1, 4: 10}
+
+        class CostedNetwork(NetworkTests.SimpleNetwork):
+            def link_cost(self, link: routing.Link, start_node: routing.Node):
+                return costs[link.link_id]
+
+        network = CostedNetwork(nodes, links)
+        network.run(nodes[1], max_settled=2)
+        self.assertEqual(network.get_cost(nodes[3]), routing.infinity_cost, "Tentative label kept")
+        self.assertListEqual(network.get_path_ids(nodes[3]), [], "Wrong shortest path")
+        self.assertEqual(network.get_cost(nodes[2]), 1, "Cost to 2 is not 1")
+        network.run(nodes[1])
+        self.assertEqual(network.get_cost(nodes[3]), 3, "Cost to 3 is not 3")
+
+    def test_Simple_network_Bidirectional_matches_Dijkstra_Network_grid(self):
+        rnd = random.Random(1)
+        nodes, links = {}, {}
+        for y in range(8):
+            for x in range(8):
+                nodes[(x, y)] = routing.Node((x, y), (x + 0.3 * rnd.random(), y + 0.3 * rnd.random()))
+                if x > 0:
+                    links[len(links)] = routing.Link(len(links), (x - 1, y), (x, y))
+                if y > 0:
+                    links[len(links)] = routing.Link(len(links), (x, y - 1), (x, y))
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        for end in [(7, 7), (0, 6), (3, 2), (1, 1)]:
+            full = network.run(nodes[(1, 1)])
+            cost, path = network.get_cost(nodes[end]), network.get_path_ids(nodes[end])
+            tree = network.run_bidirectional(nodes[(1, 1)], nodes[end])
+            self.assertAlmostEqual(tree.get_cost(nodes[end]), cost, msg="Bidirectional cost differs from Dijkstra")
+            self.assertAlmostEqual(network.get_cost(nodes[end]), cost, msg="Bidirectional cost differs from Dijkstra")
+            self.assertListEqual(network.get_path_ids(nodes[end]), path, "Wrong shortest path")
+            for node_id, node in nodes.items():
+                expected = full.get_cost(node) if node_id in path else routing.infinity_cost
+                self.assertAlmostEqual(tree.get_cost(node), expected, msg="Tentative label kept off the route")
+
+    def test_Simple_network_Bidirectional_Values_correct_Network_unconnected_point(self):
+        nodes = {1: routing.Node(1, (0,)), 2: routing.Node(2, (1,)), 3: routing.Node(3, (9,))}
+        links = {1: routing.Link(1, 1, 2)}
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        tree = network.run_bidirectional(nodes[1], nodes[3])
+        self.assertEqual(tree.get_cost(nodes[3]), routing.infinity_cost, "Node is connected")
+        self.assertListEqual(network.get_path_ids(nodes[3]), [], "Wrong shortest path")
+
+    def test_Simple_network_Run_many_matches_run_When_workers_used(self):
+        nodes = {i: routing.Node(i, (i, i % 3)) for i in range(1, 7)}
+        links = {i: routing.Link(i, i, i + 1) for i in range(1, 6)}
+        links[6] = routing.Link(6, 1, 6)
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        expected = {}
+        for node in nodes.values():
+            network.run(node)
+            expected[node.node_id] = {n.node_id: (c, p) for n, (c, p) in network.lowest_cost.items()}
+        for workers in [1, 2]:
+            results = {start.node_id: {n.node_id: (c, p) for n, (c, p) in tree.lowest_cost.items()}
+                       for start, tree in network.run_many(nodes.values(), workers=workers)}
+            self.assertDictEqual(results, expected, "Run many results differ from run")
+
+    def test_Simple_network_Trees_independent_When_several_runs_made(self):
+        nodes = {i: routing.Node(i, (i,)) for i in range(1, 5)}
+        links = {i: routing.Link(i, i, i + 1) for i in range(1, 4)}
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        first = network.run(nodes[1])
+        second = network.run(nodes[4])
+        self.assertIsInstance(first, routing.ShortestPathTree, "Run does not return a tree")
+        self.assertEqual(first.get_cost(nodes[4]), 3, "Cost to 4 is not 3")
+        self.assertListEqual(first.get_path_ids(nodes[3]), [1, 2, 3], "Wrong shortest path")
+        self.assertEqual(second.get_cost(nodes[1]), 3, "Cost to 1 is not 3")
+        self.assertEqual(second.get_previous_link(nodes[3]), links[3], "Node has incorrect route")
+        self.assertListEqual(second.get_path_ids(nodes[2]), [4, 3, 2], "Wrong shortest path")
+        self.assertListEqual(network.get_path_ids(nodes[2]), [4, 3, 2], "Network does not report last run")
+
+    def test_Simple_network_Attributes_assignable_When_subclass_sets_them(self):
+        nodes = {1: routing.Node(1, (0,)), 2: routing.Node(2, (1,))}
+        links = {1: routing.Link(1, 1, 2)}
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        network.start_location = nodes[2]
+        network.lowest_cost = {nodes[2]: (0, None), nodes[1]: (1, links[1])}
+        network.visited = {nodes[1], nodes[2]}
+        network.edge_cost = {}
+        self.assertEqual(network.get_cost(nodes[1]), 1, "Assigned costs not used")
+        self.assertListEqual(network.get_path_ids(nodes[1]), [2, 1], "Assigned labels not used")
+        self.assertSetEqual(network.tree.visited, {nodes[1], nodes[2]}, "Assignment not written to the tree")
+        network.run(nodes[1])
+        self.assertEqual(network.get_cost(nodes[2]), 1, "Run did not replace assigned costs")
+
+    def test_Simple_network_Values_correct_When_runs_are_concurrent(self):
+        nodes = {i: routing.Node(i, (i,)) for i in range(20)}
+        links = {i: routing.Link(i, i, i + 1) for i in range(19)}
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        errors = []
+
+        def query(start):
+            for _ in range(20):
+                tree = network.run(nodes[start])
+                for node in nodes.values():
+                    if tree.get_cost(node) != abs(node.node_id - start) or \
+                            len(tree.get_path(node)) != abs(node.node_id - start) + 1:
+                        errors.append((start, node))
+
+        threads = [threading.Thread(target=query, args=(start,)) for start in [0, 7, 19]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertListEqual(errors, [], "Concurrent runs corrupted each other")
+
+    def test_Simple_network_Multi_source_matches_best_single_runs(self):
+        rand = random.Random(2)
+        nodes = {i: routing.Node(i, (rand.random(), rand.random())) for i in range(40)}
+        ends = [(rand.randrange(40), rand.randrange(40)) for _ in range(100)]
+        links = {j: routing.Link(j, start, end) for j, (start, end) in enumerate(ends) if start != end}
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        sources, offsets = [nodes[0], nodes[13], nodes[27]], [0, 0.2, 0.1]
+        singles = [network.run(source) for source in sources]
+        tree = network.run_multi_source(sources, offsets)
+        for node in nodes.values():
+            best = min(offset + single.get_cost(node) for offset, single in zip(offsets, singles))
+            if best >= routing.infinity_cost:
+                self.assertIsNone(tree.get_owner(node), "Unreached node has an owner")
+                continue
+            self.assertAlmostEqual(tree.get_cost(node), best, msg="Multi-source cost is not the best source")
+            owner = tree.get_owner(node)
+            path = tree.get_path(node)
+            self.assertEqual(path[0], owner, "Path does not start at the owning source")
+            k = sources.index(owner)
+            self.assertAlmostEqual(offsets[k] + singles[k].get_cost(node), best, msg="Owner is not the best source")
+        self.assertEqual(network.get_owner(nodes[13]), nodes[13], "Source does not own itself")
+        self.assertEqual(network.run(nodes[0]).get_owner(nodes[0]), nodes[0], "Single run start is not the owner")
+
+    def test_Simple_network_Stats_reported_When_enabled(self):
+        nodes = {(x, y): routing.Node((x, y), (x, y)) for y in range(5) for x in range(5)}
+        links = {}
+        for x, y in nodes:
+            if x > 0:
+                links[len(links)] = routing.Link(len(links), (x - 1, y), (x, y))
+            if y > 0:
+                links[len(links)] = routing.Link(len(links), (x, y - 1), (x, y))
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        reported = []
+        network.enable_stats(reported.append)
+        tree = network.run(nodes[(0, 0)], target=nodes[(4, 4)], heuristic=routing.manhattan_distance)
+        stats = tree.stats
+        self.assertListEqual(reported, [stats], "Observer not told about the run")
+        self.assertEqual(stats.start_location, nodes[(0, 0)], "Wrong start location")
+        self.assertEqual(stats.nodes_settled, len(tree.visited), "Wrong settled count")
+        self.assertEqual(stats.edges_relaxed, stats.hook_calls["link_cost"], "Relaxed edges do not match hook calls")
+        self.assertEqual(stats.hook_calls["get_links_attached"], stats.nodes_settled - 1,
+                         "Target links looked up")
+        self.assertEqual(stats.stale_pops, stats.heap_pops - stats.nodes_settled, "Wrong stale pop count")
+        self.assertGreaterEqual(stats.heap_pushes, stats.heap_pops, "More pops than pushes")
+        self.assertGreater(stats.max_frontier, 1, "Frontier size not tracked")
+        self.assertIn("heuristic", stats.hook_time, "Heuristic not timed")
+        self.assertGreater(stats.wall_time, 0, "Wall time not measured")
+        self.assertEqual(stats.as_dict()["nodes_settled"], stats.nodes_settled, "Wrong exported stats")
+        network.disable_stats()
+        self.assertIsNone(network.run(nodes[(0, 0)]).stats, "Stats kept when disabled")
+        self.assertEqual(len(reported), 1, "Observer told when disabled")
+
+    def test_Simple_network_Stats_reported_When_other_searches_used(self):
+        nodes = {i: routing.Node(i, (i,)) for i in range(1, 7)}
+        links = {i: routing.Link(i, i, i + 1) for i in range(1, 6)}
+
+        class GeneratorNetwork(NetworkTests.SimpleNetwork):
+            def get_links_attached(self, node: routing.Node):
+                return (link for link in super().get_links_attached(node))
+
+        network = GeneratorNetwork(nodes, links)
+        reported = []
+        network.enable_stats(reported.append)
+        trees = [network.run(nodes[1]), network.run_edge_based(nodes[1]),
+                 network.run_bidirectional(nodes[1], nodes[6]), network.run_multi_source([nodes[1], nodes[6]])]
+        self.assertListEqual(reported, [tree.stats for tree in trees], "Observer not told about every run")
+        for tree in trees:
+            stats = tree.stats
+            self.assertGreater(stats.nodes_settled, 0, "Settled nodes not counted")
+            self.assertEqual(stats.edges_relaxed, stats.hook_calls["link_cost"], "Relaxed edges do not match hook calls")
+            self.assertEqual(stats.stale_pops, stats.heap_pops - stats.nodes_settled, "Wrong stale pop count")
+        self.assertEqual(trees[0].stats.edges_relaxed, 10, "Wrong relaxed edge count")
+        self.assertIn("get_links_arriving", trees[2].stats.hook_calls, "Arriving links not timed")
+        self.assertEqual(trees[3].stats.nodes_settled, 6, "Wrong settled count")
+
+    def test_Simple_network_K_shortest_paths_match_compiled(self):
+        rand = random.Random(12)
+        nodes = {i: routing.Node(i, (rand.random(), rand.random())) for i in range(12)}
+        links = {j: routing.Link(j, rand.randrange(12), rand.randrange(12)) for j in range(24)}
+        links = {link_id: link for link_id, link in links.items() if link.start_node_id != link.end_node_id}
+        expected = routing.CompiledNetwork(nodes, links).k_shortest_paths(nodes[0], nodes[5], 8)
+        routes = NetworkTests.SimpleNetwork(nodes, links).k_shortest_paths(nodes[0], nodes[5], 8)
+        self.assertEqual(len(routes), len(expected), "Wrong number of routes")
+        for route, other in zip(routes, expected):
+            self.assertAlmostEqual(route.cost, other.cost, msg="Route cost is not the next shortest")
+            self.assertEqual(len(route.links), len(route.node_ids) - 1, "Route links do not match its nodes")
+            self.assertEqual(len(set(route.node_ids)), len(route.node_ids), "Route has a loop")
+        self.assertListEqual(NetworkTests.SimpleNetwork(nodes, links).k_shortest_paths(nodes[0], nodes[5], 2,
+                             max_cost=0.01), [], "Route found above max cost")
+
+    def test_Network_Throws_not_implemented_error_When_links_arriving_not_overridden(self):
+        nodes = {1: routing.Node(1, (0,))}
+        with self.assertRaises(NotImplementedError):
+            NetworkTests.NonNetwork().get_links_arriving(nodes[1])
+
+    def test_Network_Throws_value_error_When_heuristic_without_target(self):
+        nodes = {1: routing.Node(1, (0,))}
+        with self.assertRaises(ValueError):
+            NetworkTests.SimpleNetwork(nodes, {}).run(nodes[1], heuristic=routing.distance)
+
     class ComplexNetwork(routing.Network):
         def __init__(self, nodes, links):
             super().__init__()
@@ -165,6 +474,9 @@ class NetworkTests(unittest.TestCase):
                     links.append(link)
             return links
 
+        def get_links_arriving(self, node: routing.Node):
+            return self.get_links_attached(node)
+
         def get_other_node(self, link: routing.Link, start_node: routing.Node):
             if link.start_node_id == start_node.node_id:
                 return self.nodes[link.end_node_id]
@@ -224,6 +536,47 @@ class NetworkTests(unittest.TestCase):
         self.assertEqual(prev, links[5], "Node has wrong previous link")
         self.assertListEqual(path, [1, 2, 4, 5, 3], "Wrong shortest path")
 
+    def test_Complex_network_Bidirectional_Values_correct_Traffic_lights(self):
+        nodes = {1: routing.Node(1), 2: routing.Node(2, metadata={"traffic lights": 5}), 3: routing.Node(3)}
+        links = {1: routing.Link(1, 1, 2), 2: routing.Link(2, 2, 3)}
+        network = NetworkTests.ComplexNetwork(nodes, links)
+        tree = network.run_bidirectional(nodes[1], nodes[3])
+        self.assertEqual(tree.get_cost(nodes[3]), 25, "Cost to target is not correct")
+        self.assertEqual(network.get_cost(nodes[3]), 25, "Cost to target is not correct")
+        self.assertListEqual(network.get_path_ids(nodes[3]), [1, 2, 3], "Wrong shortest path")
+
+    def test_Complex_network_Bidirectional_Values_correct_Banned_turn(self):
+        nodes = {1: routing.Node(1), 2: routing.Node(2), 3: routing.Node(3), 4: routing.Node(4), 5: routing.Node(5)}
+        links = {1: routing.Link(1, 1, 2, {"banned turn": 2}), 2: routing.Link(2, 2, 3),
+                 3: routing.Link(3, 2, 4), 4: routing.Link(4, 4, 5), 5: routing.Link(5, 5, 3)}
+        network = NetworkTests.ComplexNetwork(nodes, links)
+        tree = network.run_bidirectional(nodes[1], nodes[3])
+        self.assertEqual(tree.get_cost(nodes[3]), 40, "Cost to target is not correct")
+        self.assertListEqual(network.get_path_ids(nodes[3]), [1, 2, 4, 5, 3], "Wrong shortest path")
+
+    def test_Simple_network_Edge_based_finds_route_When_first_arrival_has_banned_turn(self):
+        nodes = {1: routing.Node(1, (0, 0)), 2: routing.Node(2, (2, 0)), 3: routing.Node(3, (1, 1)),
+                 4: routing.Node(4, (3, 0))}
+        links = {1: routing.Link(1, 1, 2), 2: routing.Link(2, 1, 3), 3: routing.Link(3, 3, 2), 4: routing.Link(4, 2, 4)}
+        restrictions = routing.TurnRestrictions([(1, 4)])
+        network = NetworkTests.SimpleNetwork(nodes, links)
+        network.run_edge_based(nodes[1], restrictions)
+        self.assertAlmostEqual(network.get_cost(nodes[4]), 2 * 2 ** 0.5 + 1, msg="Cost to target is not correct")
+        self.assertEqual(network.get_previous_link(nodes[4]), links[4], "Node has wrong previous link")
+        self.assertListEqual(network.get_path_ids(nodes[4]), [1, 3, 2, 4], "Wrong shortest path")
+        self.assertEqual(network.get_cost(nodes[2]), 2, "Cost to 2 is not 2")
+        self.assertListEqual(network.get_path_ids(nodes[2]), [1, 2], "Wrong shortest path")
+
+    def test_Complex_network_Edge_based_Values_correct_Banned_turn(self):
+        nodes = {1: routing.Node(1), 2: routing.Node(2), 3: routing.Node(3), 4: routing.Node(4), 5: routing.Node(5)}
+        links = {1: routing.Link(1, 1, 2), 2: routing.Link(2, 2, 3),
+                 3: routing.Link(3, 2, 4), 4: routing.Link(4, 4, 5), 5: routing.Link(5, 5, 3)}
+        network = NetworkTests.ComplexNetwork(nodes, links)
+        network.run_edge_based(nodes[1], routing.TurnRestrictions([(1, 2), (3, 3)]), target=nodes[3])
+        self.assertEqual(network.get_cost(nodes[3]), 40, "Cost to target is not correct")
+        self.assertEqual(network.get_previous_link(nodes[3]), links[5], "Node has wrong previous link")
+        self.assertListEqual(network.get_path_ids(nodes[3]), [1, 2, 4, 5, 3], "Wrong shortest path")
+
 
 class ExampleNetworkTests(unittest.TestCase):
 
@@ -253,6 +606,9 @@ class ExampleNetworkTests(unittest.TestCase):
             cost = self.graph[start_node.node_id][link.end_node_id]
             return cost
 
+        def get_links_arriving(self, node: routing.Node):
+            return [routing.Link(k + node.node_id, k, node.node_id) for k in self.graph if node.node_id in self.graph[k]]
+
     def test_Simple_network_Values_correct_Example_Network(self):
         network = ExampleNetworkTests.ExampleNetwork1()
         network.run(routing.Node('s'))
@@ -263,3 +619,9 @@ class ExampleNetworkTests(unittest.TestCase):
         self.assertEqual(prev.link_id, 'uv', "Node has incorrect previous link")
         self.assertListEqual(path, ['s', 'x', 'u', 'v'], "Wrong shortest path")
 
+    def test_Simple_network_Bidirectional_Values_correct_Example_Network(self):
+        network = ExampleNetworkTests.ExampleNetwork1()
+        tree = network.run_bidirectional(routing.Node('s'), routing.Node('v'))
+        self.assertEqual(tree.get_cost(routing.Node('v')), 9, "Cost to end is not 9")
+        self.assertEqual(network.get_previous_link(routing.Node('v')).link_id, 'uv', "Node has incorrect previous link")
+        self.assertListEqual(network.get_path_ids(routing.Node('v')), ['s', 'x', 'u', 'v'], "Wrong shortest path")
@@ -0,0 +1,75 @@
+import random
+import unittest
+
+import routing
+
+
+class TravelTimeProfileTests(unittest.TestCase):
+
+    def test_Profile_Evaluate_Values_correct(self):
+        profile = routing.TravelTimeProfile([10, 20, 30], [5, 15, 5])
+        self.assertEqual(profile.evaluate(0), 5, "Wrong cost before first breakpoint")
+        self.assertEqual(profile.evaluate(15), 10, "Wrong interpolated cost")
+        self.assertEqual(profile.evaluate(20), 15, "Wrong cost at breakpoint")
+        self.assertEqual(profile.evaluate(40), 5, "Wrong cost after last breakpoint")
+
+    def test_Profile_Evaluate_Values_correct_When_periodic(self):
+        profile = routing.TravelTimeProfile([0, 40, 60], [10, 30, 20], period=100)
+        self.assertEqual(profile.evaluate(160), 20, "Wrong cost in next period")
+        self.assertEqual(profile.evaluate(80), 15, "Wrong cost across period end")
+        self.assertEqual(profile.evaluate(-20), 15, "Wrong cost before period start")
+        self.assertEqual(routing.TravelTimeProfile([5], [7], period=100).evaluate(50), 7, "Wrong constant cost")
+
+    def test_Profile_Throw_value_error_When_invalid(self):
+        with self.assertRaises(ValueError):
+            routing.TravelTimeProfile([0, 10], [20, 5])
+        with self.assertRaises(ValueError):
+            routing.TravelTimeProfile([0, 10], [5])
+        with self.assertRaises(ValueError):
+            routing.TravelTimeProfile([10, 0], [5, 5])
+        with self.assertRaises(ValueError):
+            routing.TravelTimeProfile([0, 10], [5, -1])
+        with self.assertRaises(ValueError):
+            routing.TravelTimeProfile([0, 100], [5, 5], period=100)
+        with self.assertRaises(ValueError):
+            routing.TravelTimeProfile([0, 90], [5, 30], period=100)
+
+    def test_Profile_table_Interns_profiles(self):
+        table = routing.ProfileTable()
+        k = table.add(routing.TravelTimeProfile([0, 10], [1, 2]))
+        self.assertEqual(table.add(routing.TravelTimeProfile([0, 10], [1, 2])), k, "Equal profiles not shared")
+        self.assertEqual(table.add(routing.TravelTimeProfile([0, 10], [1, 3])), k + 1, "Profiles wrongly shared")
+        self.assertEqual(table.evaluate(k + 1, 5), 2, "Wrong table cost")
+
+    def test_Time_dependent_run_Route_changes_with_departure_time(self):
+        nodes = {1: routing.Node(1, (0, 0)), 2: routing.Node(2, (1, 0)), 3: routing.Node(3, (2, 0)),
+                 4: routing.Node(4, (1, 1))}
+        links = {1: routing.Link(1, 1, 2), 2: routing.Link(2, 2, 3), 3: routing.Link(3, 1, 4), 4: routing.Link(4, 4, 3)}
+        network = routing.CompiledNetwork(nodes, links, directed=True)
+        rush_hour = routing.TravelTimeProfile([0, 100, 200, 300], [1, 1, 10, 1], period=1000)
+        network.set_link_profiles({2: rush_hour})
+        self.assertEqual(network.version, 1, "Version not bumped")
+        tree = network.run(nodes[1], departure_time=0)
+        self.assertEqual(tree.get_cost(nodes[3]), 2, "Wrong off peak cost")
+        self.assertListEqual(tree.get_path_ids(nodes[3]), [1, 2, 3], "Wrong off peak route")
+        tree = network.run(nodes[1], departure_time=199)
+        self.assertAlmostEqual(tree.get_cost(nodes[3]), 2 * 2 ** 0.5, msg="Wrong peak cost")
+        self.assertListEqual(tree.get_path_ids(nodes[3]), [1, 4, 3], "Wrong peak route")
+        tree = network.run(nodes[1], departure_time=1199, target=nodes[3])
+        self.assertListEqual(tree.get_path_ids(nodes[3]), [1, 4, 3], "Wrong route in next period")
+        network.set_link_profiles({2: None})
+        self.assertEqual(network.run(nodes[1], departure_time=199).get_cost(nodes[3]), 2, "Profile not removed")
+        with self.assertRaises(ValueError):
+            network.run(nodes[1], departure_time=0, max_settled=2)
+
+    def test_Time_dependent_run_Matches_fixed_costs_When_profiles_constant(self):
+        rand = random.Random(4)
+        nodes = {i: routing.Node(i, (rand.random(), rand.random())) for i in range(50)}
+        links = {j: routing.Link(j, rand.randrange(50), rand.randrange(50)) for j in range(150)}
+        network = routing.CompiledNetwork(nodes, links)
+        network.update_link_costs({j: 0.5 for j in range(0, 150, 3)})
+        network.set_link_profiles({j: routing.TravelTimeProfile([0], [0.5]) for j in range(0, 150, 3)})
+        expected = network.run(nodes[0])
+        tree = network.run(nodes[0], departure_time=12)
+        for node in nodes.values():
+            self.assertAlmostEqual(tree.get_cost(node), expected.get_cost(node), msg="Constant profile cost differs")
@@ -0,0 +1,74 @@
+import math
+import random
+import unittest
+
+import routing
+
+
+class SpatialIndexTests(unittest.TestCase):
+
+    @staticmethod
+    def random_nodes(count, seed, dimensions=2):
+        rand = random.Random(seed)
+        nodes = {i: routing.Node(i, tuple(rand.uniform(0, 100) for _ in range(dimensions))) for i in range(count)}
+        nodes[count] = routing.Node(count)
+        return nodes
+
+    def test_Spatial_index_Nearest_matches_linear_scan(self):
+        for dimensions in (1, 2, 3):
+            nodes = SpatialIndexTests.random_nodes(500, dimensions, dimensions)
+            index = routing.SpatialIndex(nodes)
+            rand = random.Random(1)
+            points = [tuple(rand.uniform(-10, 110) for _ in range(dimensions)) for _ in range(50)]
+            for point, result in zip(points, index.nearest_many(points, k=5)):
+                probe = routing.Node(-1, point)
+                expected = sorted(routing.distance(probe, node) for node in nodes.values() if node.coords)[:5]
+                self.assertListEqual([distance for distance, _ in result], expected, "Wrong nearest distances")
+                for distance, node in result:
+                    self.assertEqual(routing.distance(probe, node), distance, "Distance does not match node")
+
+    def test_Spatial_index_Within_matches_linear_scan(self):
+        nodes = SpatialIndexTests.random_nodes(400, 2)
+        index = routing.SpatialIndex(nodes)
+        for point in [(50, 50), (0, 0), (100, 30)]:
+            probe = routing.Node(-1, point)
+            expected = sorted(node.node_id for node in nodes.values()
+                              if node.coords and routing.distance(probe, node) <= 12)
+            result = index.within(point, 12)
+            self.assertListEqual(sorted(node.node_id for _, node in result), expected, "Wrong nodes in radius")
+            self.assertListEqual([distance for distance, _ in result], sorted(distance for distance, _ in result),
+                                 "Radius results not sorted")
+
+    def test_Spatial_index_Snap_matches_linear_scan(self):
+        nodes = SpatialIndexTests.random_nodes(200, 3)
+        rand = random.Random(4)
+        links = {j: routing.Link(j, rand.randrange(200), rand.randrange(200)) for j in range(300)}
+        links[300] = routing.Link(300, 0, 200)
+        index = routing.SpatialIndex(nodes, links)
+        for _ in range(40):
+            point = (rand.uniform(0, 100), rand.uniform(0, 100))
+            distance, link, snapped, fraction = index.snap(point)
+            expected = min(routing.SpatialIndex.project(point, nodes[other.start_node_id].coords,
+                                                        nodes[other.end_node_id].coords)[0]
+                           for other in links.values() if other.link_id != 300)
+            self.assertAlmostEqual(distance, expected, msg="Snapped link is not the closest")
+            start, end = nodes[link.start_node_id].coords, nodes[link.end_node_id].coords
+            self.assertTrue(0 <= fraction <= 1, "Fraction outside the link")
+            for k in range(2):
+                self.assertAlmostEqual(snapped[k], start[k] + fraction * (end[k] - start[k]),
+                                       msg="Snapped point not on the link")
+            self.assertAlmostEqual(math.dist(point, snapped), distance, msg="Distance does not match point")
+
+    def test_Spatial_index_Empty_and_invalid(self):
+        index = routing.SpatialIndex({1: routing.Node(1)})
+        self.assertListEqual(index.nearest((), 3), [], "Nodes found in an empty index")
+        self.assertIsNone(index.snap(()), "Link found in an empty index")
+        index = routing.SpatialIndex({1: routing.Node(1), 2: routing.Node(2)}, {1: routing.Link(1, 1, 2)})
+        self.assertListEqual(index.nearest((1, 2)), [], "Nodes found in an empty index")
+        self.assertListEqual(index.within((1, 2), 5), [], "Nodes found in an empty index")
+        self.assertListEqual(index.nearest_many([(1, 2), (3, 4)]), [[], []], "Nodes found in an empty index")
+        self.assertIsNone(index.snap((1, 2)), "Link found in an empty index")
+        with self.assertRaises(TypeError):
+            routing.SpatialIndex({1: routing.Node(1, (0, 0)), 2: routing.Node(2, (0, 0, 0))})
+        with self.assertRaises(TypeError):
+            routing.SpatialIndex({1: routing.Node(1, (0, 0))}).nearest((1, 2, 3))
@@ -0,0 +1,92 @@
+import random
+import unittest
+
+import routing
+
+
+class TableTests(unittest.TestCase):
+
+    def test_Node_slots_Node_has_no_dict(self):
+        node = routing.Node(1, (0, 0))
+        self.assertFalse(hasattr(node, "__dict__"), "Node has an instance dictionary")
+        with self.assertRaises(AttributeError):
+            node.extra = 1
+
+    def test_Link_slots_Link_has_no_dict(self):
+        link = routing.Link(1, 1, 2)
+        self.assertFalse(hasattr(link, "__dict__"), "Link has an instance dictionary")
+        with self.assertRaises(AttributeError):
+            link.extra = 1
+
+    def test_Node_table_Values_correct_Mapping(self):
+        nodes = routing.NodeTable()
+        nodes.append(1, (0, 0), {"type": "junction"})
+        nodes.append("b", [1.5, 2])
+        nodes.append(3)
+        #
+        self.assertEqual(len(nodes), 3, "Wrong table length")
+        self.assertListEqual(list(nodes), [1, "b", 3], "Wrong node ids")
+        self.assertIn("b", nodes, "Node missing from table")
+        self.assertNotIn(4, nodes, "Unknown node in table")
+        self.assertEqual(nodes[1], routing.Node(1), "Wrong node view")
+        self.assertTupleEqual(nodes[1].coords, (0, 0), "Wrong coords")
+        self.assertTupleEqual(nodes["b"].coords, (1.5, 2), "Wrong coords")
+        self.assertIsNone(nodes[3].coords, "Node has coords")
+        self.assertDictEqual(nodes[1].metadata, {"type": "junction"}, "Wrong metadata")
+        self.assertIsNone(nodes["b"].metadata, "Node has metadata")
+        with self.assertRaises(KeyError):
+            nodes[4]
+
+    def test_Node_table_Validation_Invalid_rows(self):
+        nodes = routing.NodeTable()
+        nodes.append(1, (0, 0))
+        with self.assertRaises(TypeError):
+            nodes.append(2, 3)
+        with self.assertRaises(TypeError):
+            nodes.append(2, (1, 2, 3))
+        with self.assertRaises(TypeError):
+            nodes.append(2, (1, 2), ["type"])
+        with self.assertRaises(ValueError):
+            nodes.append(1, (1, 2))
+        self.assertEqual(len(nodes), 1, "Invalid row added to table")
+
+    def test_Node_table_Metadata_interned(self):
+        nodes = routing.NodeTable()
+        for i in range(100):
+            nodes.append(i, (i, 0), {"type": "junction" if i % 2 else "crossing"})
+        self.assertEqual(len(nodes.metadata.values), 2, "Metadata not interned")
+        self.assertIs(nodes[1].metadata, nodes[3].metadata, "Metadata not shared")
+        self.assertDictEqual(nodes[2].metadata, {"type": "crossing"}, "Wrong metadata")
+
+    def test_Link_table_Values_correct_Mapping(self):
+        nodes = routing.NodeTable.from_nodes([routing.Node(1, (0, 0)), routing.Node(2, (1, 0))])
+        links = routing.LinkTable(nodes)
+        links.append(10, 1, 2, {"speed": 30})
+        links.append(11, 2, 1, {"speed": 30})
+        #
+        self.assertEqual(len(links), 2, "Wrong table length")
+        self.assertEqual(links[10], routing.Link(10, 1, 2), "Wrong link view")
+        self.assertEqual(links[11].start_node_id, 2, "Wrong start node")
+        self.assertEqual(links[11].end_node_id, 1, "Wrong end node")
+        self.assertIs(links[10].metadata, links[11].metadata, "Metadata not shared")
+        with self.assertRaises(ValueError):
+            links.append(12, 1, 3)
+        with self.assertRaises(ValueError):
+            links.append(10, 1, 2)
+
+    def test_Compiled_network_Values_correct_Tables_match_dicts(self):
+        rand = random.Random(3)
+        node_list = [routing.Node(i, (rand.random(), rand.random())) for i in range(60)]
+        link_list = [routing.Link(j, rand.randrange(60), rand.randrange(60)) for j in range(200)]
+        nodes = routing.NodeTable.from_nodes(node_list)
+        links = routing.LinkTable.from_links(nodes, link_list)
+        expected = routing.CompiledNetwork({node.node_id: node for node in node_list},
+                                           {link.link_id: link for link in link_list})
+        network = routing.CompiledNetwork(nodes, links)
+        expected.run(node_list[0])
+        network.run(nodes[0])
+        for node in node_list:
+            self.assertEqual(network.get_cost(node), expected.get_cost(node), "Table network cost differs")
+            self.assertListEqual(network.get_path_ids(node), expected.get_path_ids(node),
+                                 "Table network path differs")
+        self.assertIsInstance(network.get_path(nodes[0])[0], routing.Node, "Path is not made of nodes")